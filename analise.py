@@ -0,0 +1,235 @@
+import pandas as pd
+import numpy as np
+import time
+import logging
+import argparse
+from armazenamento import abrir_armazenamento
+
+# Constante que torna o MAD comparável ao desvio padrão em dados normais
+CONSTANTE_MAD = 0.6745
+
+def normalizar_historico(df):
+    """Tipos uniformes para qualquer backend: data datetime, nome/rede texto, seguidores int64"""
+    df = df[['data', 'nome', 'rede', 'seguidores']].copy()
+    df['data'] = pd.to_datetime(df['data'])
+    df['nome'] = df['nome'].astype(str)
+    df['rede'] = df['rede'].astype(str)
+    df['seguidores'] = pd.to_numeric(df['seguidores'], errors='coerce').fillna(0).astype('int64')
+    return df[df['nome'] != 'sem_dados']
+
+def _soma_janela(valores, grupos, janela):
+    """Soma dos `janela` valores anteriores de cada linha no mesmo grupo (sem a linha atual), via somas acumuladas"""
+    acumulado = valores.groupby(grupos).cumsum()
+    anterior = acumulado.groupby(grupos).shift(1).fillna(0)
+    antigo = acumulado.groupby(grupos).shift(janela + 1).fillna(0)
+    return anterior - antigo
+
+def _crescimento(df, dias):
+    """Variação de cada contagem válida contra a última contagem válida de pelo menos `dias` dias antes"""
+    validos = df.loc[df['valor'].notna(), ['data', 'grupo', 'valor']]
+    alvo = validos.assign(referencia=validos['data'] - pd.Timedelta(days=dias)).reset_index()
+    base = pd.merge_asof(
+        alvo.sort_values('referencia'),
+        validos.rename(columns={'data': 'referencia', 'valor': 'base'})[['referencia', 'grupo', 'base']].sort_values('referencia'),
+        on='referencia', by='grupo', direction='backward'
+    ).set_index('index')
+    base = base['base'].reindex(df.index)
+    delta = df['valor'] - base
+    return delta, delta / base * 100
+
+def analisar_historico(df, janela_z=30, minimo_z=5, limite_z=3.0, limite_mad=5.0, limite_salto=0.2):
+    """
+    Analisa o histórico inteiro de uma vez, com operações agrupadas por perfil.
+
+    Colunas acrescentadas:
+      falha_zero            contagem 0 gravada quando a extração falhou
+      delta                 variação contra a contagem válida anterior do perfil
+      crescimento_7d/_30d   variação (absoluta e %) contra 7 e 30 dias antes
+      z_score               delta contra média/desvio dos `janela_z` deltas anteriores
+      mad_score             delta contra mediana/MAD de todos os deltas do perfil
+      anomalia              |z_score| > limite_z ou |mad_score| > limite_mad
+      salto                 |delta| maior que limite_salto da contagem anterior
+      suspeito              falha_zero ou salto: provavelmente erro de coleta, não mudança real
+    """
+    df = normalizar_historico(df).sort_values(['rede', 'nome', 'data'], ignore_index=True)
+    grupos = df.groupby(['rede', 'nome'], sort=False).ngroup().to_numpy()
+    df['grupo'] = grupos
+
+    df['falha_zero'] = df['seguidores'] == 0
+    df['valor'] = df['seguidores'].where(~df['falha_zero']).astype('float64')
+
+    # Delta contra a última contagem válida, pulando as falhas
+    anterior = df['valor'].groupby(grupos).ffill().groupby(grupos).shift(1)
+    df['delta'] = df['valor'] - anterior
+
+    for dias in (7, 30):
+        df[f'crescimento_{dias}d'], df[f'crescimento_{dias}d_pct'] = _crescimento(df, dias)
+
+    # z-score móvel: média e desvio dos deltas anteriores calculados com somas acumuladas
+    presente = df['delta'].notna().astype('float64')
+    delta = df['delta'].fillna(0)
+    n = _soma_janela(presente, grupos, janela_z)
+    media = _soma_janela(delta, grupos, janela_z) / n.where(n > 0)
+    variancia = (_soma_janela(delta ** 2, grupos, janela_z) / n.where(n > 0) - media ** 2) * n / (n - 1).where(n > 1)
+    desvio = np.sqrt(variancia.clip(lower=0))
+    df['z_score'] = ((df['delta'] - media) / desvio.where(desvio > 0)).where(n >= minimo_z)
+
+    # Escore robusto (mediana/MAD) sobre todos os deltas do perfil
+    mediana = df['delta'].groupby(grupos).transform('median')
+    mad = (df['delta'] - mediana).abs().groupby(grupos).transform('median')
+    df['mad_score'] = CONSTANTE_MAD * (df['delta'] - mediana) / mad.where(mad > 0)
+
+    df['anomalia'] = (df['z_score'].abs() > limite_z) | (df['mad_score'].abs() > limite_mad)
+    df['salto'] = (df['delta'].abs() / anterior) > limite_salto
+    df['suspeito'] = df['falha_zero'] | df['salto']
+
+    return df.drop(columns=['grupo', 'valor'])
+
+def completar_serie(df, metodo='carregar'):
+    """
+    Completa a série diária de cada perfil entre a primeira e a última data,
+    preenchendo dias sem coleta (ou com falha) pela última contagem válida
+    ('carregar') ou por interpolação linear no tempo ('interpolar').
+    A coluna estimado marca as linhas preenchidas.
+    """
+    df = normalizar_historico(df).sort_values(['rede', 'nome', 'data'], ignore_index=True)
+    if df.empty:
+        return df.assign(estimado=pd.Series(dtype=bool))
+    limites = df.groupby(['rede', 'nome'], sort=False)['data'].agg(['min', 'max'])
+    dias = ((limites['max'] - limites['min']).dt.days + 1).to_numpy()
+
+    # Grade diária de todos os perfis de uma vez: cada perfil repetido pelo número de dias do seu intervalo
+    inicio_grupo = np.repeat(np.cumsum(dias) - dias, dias)
+    deslocamento = np.arange(dias.sum()) - inicio_grupo
+    grade = pd.DataFrame({
+        'rede': np.repeat(limites.index.get_level_values('rede'), dias),
+        'nome': np.repeat(limites.index.get_level_values('nome'), dias),
+        'data': np.repeat(limites['min'].to_numpy(), dias) + pd.to_timedelta(deslocamento, unit='D'),
+    })
+    grade['grupo'] = np.repeat(np.arange(len(dias)), dias)
+    validos = df[df['seguidores'] > 0]
+    grade = grade.merge(validos, on=['rede', 'nome', 'data'], how='left')
+    grade['estimado'] = grade['seguidores'].isna()
+
+    valor = grade['seguidores'].astype('float64')
+    anterior = valor.groupby(grade['grupo']).ffill()
+    if metodo == 'interpolar':
+        posicao = pd.Series(deslocamento, dtype='float64')
+        pos_anterior = posicao.where(valor.notna()).groupby(grade['grupo']).ffill()
+        pos_seguinte = posicao.where(valor.notna()).groupby(grade['grupo']).bfill()
+        seguinte = valor.groupby(grade['grupo']).bfill()
+        fracao = ((posicao - pos_anterior) / (pos_seguinte - pos_anterior)).fillna(0)
+        interpolado = anterior + (seguinte - anterior) * fracao
+        # Depois da última contagem válida não há ponto seguinte: mantém a última
+        valor = interpolado.fillna(anterior).round()
+    else:
+        valor = anterior
+    grade['seguidores'] = valor.fillna(0).astype('int64')
+    return grade.drop(columns='grupo')[['data', 'nome', 'rede', 'seguidores', 'estimado']]
+
+def planejar_coleta(historico, perfis, data_hoje, intervalo_minimo=1, intervalo_maximo=7,
+                    variacao_alvo=0.005, janela=30, orcamento=None):
+    """
+    Decide quais perfis do config.json coletar hoje.
+
+    A volatilidade de cada perfil é a variação relativa média por dia nas
+    contagens válidas dos últimos `janela` dias. O intervalo ideal é o tempo
+    para acumular `variacao_alvo` de variação, dividido pela prioridade do
+    perfil ('prioridade' no config.json, padrão 1) e limitado a
+    [intervalo_minimo, intervalo_maximo] dias. Perfis sem histórico válido
+    são sempre coletados. Com orcamento, só os `orcamento` perfis mais
+    urgentes entram, exceto os que já atingiram intervalo_maximo.
+
+    Retorna um DataFrame por perfil, na ordem de `perfis`, com a coluna coletar.
+    """
+    hoje = pd.Timestamp(data_hoje)
+    plano = pd.DataFrame({
+        'nome': [str(linha.get('nome_pagina')) for linha in perfis],
+        'rede': [str(linha.get('rede')) for linha in perfis],
+        'prioridade': [float(linha.get('prioridade', 1) or 1) for linha in perfis],
+    })
+
+    df = normalizar_historico(historico)
+    validos = df[(df['seguidores'] > 0) & (df['data'] < hoje)].sort_values(['rede', 'nome', 'data'])
+    grupos = validos.groupby(['rede', 'nome'], sort=False)
+    ultima = grupos['data'].max().rename('ultima_coleta')
+
+    recentes = validos[validos['data'] >= hoje - pd.Timedelta(days=janela)]
+    por_perfil = recentes.groupby(['rede', 'nome'], sort=False)
+    variacao = por_perfil['seguidores'].diff().abs() / por_perfil['seguidores'].shift(1)
+    dias_entre = por_perfil['data'].diff().dt.days
+    volatilidade = (variacao / dias_entre).groupby([recentes['rede'], recentes['nome']]).mean().rename('volatilidade')
+
+    plano = plano.join(ultima, on=['rede', 'nome']).join(volatilidade, on=['rede', 'nome'])
+    plano['dias_sem_coleta'] = (hoje - plano['ultima_coleta']).dt.days
+
+    intervalo = (variacao_alvo / plano['volatilidade'].where(plano['volatilidade'] > 0)).fillna(intervalo_maximo)
+    intervalo = intervalo.where(plano['volatilidade'].notna(), intervalo_minimo)
+    plano['intervalo'] = (intervalo.clip(intervalo_minimo, intervalo_maximo) / plano['prioridade']).clip(lower=intervalo_minimo)
+    plano['urgencia'] = (plano['dias_sem_coleta'] / plano['intervalo']).fillna(np.inf)
+
+    sem_historico = plano['ultima_coleta'].isna()
+    vencido = plano['urgencia'] >= 1
+    obrigatorio = sem_historico | (plano['dias_sem_coleta'] >= intervalo_maximo)
+    plano['coletar'] = vencido
+    if orcamento is not None:
+        # Os obrigatórios já gastam orçamento: a disputa pelas vagas restantes é só entre os demais vencidos
+        ordem = (plano['urgencia'] * plano['prioridade']).where(vencido & ~obrigatorio).rank(ascending=False, method='first')
+        plano['coletar'] = obrigatorio | (ordem <= max(orcamento - int(obrigatorio.sum()), 0))
+
+    plano['motivo'] = np.select(
+        [sem_historico, plano['coletar'] & obrigatorio, plano['coletar'], vencido],
+        ['sem histórico válido', 'intervalo máximo atingido', 'intervalo vencido', 'fora do orçamento'],
+        default='estável'
+    )
+    return plano
+
+def resumir_analise(analise):
+    """Uma linha por perfil com a última contagem válida e a contagem de falhas, anomalias e saltos"""
+    validos = analise[~analise['falha_zero']]
+    resumo = analise.groupby(['rede', 'nome']).agg(
+        registros=('data', 'size'),
+        falhas_zero=('falha_zero', 'sum'),
+        anomalias=('anomalia', 'sum'),
+        saltos=('salto', 'sum'),
+    )
+    ultimos = validos.groupby(['rede', 'nome']).agg(
+        ultima_data_valida=('data', 'max'),
+        ultimo_valor=('seguidores', 'last'),
+        crescimento_30d=('crescimento_30d', 'last'),
+    )
+    return resumo.join(ultimos).reset_index()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Crescimento e anomalias do histórico de seguidores")
+    parser.add_argument("--armazenamento", choices=["csv", "sqlite", "parquet"], default="csv",
+                        help="Backend de onde ler os resultados (padrão: csv)")
+    parser.add_argument("--saida", default="analise.csv",
+                        help="CSV com todas as linhas analisadas (padrão: analise.csv)")
+    parser.add_argument("--limite-z", type=float, default=3.0)
+    parser.add_argument("--limite-mad", type=float, default=5.0)
+    parser.add_argument("--limite-salto", type=float, default=0.2,
+                        help="Variação diária relativa acima da qual a contagem é marcada como salto (padrão: 0.2)")
+    parser.add_argument("--completar", choices=["carregar", "interpolar"],
+                        help="Grava também a série diária completa (dias sem coleta preenchidos) em serie_completa.csv")
+    args = parser.parse_args()
+
+    backend = abrir_armazenamento(args.armazenamento)
+    try:
+        historico = backend.ler()
+    finally:
+        backend.fechar()
+
+    inicio = time.perf_counter()
+    analise = analisar_historico(historico, limite_z=args.limite_z, limite_mad=args.limite_mad,
+                                 limite_salto=args.limite_salto)
+    logging.info(f"Análise de {len(analise)} registros em {time.perf_counter() - inicio:.2f}s")
+
+    analise.to_csv(args.saida, index=False, date_format='%Y-%m-%d')
+    logging.info(f"Análise salva em {args.saida}")
+    if args.completar:
+        completar_serie(historico, args.completar).to_csv('serie_completa.csv', index=False, date_format='%Y-%m-%d')
+        logging.info("Série completa salva em serie_completa.csv")
+    print(resumir_analise(analise).to_string(index=False))
@@ -0,0 +1,390 @@
+import pandas as pd
+import sqlite3
+import os
+import time
+import random
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+# pyarrow é opcional: só o arquivo Parquet depende dele
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Colunas dos resultados, na ordem usada em resultados.csv
+COLUNAS = ['data', 'nome', 'rede', 'seguidores']
+
+class ArmazenamentoCSV:
+    """
+    Backend original: resultados.csv lido e reescrito por inteiro a cada gravação.
+    O custo cresce com o histórico total, mas o arquivo continua sendo o formato
+    versionado pelo workflow.
+    """
+
+    def __init__(self, caminho='resultados.csv'):
+        self.caminho = caminho
+
+    def ler(self, nome=None, rede=None, desde=None, ate=None):
+        """Retorna os registros (filtrados) como DataFrame"""
+        if not os.path.exists(self.caminho):
+            return pd.DataFrame(columns=COLUNAS)
+        df = pd.read_csv(self.caminho, dtype={'data': str, 'nome': str, 'rede': str})
+        if nome is not None:
+            df = df[df['nome'] == nome]
+        if rede is not None:
+            df = df[df['rede'] == rede]
+        if desde is not None:
+            df = df[df['data'] >= desde]
+        if ate is not None:
+            df = df[df['data'] <= ate]
+        return df
+
+    def _escrever(self, df):
+        # Ordenar por data (mais recente primeiro) e nome
+        df = df.sort_values(['data', 'nome'], ascending=[False, True])
+        logging.info(f"Salvando resultados em {self.caminho}")
+        df.to_csv(self.caminho, index=False)
+        logging.info(f"Dados salvos em {self.caminho} - {len(df)} registros totais")
+
+    def gravar_dia(self, data, registros):
+        """
+        Grava os registros da data pela chave (data, nome, rede), como os outros
+        backends: perfis já gravados hoje e não coletados nesta execução (adiados
+        pela agenda ou pelo disjuntor) continuam com o valor anterior. Sem nenhum
+        registro no dia, grava um marcador 'sem_dados' para o arquivo sempre existir.
+        """
+        resultados_df = self.ler()
+        mesma_data = resultados_df['data'] == data
+        # O marcador de dia vazio sai assim que a data tem algum registro
+        manter = ~(mesma_data & (resultados_df['nome'] == 'sem_dados'))
+
+        if not registros:
+            if (mesma_data & manter).any():
+                logging.info(f"Nenhum registro novo para a data {data}; os já gravados ficam como estavam")
+                return
+            registros = [{'data': data, 'nome': 'sem_dados', 'rede': 'sem_rede', 'seguidores': 0}]
+        novos_df = pd.DataFrame(registros, columns=COLUNAS)
+
+        # Evitar duplicatas no mesmo dia: o registro novo de um perfil substitui o anterior
+        chaves = set(zip(novos_df['data'], novos_df['nome'], novos_df['rede']))
+        existentes = zip(resultados_df['data'], resultados_df['nome'], resultados_df['rede'])
+        manter &= pd.Series([chave not in chaves for chave in existentes], index=resultados_df.index, dtype=bool)
+        mantidos = int((mesma_data & manter).sum())
+        substituidos = int(mesma_data.sum()) - mantidos
+        if substituidos:
+            logging.info(f"Substituindo {substituidos} registros antigos da data {data}")
+        if mantidos:
+            logging.info(f"Mantendo {mantidos} registros da data {data} de perfis não coletados nesta execução")
+
+        resultados_df = pd.concat([resultados_df[manter], novos_df], ignore_index=True)
+        logging.info(f"Atualizados registros para a data {data}: adicionados {len(novos_df)} novos")
+        self._escrever(resultados_df)
+
+    def upsert(self, registros):
+        """Insere ou atualiza registros pela chave (data, nome, rede)"""
+        if not registros:
+            return
+        novos_df = pd.DataFrame(registros, columns=COLUNAS)
+        resultados_df = self.ler()
+        chaves = set(zip(novos_df['data'], novos_df['nome'], novos_df['rede']))
+        manter = [chave not in chaves for chave in zip(resultados_df['data'], resultados_df['nome'], resultados_df['rede'])]
+        self._escrever(pd.concat([resultados_df[manter], novos_df], ignore_index=True))
+
+    def exportar_csv(self, caminho):
+        if os.path.abspath(caminho) != os.path.abspath(self.caminho):
+            self.ler().to_csv(caminho, index=False)
+
+    def fechar(self):
+        pass
+
+class ArmazenamentoSQLite:
+    """
+    Backend SQLite com chave primária (data, nome, rede). Cada gravação é um
+    upsert transacional apenas dos perfis informados, então o custo não depende
+    do tamanho do histórico; as leituras usam os índices por data e por perfil.
+    """
+
+    def __init__(self, caminho='resultados.db'):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        with self.conexao:
+            self.conexao.execute("""
+                CREATE TABLE IF NOT EXISTS resultados (
+                    data TEXT NOT NULL,
+                    nome TEXT NOT NULL,
+                    rede TEXT NOT NULL,
+                    seguidores INTEGER NOT NULL,
+                    PRIMARY KEY (data, nome, rede)
+                ) WITHOUT ROWID
+            """)
+            # Histórico de um perfil sem varrer a tabela
+            self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_resultados_perfil ON resultados (nome, rede, data)")
+
+    def ler(self, nome=None, rede=None, desde=None, ate=None):
+        """Consulta indexada dos registros (filtrados), mais recentes primeiro"""
+        condicoes, parametros = [], []
+        for coluna, operador, valor in (('nome', '=', nome), ('rede', '=', rede), ('data', '>=', desde), ('data', '<=', ate)):
+            if valor is not None:
+                condicoes.append(f"{coluna} {operador} ?")
+                parametros.append(valor)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        return pd.read_sql_query(
+            f"SELECT data, nome, rede, seguidores FROM resultados {where} ORDER BY data DESC, nome ASC",
+            self.conexao, params=parametros
+        )
+
+    def upsert(self, registros):
+        """Insere ou atualiza registros pela chave (data, nome, rede) em uma transação"""
+        if not registros:
+            return
+        with self.conexao:
+            self.conexao.executemany(
+                """INSERT INTO resultados (data, nome, rede, seguidores) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (data, nome, rede) DO UPDATE SET seguidores = excluded.seguidores""",
+                [(r['data'], r['nome'], r['rede'], 0 if pd.isna(r['seguidores']) else int(r['seguidores']))
+                 for r in registros]
+            )
+        logging.info(f"{len(registros)} registros gravados em {self.caminho}")
+
+    def vazio(self):
+        return self.conexao.execute("SELECT 1 FROM resultados LIMIT 1").fetchone() is None
+
+    def gravar_dia(self, data, registros):
+        """No SQLite a gravação do dia é um upsert por perfil; perfis não coletados ficam como estavam"""
+        self.upsert(registros)
+
+    def importar_csv(self, caminho, tamanho_lote=100000):
+        """Carrega um resultados.csv existente (migração), em lotes"""
+        total = 0
+        for lote in pd.read_csv(caminho, dtype={'data': str, 'nome': str, 'rede': str}, chunksize=tamanho_lote):
+            lote = lote[lote['nome'] != 'sem_dados']  # Marcador de dia vazio do CSV
+            self.upsert(lote[COLUNAS].to_dict('records'))
+            total += len(lote)
+        logging.info(f"Importados {total} registros de {caminho}")
+        return total
+
+    def exportar_csv(self, caminho):
+        """Exporta toda a tabela no formato de resultados.csv, em lotes"""
+        consulta = "SELECT data, nome, rede, seguidores FROM resultados ORDER BY data DESC, nome ASC"
+        with open(caminho, 'w', encoding='utf-8', newline='') as f:
+            f.write(','.join(COLUNAS) + '\n')
+            for lote in pd.read_sql_query(consulta, self.conexao, chunksize=100000):
+                lote.to_csv(f, index=False, header=False)
+        logging.info(f"Resultados exportados para {caminho}")
+
+    def fechar(self):
+        self.conexao.close()
+
+class ArquivoParquet:
+    """
+    Arquivo histórico em Parquet particionado por rede e mês
+    (raiz/rede=<rede>/mes=<AAAA-MM>/dados.parquet), com colunas tipadas:
+    data date32, nome categórico e seguidores int64. Leituras por perfil,
+    rede ou intervalo de datas só abrem as partições e colunas necessárias.
+    """
+
+    def __init__(self, caminho='historico'):
+        if pa is None:
+            raise ImportError("pyarrow não instalado; necessário para o arquivo Parquet (pip install pyarrow)")
+        self.caminho = caminho
+        self.esquema = pa.schema([
+            ('data', pa.date32()),
+            ('nome', pa.dictionary(pa.int32(), pa.string())),
+            ('seguidores', pa.int64()),
+        ])
+        self.particoes = ds.partitioning(
+            pa.schema([('rede', pa.string()), ('mes', pa.string())]),
+            flavor='hive'
+        )
+        os.makedirs(caminho, exist_ok=True)
+
+    def _arquivo(self, rede, mes):
+        return os.path.join(self.caminho, f"rede={rede}", f"mes={mes}", "dados.parquet")
+
+    def ler(self, nome=None, rede=None, desde=None, ate=None, colunas=None):
+        """
+        Retorna os registros (filtrados) como DataFrame, com data em texto
+        'AAAA-MM-DD' como nos outros backends. rede e o mês de desde/ate podam
+        partições; colunas limita as colunas lidas.
+        """
+        if not any(os.scandir(self.caminho)):
+            return pd.DataFrame(columns=colunas or COLUNAS)
+        dataset = ds.dataset(self.caminho, format='parquet', partitioning=self.particoes)
+        filtro = None
+        condicoes = []
+        if rede is not None:
+            condicoes.append(ds.field('rede') == rede)
+        if desde is not None:
+            condicoes += [ds.field('mes') >= desde[:7], ds.field('data') >= pa.scalar(pd.Timestamp(desde).date())]
+        if ate is not None:
+            condicoes += [ds.field('mes') <= ate[:7], ds.field('data') <= pa.scalar(pd.Timestamp(ate).date())]
+        if nome is not None:
+            condicoes.append(ds.field('nome') == nome)
+        for condicao in condicoes:
+            filtro = condicao if filtro is None else filtro & condicao
+        tabela = dataset.to_table(columns=colunas or COLUNAS, filter=filtro)
+        df = tabela.to_pandas(date_as_object=False)
+        if 'rede' in df.columns:
+            df['rede'] = df['rede'].astype('category')
+        if 'data' in df.columns and 'nome' in df.columns:
+            # nome é categórico: ordenar pelo texto, não pela ordem das categorias
+            df = df.sort_values(['data', 'nome'], ascending=[False, True], ignore_index=True,
+                                key=lambda coluna: coluna.astype(str) if coluna.name == 'nome' else coluna)
+        if 'data' in df.columns:
+            df['data'] = df['data'].dt.strftime('%Y-%m-%d')
+        return df
+
+    def upsert(self, registros):
+        """Insere ou atualiza registros pela chave (data, nome, rede), reescrevendo só as partições afetadas"""
+        novos_df = registros if isinstance(registros, pd.DataFrame) else pd.DataFrame(registros, columns=COLUNAS)
+        if novos_df.empty:
+            return
+        novos_df = novos_df[COLUNAS].copy()
+        novos_df['data'] = pd.to_datetime(novos_df['data'])
+        novos_df['seguidores'] = novos_df['seguidores'].fillna(0).astype('int64')
+        novos_df['mes'] = novos_df['data'].dt.strftime('%Y-%m')
+
+        for (rede, mes), particao in novos_df.groupby(['rede', 'mes']):
+            arquivo = self._arquivo(rede, mes)
+            particao = particao[['data', 'nome', 'seguidores']]
+            if os.path.exists(arquivo):
+                existentes = pq.read_table(arquivo).to_pandas(date_as_object=False)
+                existentes['nome'] = existentes['nome'].astype(str)
+                chaves = pd.MultiIndex.from_frame(particao[['data', 'nome']])
+                manter = ~pd.MultiIndex.from_frame(existentes[['data', 'nome']]).isin(chaves)
+                particao = pd.concat([existentes[manter], particao], ignore_index=True)
+            particao = particao.drop_duplicates(['data', 'nome'], keep='last').sort_values(['nome', 'data'])
+            tabela = pa.Table.from_pandas(particao, schema=self.esquema, preserve_index=False)
+
+            os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+            temporario = arquivo + '.tmp'
+            pq.write_table(tabela, temporario)
+            os.replace(temporario, arquivo)
+        logging.info(f"{len(novos_df)} registros gravados em {self.caminho}")
+
+    def gravar_dia(self, data, registros):
+        """Como no SQLite, a gravação do dia é um upsert por perfil"""
+        self.upsert(registros)
+
+    def importar_csv(self, caminho, tamanho_lote=500000):
+        """Migra um resultados.csv para o arquivo Parquet, em lotes"""
+        total = 0
+        for lote in pd.read_csv(caminho, dtype={'data': str, 'nome': str, 'rede': str}, chunksize=tamanho_lote):
+            lote = lote[lote['nome'] != 'sem_dados']
+            self.upsert(lote)
+            total += len(lote)
+        logging.info(f"Importados {total} registros de {caminho}")
+        return total
+
+    def exportar_csv(self, caminho):
+        self.ler()[COLUNAS].to_csv(caminho, index=False)
+        logging.info(f"Resultados exportados para {caminho}")
+
+    def fechar(self):
+        pass
+
+def abrir_armazenamento(tipo='csv', caminho=None, importar_de='resultados.csv'):
+    """
+    Abre o backend de armazenamento pelo nome ('csv', 'sqlite' ou 'parquet').
+    Um banco SQLite ou arquivo Parquet novo é preenchido com o histórico de importar_de, se existir.
+    """
+    if tipo == 'csv':
+        return ArmazenamentoCSV(caminho or 'resultados.csv')
+    if tipo == 'sqlite':
+        banco = ArmazenamentoSQLite(caminho or 'resultados.db')
+        vazio = banco.vazio()
+    elif tipo == 'parquet':
+        banco = ArquivoParquet(caminho or 'historico')
+        vazio = not any(os.scandir(banco.caminho))
+    else:
+        raise ValueError(f"Armazenamento desconhecido: {tipo}")
+    if importar_de and os.path.exists(importar_de) and vazio:
+        logging.info(f"{banco.caminho} vazio, importando histórico de {importar_de}")
+        banco.importar_csv(importar_de)
+    return banco
+
+def _historico_sintetico(linhas, perfis):
+    """Gera `linhas` registros diários para `perfis` perfis, terminando ontem"""
+    dias = max(linhas // perfis, 1)
+    inicio = datetime.now() - timedelta(days=dias)
+    for d in range(dias):
+        data = (inicio + timedelta(days=d)).strftime("%Y-%m-%d")
+        for p in range(perfis):
+            yield {'data': data, 'nome': f"perfil_{p}", 'rede': 'Instagram' if p % 2 else 'Linkedin',
+                   'seguidores': random.randint(1000, 1000000)}
+
+def benchmark(tamanhos, perfis=300, backends=('csv', 'sqlite', 'parquet')):
+    """
+    Mede, para cada tamanho de histórico, o custo de gravar um dia de coleta
+    (`perfis` registros) e de ler o histórico de um perfil em cada backend.
+    """
+    hoje = datetime.now().strftime("%Y-%m-%d")
+    dia = [{'data': hoje, 'nome': f"perfil_{p}", 'rede': 'Instagram' if p % 2 else 'Linkedin', 'seguidores': p}
+           for p in range(perfis)]
+
+    print(f"{'backend':<8} {'histórico':>10} {'gravar dia (s)':>15} {'ler perfil (s)':>15}")
+    for tamanho in tamanhos:
+        for tipo in backends:
+            with tempfile.TemporaryDirectory() as pasta:
+                caminho = os.path.join(pasta, {'csv': 'resultados.csv', 'sqlite': 'resultados.db', 'parquet': 'historico'}[tipo])
+                armazenamento = abrir_armazenamento(tipo, caminho, importar_de=None)
+                historico = list(_historico_sintetico(tamanho, perfis))
+                if tipo == 'csv':
+                    pd.DataFrame(historico, columns=COLUNAS).to_csv(caminho, index=False)
+                else:
+                    armazenamento.upsert(historico)
+                del historico
+
+                inicio = time.perf_counter()
+                armazenamento.gravar_dia(hoje, dia)
+                tempo_gravacao = time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                armazenamento.ler(nome='perfil_7', rede='Instagram')
+                tempo_leitura = time.perf_counter() - inicio
+                armazenamento.fechar()
+            print(f"{tipo:<8} {tamanho:>10} {tempo_gravacao:>15.3f} {tempo_leitura:>15.3f}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Ferramentas do armazenamento de resultados")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    importar = sub.add_parser("importar", help="Importa um resultados.csv para o SQLite")
+    importar.add_argument("--csv", default="resultados.csv")
+    importar.add_argument("--db", default="resultados.db")
+
+    migrar = sub.add_parser("migrar-parquet", help="Migra um resultados.csv para o arquivo Parquet particionado")
+    migrar.add_argument("--csv", default="resultados.csv")
+    migrar.add_argument("--destino", default="historico")
+
+    exportar = sub.add_parser("exportar", help="Exporta o SQLite para o formato de resultados.csv")
+    exportar.add_argument("--db", default="resultados.db")
+    exportar.add_argument("--csv", default="resultados.csv")
+
+    bench = sub.add_parser("benchmark", help="Compara o custo de gravação conforme o histórico cresce")
+    bench.add_argument("--tamanhos", type=int, nargs="+", default=[10000, 100000, 1000000])
+    bench.add_argument("--perfis", type=int, default=300)
+    bench.add_argument("--backends", nargs="+", default=["csv", "sqlite", "parquet"], choices=["csv", "sqlite", "parquet"])
+
+    args = parser.parse_args()
+    if args.comando == "importar":
+        banco = ArmazenamentoSQLite(args.db)
+        banco.importar_csv(args.csv)
+        banco.fechar()
+    elif args.comando == "migrar-parquet":
+        ArquivoParquet(args.destino).importar_csv(args.csv)
+    elif args.comando == "exportar":
+        banco = ArmazenamentoSQLite(args.db)
+        banco.exportar_csv(args.csv)
+        banco.fechar()
+    else:
+        benchmark(args.tamanhos, args.perfis, args.backends)
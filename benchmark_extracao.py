@@ -0,0 +1,218 @@
+import json
+import os
+import re
+import time
+import logging
+import argparse
+import tempfile
+import numpy as np
+import scraper
+
+# Corpus de páginas salvas e valores esperados
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Métodos que só leem texto, HTML ou JSON: (nome, tipo de entrada, redes, função)
+METODOS_OFFLINE = [
+    ('extrair_seguidores', 'texto', None, lambda f: scraper.extrair_seguidores(f['texto_alvo'])),
+    ('interpretar_contagem', 'texto', None, lambda f: scraper.interpretar_contagem(f['texto_alvo'])),
+    ('instagram_html', 'html', 'instagram', lambda f: scraper._seguidores_do_html(f['conteudo'])),
+    ('linkedin_html', 'html', 'linkedin', lambda f: scraper._seguidores_do_html_linkedin(f['conteudo'])),
+    ('instagram_api_json', 'json', 'instagram', lambda f: scraper._seguidores_da_api(json.loads(f['conteudo']))),
+    ('busca_json', 'json', None, lambda f: scraper._buscar_contagem_json(json.loads(f['conteudo']), f.get('identificador'))),
+]
+
+# Métodos que precisam da página carregada no navegador
+METODOS_NAVEGADOR = [
+    ('candidatos', 'instagram', lambda d, f: scraper.extrair_seguidores_candidatos(d, f['xpath'])),
+    ('candidatos', 'linkedin', lambda d, f: scraper.extrair_seguidores_candidatos(d, f['xpath'])),
+    ('method1', 'instagram', lambda d, f: scraper.extrair_seguidores_instagram_method1(d, f['xpath'])),
+    ('method2', 'instagram', lambda d, f: scraper.extrair_seguidores_instagram_method2(d)),
+    ('method3', 'instagram', lambda d, f: scraper.extrair_seguidores_instagram_method3(d)),
+    ('method4', 'instagram', lambda d, f: scraper.extrair_seguidores_instagram_method4(d)),
+    ('method5', 'instagram', lambda d, f: scraper.extrair_seguidores_instagram_method5(d)),
+    ('alternativo', 'linkedin', lambda d, f: scraper.encontrar_elemento_alternativo(d, f['arquivo'], f['rede'])),
+]
+
+def carregar_fixtures(pasta=PASTA_FIXTURES, tamanho_grande_mb=2.5):
+    """
+    Lê esperado.json e o conteúdo de cada página. Para cada página HTML também
+    gera uma versão ampliada (tamanho_grande_mb) com scripts e DOM de enchimento,
+    como as páginas reais de perfil.
+    """
+    with open(os.path.join(pasta, 'esperado.json'), 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+
+    corpus = []
+    for fixture in fixtures:
+        with open(os.path.join(pasta, fixture['arquivo']), 'r', encoding='utf-8') as f:
+            fixture = {**fixture, 'conteudo': f.read()}
+        fixture['tipo'] = 'json' if fixture['arquivo'].endswith('.json') else 'html'
+        corpus.append(fixture)
+        if fixture['tipo'] == 'html' and tamanho_grande_mb:
+            corpus.append({**fixture, 'arquivo': f"{fixture['arquivo']}@{tamanho_grande_mb:g}MB",
+                           'conteudo': ampliar_pagina(fixture['conteudo'], tamanho_grande_mb)})
+    return corpus
+
+def ampliar_pagina(html, tamanho_mb):
+    """Insere antes de </body> blocos de script e de DOM até a página chegar a tamanho_mb"""
+    bloco_script = '<script>window.__bundle = ' + json.dumps({'modulos': ['x' * 200] * 40}) + ';</script>\n'
+    bloco_dom = ''.join(f'<div class="feed-item"><span>Post {i}</span><p>{"lorem ipsum " * 20}</p></div>\n' for i in range(20))
+    alvo = int(tamanho_mb * 1024 * 1024)
+    blocos = []
+    tamanho = len(html)
+    while tamanho < alvo:
+        for bloco in (bloco_script, bloco_dom):
+            blocos.append(bloco)
+            tamanho += len(bloco)
+    return re.sub(r'</body>', lambda _: ''.join(blocos) + '</body>', html, count=1)
+
+def _acertou(resultado, fixture):
+    """Sem número esperado (parede de login), acertar é não devolver número"""
+    esperado = fixture.get('esperado')
+    if esperado is None:
+        return not resultado
+    if not resultado:
+        return False
+    return abs(resultado - esperado) <= esperado * fixture.get('tolerancia', 0)
+
+def _aplicavel(redes, fixture):
+    return redes is None or str(fixture['rede']).lower() == redes
+
+def medir(funcao, repeticoes):
+    """Executa a função `repeticoes` vezes e retorna (último resultado, latências em ms)"""
+    latencias = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        try:
+            resultado = funcao()
+        except Exception:
+            resultado = None
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return resultado, latencias
+
+def benchmark_offline(corpus, repeticoes=50):
+    """Mede os métodos de texto/HTML/JSON em todas as fixtures aplicáveis"""
+    medicoes = []
+    for nome, entrada, redes, funcao in METODOS_OFFLINE:
+        for fixture in corpus:
+            if not _aplicavel(redes, fixture):
+                continue
+            # texto_alvo é o mesmo na versão ampliada da página
+            if entrada == 'texto' and ('texto_alvo' not in fixture or '@' in fixture['arquivo']):
+                continue
+            if entrada in ('html', 'json') and fixture['tipo'] != entrada:
+                continue
+            resultado, latencias = medir(lambda: funcao(fixture), repeticoes)
+            medicoes.append({'metodo': nome, 'fixture': fixture['arquivo'], 'resultado': resultado,
+                             'acerto': _acertou(resultado, fixture), 'latencias': latencias})
+    return medicoes
+
+def benchmark_navegador(corpus, repeticoes=5):
+    """Carrega cada página HTML em um Chrome local (file://) e mede os métodos que usam o driver"""
+    driver = scraper.configurar_driver(bloquear_recursos=False)
+    medicoes = []
+    try:
+        with tempfile.TemporaryDirectory() as pasta:
+            for fixture in corpus:
+                if fixture['tipo'] != 'html':
+                    continue
+                caminho = os.path.join(pasta, re.sub(r'[^\w.@-]', '_', fixture['arquivo']) + '.html')
+                with open(caminho, 'w', encoding='utf-8') as f:
+                    f.write(fixture['conteudo'])
+                driver.get('file://' + caminho)
+                for nome, redes, funcao in METODOS_NAVEGADOR:
+                    if not _aplicavel(redes, fixture):
+                        continue
+                    resultado, latencias = medir(lambda: funcao(driver, fixture), repeticoes)
+                    medicoes.append({'metodo': nome, 'fixture': fixture['arquivo'], 'resultado': resultado,
+                                     'acerto': _acertou(resultado, fixture), 'latencias': latencias})
+    finally:
+        driver.quit()
+    return medicoes
+
+def _grupo(medicao):
+    """Páginas ampliadas ficam em um grupo próprio: misturadas às normais, os percentis oscilariam entre os dois portes"""
+    porte = medicao['fixture'].partition('@')[2]
+    return f"{medicao['metodo']} [{porte}]" if porte else medicao['metodo']
+
+def resumir(medicoes):
+    """Agrega por método (e porte de página): acurácia nas fixtures e percentis de latência (ms)"""
+    resumo = {}
+    for metodo in dict.fromkeys(_grupo(m) for m in medicoes):
+        do_metodo = [m for m in medicoes if _grupo(m) == metodo]
+        latencias = np.concatenate([m['latencias'] for m in do_metodo])
+        resumo[metodo] = {
+            'fixtures': len(do_metodo),
+            'acertos': sum(m['acerto'] for m in do_metodo),
+            'acuracia': sum(m['acerto'] for m in do_metodo) / len(do_metodo),
+            'p50_ms': float(np.percentile(latencias, 50)),
+            'p95_ms': float(np.percentile(latencias, 95)),
+            'p99_ms': float(np.percentile(latencias, 99)),
+            'erros': [m['fixture'] for m in do_metodo if not m['acerto']],
+        }
+    return resumo
+
+def imprimir_resumo(resumo, detalhes=False):
+    print(f"{'método':<30} {'acurácia':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for metodo, dados in resumo.items():
+        print(f"{metodo:<30} {dados['acertos']:>4}/{dados['fixtures']:<5} {dados['p50_ms']:>9.3f} "
+              f"{dados['p95_ms']:>9.3f} {dados['p99_ms']:>9.3f}")
+        if detalhes and dados['erros']:
+            print(f"{'':<30} erros: {', '.join(dados['erros'])}")
+
+def comparar(resumo, caminho_base, tolerancia_latencia=0.5, minimo_ms=0.05):
+    """
+    Compara com um resumo salvo antes; retorna as regressões de acurácia ou de p50
+    acima da tolerância relativa (ignorando diferenças menores que minimo_ms, que são ruído)
+    """
+    with open(caminho_base, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    regressoes = []
+    for metodo, dados in resumo.items():
+        anterior = base.get(metodo)
+        if not anterior:
+            continue
+        if dados['acertos'] < anterior['acertos']:
+            regressoes.append(f"{metodo}: acurácia caiu de {anterior['acertos']} para {dados['acertos']} acertos")
+        aumento = dados['p50_ms'] - anterior['p50_ms']
+        if aumento > minimo_ms and aumento > anterior['p50_ms'] * tolerancia_latencia:
+            regressoes.append(f"{metodo}: p50 subiu de {anterior['p50_ms']:.3f} ms para {dados['p50_ms']:.3f} ms")
+    return regressoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline dos métodos de extração sobre páginas salvas")
+    parser.add_argument("--repeticoes", type=int, default=50,
+                        help="Execuções de cada método por fixture nos métodos offline (padrão: 50)")
+    parser.add_argument("--navegador", action="store_true",
+                        help="Também mede os métodos que usam o ChromeDriver, com as páginas abertas via file://")
+    parser.add_argument("--repeticoes-navegador", type=int, default=5)
+    parser.add_argument("--tamanho-grande", type=float, default=2.5,
+                        help="Tamanho em MB das versões ampliadas das páginas (0 desativa)")
+    parser.add_argument("--detalhes", action="store_true", help="Lista as fixtures em que cada método errou")
+    parser.add_argument("--saida", help="Salva o resumo em JSON para comparações futuras")
+    parser.add_argument("--comparar", help="Resumo JSON de referência; sai com código 1 se houver regressão")
+    parser.add_argument("--tolerancia", type=float, default=0.5,
+                        help="Aumento relativo do p50 aceito antes de acusar regressão (padrão: 0.5)")
+    args = parser.parse_args()
+
+    # Os métodos registram cada tentativa em log; aqui só interessa o tempo de extração
+    logging.getLogger().setLevel(logging.ERROR)
+
+    corpus = carregar_fixtures(tamanho_grande_mb=args.tamanho_grande)
+    medicoes = benchmark_offline(corpus, args.repeticoes)
+    if args.navegador:
+        medicoes += benchmark_navegador(corpus, args.repeticoes_navegador)
+
+    resumo = resumir(medicoes)
+    imprimir_resumo(resumo, args.detalhes)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2)
+    if args.comparar:
+        regressoes = comparar(resumo, args.comparar, args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO: {regressao}")
+        if regressoes:
+            raise SystemExit(1)
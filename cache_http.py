@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+# Headers que mudam o conteúdo da resposta e por isso entram na chave do cache.
+# O User-Agent fica de fora: ele é sorteado a cada consulta e nunca repetiria a chave.
+CABECALHOS_PERFIL = ('accept', 'accept-language', 'x-ig-app-id', 'x-requested-with')
+
+class RespostaCache:
+    """Resposta lida do cache, com os atributos de requests.Response usados pelo coletor"""
+
+    def __init__(self, status_code, url, headers, content, encoding=None):
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+        self.do_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+class CacheHTTP:
+    """
+    Cache em disco de respostas HTTP endereçado por conteúdo: a chave é o SHA-256
+    do método, da URL e do perfil da requisição (CABECALHOS_PERFIL). Cada entrada é
+    um arquivo <pasta>/<2 primeiros caracteres>/<chave> com uma linha JSON de
+    metadados seguida do corpo da resposta.
+    - ttl: segundos em que a entrada é considerada fresca
+    - tamanho_maximo: bytes em disco; acima disso as entradas usadas há mais tempo
+      (mtime, atualizado a cada acerto) são removidas
+    - somente_cache: modo de reprodução para depurar a extração offline; nunca vai
+      à rede e usa as entradas mesmo vencidas
+    O cache não olha o conteúdo: cabe a quem chama gravar() só guardar respostas
+    que já foram interpretadas com sucesso.
+    """
+
+    def __init__(self, pasta='cache_http', ttl=12 * 3600, tamanho_maximo=200 * 1024 * 1024,
+                 somente_cache=False, ativo=True):
+        self.pasta = pasta
+        self.ttl = ttl
+        self.tamanho_maximo = tamanho_maximo
+        self.somente_cache = somente_cache
+        self.ativo = ativo or somente_cache
+        self.estatisticas = {'acertos': 0, 'faltas': 0, 'vencidas': 0, 'gravadas': 0, 'removidas': 0,
+                             'bytes_servidos': 0}
+        self._tamanho = None  # Calculado na primeira gravação
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(url, headers=None, metodo='GET'):
+        perfil = {nome.lower(): valor for nome, valor in (headers or {}).items() if nome.lower() in CABECALHOS_PERFIL}
+        requisicao = json.dumps({'metodo': metodo, 'url': url, 'perfil': perfil}, sort_keys=True)
+        return hashlib.sha256(requisicao.encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, chave[:2], chave)
+
+    def _contar(self, evento, quantidade=1):
+        with self._lock:
+            self.estatisticas[evento] += quantidade
+
+    def ler(self, url, headers=None):
+        """Retorna a RespostaCache fresca (ou qualquer uma, no modo somente cache), ou None"""
+        if not self.ativo:
+            return None
+        caminho = self._caminho(self.chave(url, headers))
+        try:
+            with open(caminho, 'rb') as f:
+                metadados = json.loads(f.readline())
+                conteudo = f.read()
+        except (OSError, ValueError):
+            self._contar('faltas')
+            return None
+
+        if not self.somente_cache and time.time() - metadados['gravado_em'] > self.ttl:
+            self._contar('vencidas')
+            self._contar('faltas')
+            return None
+        try:
+            os.utime(caminho)  # Marca o uso para a remoção por LRU
+        except OSError:
+            pass
+        self._contar('acertos')
+        self._contar('bytes_servidos', len(conteudo))
+        return RespostaCache(metadados['status'], metadados['url'], metadados.get('headers', {}), conteudo,
+                             metadados.get('encoding'))
+
+    def gravar(self, url, headers, resposta):
+        """Guarda a resposta (requests ou httpx), já validada por quem chama, e aplica o limite de tamanho"""
+        if not self.ativo or self.somente_cache:
+            return
+        chave = self.chave(url, headers)
+        caminho = self._caminho(chave)
+        metadados = {'url_requisitada': url, 'url': str(resposta.url), 'status': resposta.status_code,
+                     'headers': {'content-type': resposta.headers.get('content-type', '')},
+                     'encoding': resposta.encoding, 'gravado_em': time.time()}
+        conteudo = resposta.content
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            anterior = os.path.getsize(caminho) if os.path.exists(caminho) else 0
+            temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, 'wb') as f:
+                f.write(json.dumps(metadados, ensure_ascii=False).encode('utf-8') + b'\n')
+                f.write(conteudo)
+            os.replace(temporario, caminho)
+            tamanho = os.path.getsize(caminho)
+        except OSError as e:
+            logging.warning(f"Cache HTTP: falha ao gravar {url}: {str(e)[:100]}")
+            return
+        self._contar('gravadas')
+
+        with self._lock:
+            if self._tamanho is None:
+                self._tamanho = self._medir()
+            else:
+                self._tamanho += tamanho - anterior
+            excedeu = self.tamanho_maximo and self._tamanho > self.tamanho_maximo
+        if excedeu:
+            self._remover_antigas()
+
+    def _entradas(self):
+        """(mtime, tamanho, caminho) de todas as entradas"""
+        entradas = []
+        if not os.path.isdir(self.pasta):
+            return entradas
+        for subpasta in os.scandir(self.pasta):
+            if not subpasta.is_dir():
+                continue
+            for arquivo in os.scandir(subpasta.path):
+                if arquivo.name.endswith('.tmp'):
+                    continue
+                try:
+                    estado = arquivo.stat()
+                except OSError:
+                    continue
+                entradas.append((estado.st_mtime, estado.st_size, arquivo.path))
+        return entradas
+
+    def _medir(self):
+        return sum(tamanho for _, tamanho, _ in self._entradas())
+
+    def _remover_antigas(self):
+        """Remove as entradas usadas há mais tempo até o cache ficar em 90% do tamanho máximo"""
+        with self._lock:
+            entradas = sorted(self._entradas())
+            total = sum(tamanho for _, tamanho, _ in entradas)
+            alvo = self.tamanho_maximo * 0.9
+            removidas = 0
+            for _, tamanho, caminho in entradas:
+                if total <= alvo:
+                    break
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    continue
+                total -= tamanho
+                removidas += 1
+            self._tamanho = total
+            self.estatisticas['removidas'] += removidas
+
+    def registrar_estatisticas(self):
+        """Registra no log acertos, faltas e ocupação do cache"""
+        if not self.ativo:
+            return
+        e = self.estatisticas
+        consultas = e['acertos'] + e['faltas']
+        if not consultas and not e['gravadas']:
+            return
+        taxa = e['acertos'] / consultas if consultas else 0
+        tamanho = self._tamanho if self._tamanho is not None else self._medir()
+        modo = " (somente cache)" if self.somente_cache else ""
+        logging.info(f"Cache HTTP{modo}: {e['acertos']}/{consultas} acertos ({taxa:.0%}), {e['vencidas']} vencidas, "
+                     f"{e['gravadas']} gravadas, {e['removidas']} removidas por tamanho, "
+                     f"{e['bytes_servidos'] / 1024:.0f} KB servidos do disco, {tamanho / 1024 / 1024:.1f} MB em disco")
+
+    def limpar(self):
+        """Apaga todas as entradas"""
+        with self._lock:
+            for _, _, caminho in self._entradas():
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+            self._tamanho = 0
@@ -0,0 +1,179 @@
+import json
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+class ColetorMetricas:
+    """
+    Registra a duração de cada etapa da coleta (spans) com as tags perfil, rede
+    e método. As tags de perfil e rede podem vir de um contexto por thread
+    (contexto()), para que funções internas não precisem recebê-las.
+    Também guarda séries de amostras (como a memória do navegador a cada página).
+    No fim da execução exporta JSON, texto no formato do Prometheus e um resumo
+    com p50/p95 por etapa e os perfis mais lentos.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.amostras = []
+        self.inicio = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _tags_contexto(self):
+        return getattr(self._local, 'tags', {})
+
+    @contextmanager
+    def contexto(self, **tags):
+        """Tags (perfil, rede...) herdadas pelos spans registrados dentro do bloco, na mesma thread"""
+        anteriores = self._tags_contexto()
+        self._local.tags = {**anteriores, **tags}
+        try:
+            yield
+        finally:
+            self._local.tags = anteriores
+
+    def registrar(self, etapa, duracao, **tags):
+        """Registra um span já medido (duração em segundos)"""
+        registro = {'etapa': etapa, **self._tags_contexto(), **tags,
+                    'duracao': round(duracao, 6), 'fim': round(time.time(), 3), 'pid': os.getpid()}
+        with self._lock:
+            self.spans.append(registro)
+
+    @contextmanager
+    def span(self, etapa, **tags):
+        """Mede o bloco; se ele lançar exceção o span é marcado com erro=True"""
+        inicio = time.perf_counter()
+        erro = False
+        try:
+            yield
+        except BaseException:
+            erro = True
+            raise
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio, **tags, **({'erro': True} if erro else {}))
+
+    def amostra(self, serie, valor, **tags):
+        """Registra um valor de uma série (por exemplo, memória do navegador em MB)"""
+        registro = {'serie': serie, 'valor': round(valor, 3), **tags, 'hora': round(time.time(), 3), 'pid': os.getpid()}
+        with self._lock:
+            self.amostras.append(registro)
+
+    def reiniciar(self):
+        """Descarta o que foi herdado do processo principal (usado nos processos paralelos)"""
+        with self._lock:
+            self.spans = []
+            self.amostras = []
+
+    def estado(self):
+        """Spans e amostras deste processo, para devolver ao processo principal"""
+        with self._lock:
+            return {'spans': list(self.spans), 'amostras': list(self.amostras)}
+
+    def incorporar(self, estado):
+        """Acrescenta spans e amostras vindos de processos paralelos"""
+        with self._lock:
+            self.spans.extend(estado.get('spans', []))
+            self.amostras.extend(estado.get('amostras', []))
+
+    def resumo(self, mais_lentos=10):
+        """p50/p95/máximo por etapa (e por método de extração) e os perfis com maior tempo total"""
+        with self._lock:
+            spans = list(self.spans)
+
+        grupos = {}
+        for span in spans:
+            chave = span['etapa'] if not span.get('metodo') else f"{span['etapa']}:{span['metodo']}"
+            grupos.setdefault(chave, []).append(span['duracao'])
+        etapas = []
+        for chave, duracoes in grupos.items():
+            valores = np.asarray(duracoes)
+            etapas.append({'etapa': chave, 'quantidade': len(valores), 'total_s': round(float(valores.sum()), 3),
+                           'p50_s': round(float(np.percentile(valores, 50)), 4),
+                           'p95_s': round(float(np.percentile(valores, 95)), 4),
+                           'max_s': round(float(valores.max()), 4)})
+        etapas.sort(key=lambda e: e['total_s'], reverse=True)
+
+        # Tempo de cada perfil: consulta na fase HTTP mais o processamento no navegador
+        perfis = {}
+        for span in spans:
+            if span.get('perfil') and (span['etapa'] == 'perfil' or span.get('metodo') == 'http'):
+                chave = (span['perfil'], span.get('rede'))
+                perfis[chave] = perfis.get(chave, 0) + span['duracao']
+        lentos = sorted(perfis.items(), key=lambda item: item[1], reverse=True)[:mais_lentos]
+
+        with self._lock:
+            amostras = list(self.amostras)
+        series = {}
+        for amostra in amostras:
+            series.setdefault(amostra['serie'], []).append(amostra['valor'])
+        series = {serie: {'quantidade': len(valores), 'min': min(valores), 'p50': float(np.percentile(valores, 50)),
+                          'max': max(valores), 'ultima': valores[-1]}
+                  for serie, valores in series.items()}
+        return {'etapas': etapas,
+                'perfis_mais_lentos': [{'perfil': p, 'rede': r, 'duracao_s': round(d, 3)} for (p, r), d in lentos],
+                'series': series}
+
+    def registrar_resumo(self):
+        """Escreve no log o resumo por etapa e os perfis mais lentos"""
+        resumo = self.resumo()
+        logging.info("📊 Tempo por etapa (total, p50, p95, máximo):")
+        for etapa in resumo['etapas']:
+            logging.info(f"  {etapa['etapa']}: {etapa['quantidade']}x, total {etapa['total_s']:.1f}s, "
+                         f"p50 {etapa['p50_s']:.2f}s, p95 {etapa['p95_s']:.2f}s, máx {etapa['max_s']:.2f}s")
+        if resumo['perfis_mais_lentos']:
+            lentos = ", ".join(f"{p['perfil']} ({p['duracao_s']:.1f}s)" for p in resumo['perfis_mais_lentos'])
+            logging.info(f"🐢 Perfis mais lentos: {lentos}")
+        for serie, dados in resumo['series'].items():
+            logging.info(f"📈 {serie}: {dados['quantidade']} amostras, mín {dados['min']:.0f}, "
+                         f"p50 {dados['p50']:.0f}, máx {dados['max']:.0f}")
+
+    def exportar_json(self, caminho, extra=None):
+        """Grava spans, amostras, resumo e informações da execução em JSON"""
+        with self._lock:
+            spans = list(self.spans)
+            amostras = list(self.amostras)
+        dados = {
+            'execucao': {'inicio': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.inicio)),
+                         'duracao_s': round(time.time() - self.inicio, 3), **(extra or {})},
+            'resumo': self.resumo(),
+            'spans': spans,
+            'amostras': amostras,
+        }
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(temporario, caminho)
+        logging.info(f"Métricas salvas em {caminho} ({len(spans)} spans)")
+
+    def exportar_prometheus(self, caminho):
+        """Grava um summary por (etapa, rede, método) no formato texto do Prometheus"""
+        with self._lock:
+            spans = list(self.spans)
+        series = {}
+        for span in spans:
+            chave = (span['etapa'], span.get('rede') or '', span.get('metodo') or '')
+            series.setdefault(chave, []).append(span['duracao'])
+
+        def escapar(valor):
+            return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        linhas = ["# HELP coletor_etapa_duracao_segundos Duração das etapas da coleta de seguidores",
+                  "# TYPE coletor_etapa_duracao_segundos summary"]
+        for (etapa, rede, metodo), duracoes in sorted(series.items()):
+            rotulos = f'etapa="{escapar(etapa)}",rede="{escapar(rede)}",metodo="{escapar(metodo)}"'
+            valores = np.asarray(duracoes)
+            for quantil in (0.5, 0.95, 0.99):
+                linhas.append(f'coletor_etapa_duracao_segundos{{{rotulos},quantile="{quantil}"}} '
+                              f'{float(np.percentile(valores, quantil * 100)):.6f}')
+            linhas.append(f'coletor_etapa_duracao_segundos_sum{{{rotulos}}} {float(valores.sum()):.6f}')
+            linhas.append(f'coletor_etapa_duracao_segundos_count{{{rotulos}}} {len(valores)}')
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write("\n".join(linhas) + "\n")
+        logging.info(f"Métricas no formato Prometheus salvas em {caminho}")
+
+# Coletor da execução atual; nos processos paralelos os spans voltam ao principal
+METRICAS = ColetorMetricas()
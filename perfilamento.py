@@ -0,0 +1,205 @@
+import os
+import sys
+import time
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+# Frames de arquivos do projeto levam o número da linha (cada chamada a page_source,
+# cada regex e cada etapa do pandas vira um centro de custo próprio); frames de
+# bibliotecas ficam agregados por função
+PASTA_PROJETO = os.path.dirname(os.path.abspath(__file__))
+
+# Threads do próprio perfilamento, fora da amostragem
+THREADS_INTERNAS = ('amostrador-pilhas', 'monitor-memoria')
+
+# Folhas de threads ociosas (workers do asyncio.to_thread esperando tarefa na fila)
+FOLHAS_OCIOSAS = ('_worker (thread.py)',)
+
+def _rotulo(frame):
+    codigo = frame.f_code
+    arquivo = codigo.co_filename
+    if arquivo.startswith(PASTA_PROJETO):
+        return f"{codigo.co_name} ({os.path.relpath(arquivo, PASTA_PROJETO)}:{frame.f_lineno or codigo.co_firstlineno})"
+    return f"{codigo.co_name} ({os.path.basename(arquivo)})"
+
+class AmostradorPilhas:
+    """
+    Profiler por amostragem: uma thread lê a pilha de todas as outras threads a
+    cada `intervalo` segundos e acumula, por pilha, os milissegundos de parede
+    desde a leitura anterior. Chamadas em C que seguram o GIL (page_source, regex
+    em HTML grande, pandas) atrasam a amostra seguinte; contar tempo em vez de
+    amostras evita subestimá-las. As pilhas ficam no formato colapsado
+    (raiz;...;folha), o mesmo usado por flamegraph.pl, speedscope e inferno.
+    """
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.contagens = Counter()
+        self.amostras = 0
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _amostrar(self):
+        anterior = time.perf_counter()
+        while not self._parar.is_set():
+            agora = time.perf_counter()
+            peso = max(round((agora - anterior) * 1000), 1)
+            anterior = agora
+            nomes = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if nomes.get(ident) in THREADS_INTERNAS:
+                    continue
+                pilha = []
+                while frame is not None:
+                    pilha.append(_rotulo(frame))
+                    frame = frame.f_back
+                if pilha and pilha[0] in FOLHAS_OCIOSAS:
+                    continue
+                pilha.append(nomes.get(ident, f"thread-{ident}"))
+                self.contagens[';'.join(reversed(pilha))] += peso
+            self.amostras += 1
+            time.sleep(self.intervalo)
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._amostrar, name='amostrador-pilhas', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def salvar_colapsado(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for pilha, contagem in self.contagens.most_common():
+                f.write(f"{pilha} {contagem}\n")
+
+    def funcoes_mais_custosas(self, quantidade=30):
+        """(rótulo, ms próprios, ms inclusivos) ordenados pelo tempo inclusivo"""
+        proprio = Counter()
+        inclusivo = Counter()
+        for pilha, contagem in self.contagens.items():
+            frames = pilha.split(';')[1:]  # Sem o nome da thread
+            if not frames:
+                continue
+            proprio[frames[-1]] += contagem
+            for rotulo in set(frames):
+                inclusivo[rotulo] += contagem
+        return [(rotulo, proprio[rotulo], total) for rotulo, total in inclusivo.most_common(quantidade)]
+
+class MonitorMemoria:
+    """Tira um snapshot do tracemalloc sempre que a memória rastreada passa do maior valor já visto"""
+
+    def __init__(self, intervalo=0.5, margem=1.1):
+        self.intervalo = intervalo
+        self.margem = margem
+        self.snapshot = None
+        self.tamanho = 0
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _monitorar(self):
+        while not self._parar.wait(self.intervalo):
+            atual, _ = tracemalloc.get_traced_memory()
+            if atual > self.tamanho * self.margem:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.tamanho = atual
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._monitorar, name='monitor-memoria', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+def relatorio_cpu(amostrador, duracao, quantidade=30):
+    total = max(sum(amostrador.contagens.values()), 1)
+    linhas = [f"Amostragem: {amostrador.amostras} rodadas a cada {amostrador.intervalo * 1000:.0f} ms em {duracao:.1f}s "
+              f"({total / 1000:.1f}s somando todas as threads; inclui esperas de rede e do navegador)", "",
+              f"{'inclusivo':>10} {'próprio':>10}  função"]
+    for rotulo, proprio, inclusivo in amostrador.funcoes_mais_custosas(quantidade):
+        linhas.append(f"{inclusivo / total:>9.1%} {proprio / total:>10.1%}  {rotulo}")
+    return "\n".join(linhas) + "\n"
+
+def _filtrar(snapshot):
+    return snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+def _secao_memoria(titulo, snapshot, quantidade):
+    snapshot = _filtrar(snapshot)
+    linhas = [f"{titulo}", "", f"Top {quantidade} alocações por linha:"]
+    for estatistica in snapshot.statistics('lineno')[:quantidade]:
+        frame = estatistica.traceback[0]
+        linhas.append(f"{estatistica.size / 1024:>10.1f} KB {estatistica.count:>8} blocos  {frame.filename}:{frame.lineno}")
+    linhas += ["", "Top 10 pilhas de alocação:"]
+    for estatistica in snapshot.statistics('traceback')[:10]:
+        linhas.append(f"{estatistica.size / 1024:.1f} KB em {estatistica.count} blocos")
+        linhas += [f"    {linha}" for linha in estatistica.traceback.format(most_recent_first=True)[:16]]
+    return linhas
+
+def relatorio_memoria(snapshot_pico, tamanho_pico, snapshot_final, pico, quantidade=25):
+    """Maiores alocações perto do pico de memória e as que continuam vivas no fim da execução"""
+    linhas = [f"Pico de memória rastreada: {pico / 1024 / 1024:.1f} MB", ""]
+    if snapshot_pico is not None:
+        linhas += _secao_memoria(f"== Perto do pico ({tamanho_pico / 1024 / 1024:.1f} MB) ==", snapshot_pico, quantidade)
+        linhas.append("")
+    linhas += _secao_memoria("== Fim da execução ==", snapshot_final, quantidade)
+    return "\n".join(linhas) + "\n"
+
+@contextmanager
+def perfilar(pasta='perfilamento', intervalo_ms=5, frames_memoria=10):
+    """
+    Executa o bloco com o amostrador de CPU e o tracemalloc ligados e grava em
+    `pasta`, com o horário da execução no nome:
+      *_cpu.collapsed  pilhas colapsadas (entrada de flamegraph.pl / speedscope)
+      *_cpu.txt        funções com mais tempo inclusivo e próprio
+      *_memoria.txt    pico e maiores alocações (perto do pico e no fim) por linha e por pilha
+    O tracemalloc deixa muito mais lento o código que faz muitas alocações
+    pequenas (o pandas ao gravar o CSV, por exemplo) e distorce o perfil de CPU;
+    com frames_memoria=0 ele fica desligado e só o perfil de CPU é gravado.
+    Só o processo atual é amostrado; os processos do modo --workers não entram.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    prefixo = os.path.join(pasta, f"perfil_{time.strftime('%Y%m%d_%H%M%S')}")
+    memoria = frames_memoria > 0
+    logging.info(f"🔬 Perfilamento ativo (amostragem a cada {intervalo_ms} ms"
+                 f"{', tracemalloc' if memoria else ''}), saída em {prefixo}_*")
+
+    if memoria:
+        tracemalloc.start(frames_memoria)
+    amostrador = AmostradorPilhas(intervalo_ms / 1000)
+    monitor = MonitorMemoria()
+    inicio = time.time()
+    amostrador.iniciar()
+    if memoria:
+        monitor.iniciar()
+    try:
+        yield
+    finally:
+        amostrador.parar()
+        monitor.parar()
+        duracao = time.time() - inicio
+        arquivos = [f"{prefixo}_cpu.collapsed", f"{prefixo}_cpu.txt"]
+        amostrador.salvar_colapsado(arquivos[0])
+        with open(arquivos[1], 'w', encoding='utf-8') as f:
+            f.write(relatorio_cpu(amostrador, duracao))
+
+        if memoria:
+            snapshot = tracemalloc.take_snapshot()
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            arquivos.append(f"{prefixo}_memoria.txt")
+            with open(arquivos[2], 'w', encoding='utf-8') as f:
+                f.write(relatorio_memoria(monitor.snapshot, monitor.tamanho, snapshot, pico))
+            logging.info(f"🔬 Pico de memória Python: {pico / 1024 / 1024:.1f} MB")
+        logging.info(f"🔬 Perfilamento salvo: {', '.join(arquivos)}")
@@ -0,0 +1,160 @@
+import pandas as pd
+import json
+import os
+import time
+import logging
+import argparse
+from armazenamento import abrir_armazenamento
+from analise import normalizar_historico
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+
+# Períodos das colunas de crescimento do resumo (rótulo, dias)
+PERIODOS_CRESCIMENTO = [('Δ 1d', 1), ('Δ 7d', 7), ('Δ 30d', 30)]
+
+def carregar_manifesto(caminho):
+    """Lê o manifesto da última geração: {chave da seção: {'hash', 'texto'}}"""
+    if not os.path.exists(caminho):
+        return {}
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f).get('secoes', {})
+    except Exception as e:
+        logging.warning(f"Manifesto {caminho} ilegível, relatório será gerado por completo: {str(e)[:100]}")
+        return {}
+
+def salvar_manifesto(caminho, secoes):
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({'versao': 1, 'secoes': secoes}, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(temporario, caminho)
+
+def calcular_crescimento(df):
+    """
+    Resumo por perfil com a última contagem e a variação em cada período de
+    PERIODOS_CRESCIMENTO, calculado de uma vez para todos os perfis com merge_asof.
+    Contagens 0 (falhas de coleta) não entram como base de comparação.
+    """
+    df = df.sort_values('data')
+    ultimos = df.groupby(['rede', 'nome'], sort=False).tail(1).reset_index(drop=True)
+    validos = df[df['seguidores'] > 0][['data', 'rede', 'nome', 'seguidores']]
+
+    for rotulo, dias in PERIODOS_CRESCIMENTO:
+        alvo = ultimos[['rede', 'nome', 'data']].assign(referencia=ultimos['data'] - pd.Timedelta(days=dias))
+        base = pd.merge_asof(
+            alvo.sort_values('referencia'),
+            validos.rename(columns={'data': 'referencia', 'seguidores': 'base'}),
+            on='referencia', by=['rede', 'nome'], direction='backward'
+        )
+        ultimos = ultimos.merge(base[['rede', 'nome', 'base']], on=['rede', 'nome'], how='left')
+        delta = ultimos['seguidores'] - ultimos['base']
+        # Sem base ou sem contagem atual não há variação
+        delta = delta.where((ultimos['seguidores'] > 0) & ultimos['base'].notna())
+        ultimos[rotulo] = delta
+        ultimos[rotulo + ' %'] = delta / ultimos['base'] * 100
+        ultimos = ultimos.drop(columns='base')
+
+    return ultimos.sort_values(['rede', 'nome'], ignore_index=True)
+
+def _formatar_variacao(delta, percentual):
+    if pd.isna(delta):
+        return "-"
+    return f"{int(delta):+d} ({percentual:+.2f}%)"
+
+def montar_resumo(resumo, data_relatorio):
+    linhas = [f"# Relatório de Seguidores - {data_relatorio}", ""]
+    cabecalho = ["Nome", "Rede", "Seguidores"] + [rotulo for rotulo, _ in PERIODOS_CRESCIMENTO]
+    linhas.append("| " + " | ".join(cabecalho) + " |")
+    linhas.append("|" + "|".join("-" * (len(coluna) + 2) for coluna in cabecalho) + "|")
+    for registro in resumo.to_dict('records'):
+        colunas = [registro['nome'], registro['rede'], str(registro['seguidores'])]
+        colunas += [_formatar_variacao(registro[rotulo], registro[rotulo + ' %']) for rotulo, _ in PERIODOS_CRESCIMENTO]
+        linhas.append("| " + " | ".join(colunas) + " |")
+    return "\n".join(linhas) + "\n"
+
+def hash_secoes(janela):
+    """Hash do conteúdo de cada seção (rede, nome), calculado para todos os perfis de uma vez"""
+    linhas = pd.util.hash_pandas_object(janela[['data', 'seguidores']], index=False)
+    hashes = linhas.groupby([janela['rede'], janela['nome']]).sum()
+    quantidades = janela.groupby(['rede', 'nome']).size()
+    return {f"{rede}|{nome}": f"{int(valor):016x}-{quantidades[(rede, nome)]}"
+            for (rede, nome), valor in hashes.items()}
+
+def montar_secao(nome, historico):
+    linhas = [f"#### {nome}", "", "| Data | Seguidores |", "|------|------------|"]
+    for data, seguidores in zip(historico['data'].dt.strftime('%Y-%m-%d'), historico['seguidores']):
+        linhas.append(f"| {data} | {seguidores} |")
+    return "\n".join(linhas) + "\n"
+
+def gerar_relatorio(armazenamento='csv', saida='relatorio.md', manifesto='relatorio_manifesto.json',
+                    dias_historico=30, completo=False):
+    """
+    Gera relatorio.md a partir do backend de resultados.
+    O resumo é sempre recalculado; as seções de histórico só são remontadas
+    para perfis cujo hash de conteúdo mudou desde a última geração.
+    """
+    inicio = time.perf_counter()
+    backend = abrir_armazenamento(armazenamento)
+    try:
+        df = normalizar_historico(backend.ler())
+    finally:
+        backend.fechar()
+
+    if df.empty:
+        logging.warning("Nenhum resultado no armazenamento, relatório não gerado")
+        return
+
+    data_relatorio = df['data'].max().strftime('%Y-%m-%d')
+    resumo = calcular_crescimento(df)
+
+    # Últimos dias_historico registros de cada perfil, mais recentes primeiro
+    janela = df.sort_values(['rede', 'nome', 'data'], ascending=[True, True, False])
+    janela = janela.groupby(['rede', 'nome'], sort=False).head(dias_historico)
+
+    anteriores = {} if completo else carregar_manifesto(manifesto)
+    hashes = hash_secoes(janela)
+    alteradas = {chave for chave, valor in hashes.items() if anteriores.get(chave, {}).get('hash') != valor}
+
+    # Só os perfis alterados são agrupados e remontados; os demais reaproveitam o texto do manifesto
+    secoes = {chave: {'hash': valor, 'texto': anteriores[chave]['texto']}
+              for chave, valor in hashes.items() if chave not in alteradas}
+    if alteradas:
+        chaves = janela['rede'] + '|' + janela['nome']
+        for chave, historico in janela[chaves.isin(alteradas)].groupby(chaves):
+            secoes[chave] = {'hash': hashes[chave], 'texto': montar_secao(historico['nome'].iloc[0], historico)}
+
+    partes = [montar_resumo(resumo, data_relatorio), "\n## Histórico Recente\n\n"]
+    rede_atual = None
+    for chave in sorted(secoes):
+        rede = chave.split('|', 1)[0]
+        if rede != rede_atual:
+            partes.append(f"\n### {rede}\n\n")
+            rede_atual = rede
+        partes.append("\n" + secoes[chave]['texto'])
+
+    with open(saida, 'w', encoding='utf-8') as f:
+        f.write("".join(partes))
+    salvar_manifesto(manifesto, secoes)
+
+    logging.info(f"Relatório salvo em {saida}: {len(alteradas)}/{len(secoes)} seções regeneradas "
+                 f"em {time.perf_counter() - inicio:.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera relatorio.md a partir dos resultados coletados")
+    parser.add_argument("--armazenamento", choices=["csv", "sqlite", "parquet"], default="csv",
+                        help="Backend de onde ler os resultados (padrão: csv)")
+    parser.add_argument("--saida", default="relatorio.md")
+    parser.add_argument("--manifesto", default="relatorio_manifesto.json",
+                        help="Hashes e texto das seções da última geração")
+    parser.add_argument("--dias", type=int, default=30,
+                        help="Registros de histórico mostrados por perfil (padrão: 30)")
+    parser.add_argument("--completo", action="store_true",
+                        help="Ignora o manifesto e regenera todas as seções")
+    args = parser.parse_args()
+    gerar_relatorio(args.armazenamento, args.saida, args.manifesto, args.dias, args.completo)
@@ -12,10 +12,26 @@ from webdriver_manager.chrome import ChromeDriverManager
 import time
 import os
 import random
+import zlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib.parse import urlparse
+import threading
+import weakref
 from datetime import datetime
 import traceback
+import base64
 import logging
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from armazenamento import abrir_armazenamento, COLUNAS
+from analise import planejar_coleta
+from metricas import METRICAS
+from perfilamento import perfilar
+from cache_http import CacheHTTP, RespostaCache
 
 # Configurar logging apenas para console (sem arquivo)
 logging.basicConfig(
@@ -26,8 +42,12 @@ logging.basicConfig(
     ]
 )
 
-def configurar_driver():
-    """Configura e retorna uma instância do ChromeDriver com configurações anti-detecção"""
+def configurar_driver(bloquear_recursos=True, medir_bloqueio=False):
+    """
+    Configura e retorna uma instância do ChromeDriver com configurações anti-detecção.
+    Com bloquear_recursos, fontes, mídia, estilos e rastreadores são bloqueados via CDP;
+    medir_bloqueio carrega cada página também sem bloqueio para medir a economia.
+    """
     logging.info("Configurando o ChromeDriver")
     options = Options()
     
@@ -63,6 +83,9 @@ def configurar_driver():
     prefs = {"profile.managed_default_content_settings.images": 2}
     options.add_experimental_option("prefs", prefs)
     
+    # Log de performance com os eventos de rede (CDP), usado nas medições de carga
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    
     # No GitHub Actions, use o Chrome já instalado
     try:
         logging.info("Tentando usar o Chrome instalado no ambiente...")
@@ -70,6 +93,7 @@ def configurar_driver():
         
         # Executar apenas os comandos básicos de mascaramento que sabemos que funcionam
         driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": chosen_user_agent})
+        _preparar_bloqueios(driver, bloquear_recursos, medir_bloqueio)
         
         logging.info("Chrome inicializado com sucesso")
         return driver
@@ -81,10 +105,21 @@ def configurar_driver():
         
         # Executar apenas os comandos básicos de mascaramento que sabemos que funcionam
         driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": chosen_user_agent})
+        _preparar_bloqueios(driver, bloquear_recursos, medir_bloqueio)
         
         logging.info("Chrome inicializado com ChromeDriverManager")
         return driver
 
+def _preparar_bloqueios(driver, bloquear_recursos, medir_bloqueio):
+    """Habilita o domínio Network do CDP e guarda no driver as opções de bloqueio"""
+    driver.bloquear_recursos = bloquear_recursos
+    driver.medir_bloqueio = medir_bloqueio
+    driver.bloqueios = carregar_bloqueios() if bloquear_recursos else {}
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+    except Exception as e:
+        logging.info(f"Não foi possível habilitar o domínio Network do CDP: {str(e)[:100]}")
+
 def diagnosticar_pagina_instagram(driver, nome_pagina):
     """Diagnostica o que está realmente sendo carregado pelo Instagram."""
     logging.info(f"Diagnóstico da página para {nome_pagina}")
@@ -192,57 +227,885 @@ def tirar_screenshot(driver, nome_pagina):
     """Função mantida para compatibilidade, mas não salva mais screenshots"""
     logging.info(f"Screenshot para {nome_pagina} desativado")
 
+# ----- SESSÕES HTTP COMPARTILHADAS -----
+
+class _AdaptadorContado(HTTPAdapter):
+    """HTTPAdapter que informa ao pool cada requisição enviada e cada conexão TCP/TLS aberta"""
+    
+    def __init__(self, pool_sessoes, **kwargs):
+        self._pool_sessoes = pool_sessoes
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pool_sessoes = self._pool_sessoes
+        
+        class _PoolHTTPContado(HTTPConnectionPool):
+            def _new_conn(self):
+                pool_sessoes._registrar(self.host, conexao_nova=True)
+                return super()._new_conn()
+        
+        class _PoolHTTPSContado(HTTPSConnectionPool):
+            def _new_conn(self):
+                pool_sessoes._registrar(self.host, conexao_nova=True)
+                return super()._new_conn()
+        
+        self.poolmanager.pool_classes_by_scheme = {'http': _PoolHTTPContado, 'https': _PoolHTTPSContado}
+    
+    def send(self, request, **kwargs):
+        self._pool_sessoes._registrar(urlparse(request.url).hostname)
+        return super().send(request, **kwargs)
+
+class PoolSessoes:
+    """
+    Mantém uma sessão HTTP por host durante toda a execução, reaproveitando
+    conexões keep-alive (sem repetir DNS, TCP e TLS) e os cookies recebidos.
+    Com http2=True usa httpx com HTTP/2, se o pacote estiver instalado.
+    """
+    
+    def __init__(self, max_conexoes=10, http2=False):
+        self.max_conexoes = max_conexoes
+        self.http2 = http2
+        self._sessoes = {}
+        self._contadores = {}
+        # Só referências fracas: a conexão que o httpx fecha e descarta sai sozinha do conjunto
+        self._streams_http2 = weakref.WeakSet()
+        self._lock = threading.Lock()
+        
+        if http2:
+            try:
+                import httpx
+                import h2  # noqa: F401 - necessário para httpx negociar HTTP/2
+                self._httpx = httpx
+            except ImportError:
+                logging.warning("httpx[http2] não instalado, usando requests com HTTP/1.1")
+                self.http2 = False
+    
+    def _registrar(self, host, conexao_nova=False):
+        with self._lock:
+            contador = self._contadores.setdefault(host, {'requisicoes': 0, 'conexoes_novas': 0})
+            if conexao_nova:
+                contador['conexoes_novas'] += 1
+            else:
+                contador['requisicoes'] += 1
+    
+    def _criar_sessao(self):
+        if self.http2:
+            limites = self._httpx.Limits(max_connections=self.max_conexoes,
+                                         max_keepalive_connections=self.max_conexoes)
+            return self._httpx.Client(http2=True, follow_redirects=True, limits=limites)
+        
+        session = requests.Session()
+        adaptador = _AdaptadorContado(self, pool_connections=1, pool_maxsize=self.max_conexoes, pool_block=True)
+        session.mount('http://', adaptador)
+        session.mount('https://', adaptador)
+        return session
+    
+    def sessao(self, url):
+        """Retorna a sessão (criada sob demanda) do host da URL"""
+        host = urlparse(url).hostname
+        with self._lock:
+            if host not in self._sessoes:
+                self._sessoes[host] = self._criar_sessao()
+            return self._sessoes[host]
+    
+    def get(self, url, **kwargs):
+        """GET pela sessão do host, com as mesmas opções de requests.get"""
+        response = self.sessao(url).get(url, **kwargs)
+        
+        if self.http2:
+            # httpx não expõe a abertura de conexões; cada stream de rede distinto é uma conexão
+            host = urlparse(url).hostname
+            stream = response.extensions.get('network_stream')
+            self._registrar(host)
+            with self._lock:
+                nova = stream is not None and stream not in self._streams_http2
+                if nova:
+                    self._streams_http2.add(stream)
+            if nova:
+                self._registrar(host, conexao_nova=True)
+        return response
+    
+    def estatisticas(self):
+        """Retorna {host: {requisicoes, conexoes_novas, conexoes_reutilizadas}}"""
+        with self._lock:
+            return {
+                host: {
+                    'requisicoes': c['requisicoes'],
+                    'conexoes_novas': c['conexoes_novas'],
+                    'conexoes_reutilizadas': max(c['requisicoes'] - c['conexoes_novas'], 0),
+                }
+                for host, c in self._contadores.items()
+            }
+    
+    def registrar_estatisticas(self):
+        """Registra no log o reaproveitamento de conexões por host"""
+        for host, c in sorted(self.estatisticas().items()):
+            logging.info(f"Conexões HTTP {host}: {c['requisicoes']} requisições, "
+                         f"{c['conexoes_novas']} conexões novas, {c['conexoes_reutilizadas']} reutilizadas")
+    
+    def fechar(self):
+        with self._lock:
+            for sessao in self._sessoes.values():
+                sessao.close()
+            self._sessoes.clear()
+
+# Pool usado por todas as requisições HTTP da execução (reconfigurado pela linha de comando)
+POOL_SESSOES = PoolSessoes()
+
+def configurar_pool_sessoes(max_conexoes=10, http2=False):
+    """Substitui o pool global de sessões HTTP"""
+    global POOL_SESSOES
+    POOL_SESSOES.fechar()
+    POOL_SESSOES = PoolSessoes(max_conexoes=max_conexoes, http2=http2)
+    return POOL_SESSOES
+
+# ----- LIMITE DE TAXA POR DOMÍNIO -----
+
+class LimitadorTaxa:
+    """
+    Token bucket por domínio (instagram.com, linkedin.com...) com taxa adaptativa:
+    a taxa cai pela metade a cada 429 ou parede de login e volta a subir aos poucos
+    enquanto as respostas estão saudáveis. Domínios diferentes não esperam um pelo outro.
+    A vaga só é consumida no momento do envio (tentar_reservar): quem está na fila
+    volta a consultar o balde depois de cada espera, então um bloqueio (que reduz a
+    taxa e aplica `penalidade` vagas de silêncio) atrasa também as requisições já enfileiradas.
+    """
+    
+    def __init__(self, taxa_inicial=0.15, taxa_minima=1/120, taxa_maxima=0.5,
+                 incremento=0.02, jitter=0.3, penalidade=1.0, fator=1.0):
+        # Taxas em requisições por segundo; fator < 1 divide a taxa entre vários processos
+        self.taxa_inicial = taxa_inicial * fator
+        self.taxa_minima = taxa_minima * fator
+        self.taxa_maxima = taxa_maxima * fator
+        self.incremento = incremento * fator
+        self.jitter = jitter
+        self.penalidade = penalidade
+        self._baldes = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def dominio(url):
+        """Reduz o host ao domínio registrado (www.instagram.com -> instagram.com)"""
+        host = urlparse(url).hostname or url
+        partes = host.split('.')
+        return '.'.join(partes[-2:]) if len(partes) > 2 and not host.replace('.', '').isdigit() else host
+    
+    def _balde(self, dominio):
+        if dominio not in self._baldes:
+            self._baldes[dominio] = {
+                'tokens': 1.0, 'taxa': self.taxa_inicial, 'atualizado': time.monotonic(),
+                'requisicoes': 0, 'bloqueios': 0, 'espera_total': 0.0,
+            }
+        balde = self._baldes[dominio]
+        agora = time.monotonic()
+        balde['tokens'] = min(1.0, balde['tokens'] + (agora - balde['atualizado']) * balde['taxa'])
+        balde['atualizado'] = agora
+        return balde
+    
+    def espera_estimada(self, url):
+        """Segundos até o domínio liberar a próxima requisição, sem reservá-la"""
+        with self._lock:
+            balde = self._balde(self.dominio(url))
+            return 0.0 if balde['tokens'] >= 1 else (1 - balde['tokens']) / balde['taxa']
+    
+    def tentar_reservar(self, url, esperado=0.0):
+        """
+        Consome a vaga do domínio se ela já estiver livre e retorna 0; senão retorna
+        quantos segundos faltam para a próxima (com variação aleatória), sem reservá-la.
+        esperado é o tempo que o chamador já passou na fila, somado às estatísticas.
+        """
+        with self._lock:
+            balde = self._balde(self.dominio(url))
+            if balde['tokens'] >= 1:
+                balde['tokens'] -= 1
+                balde['requisicoes'] += 1
+                balde['espera_total'] += esperado
+                return 0.0
+            # Variação aleatória para não gerar um padrão fixo de acessos
+            return (1 - balde['tokens']) / balde['taxa'] * random.uniform(1, 1 + self.jitter)
+    
+    def aguardar(self, url):
+        inicio = time.monotonic()
+        espera = self.tentar_reservar(url)
+        if espera > 0:
+            logging.info(f"Aguardando {espera:.1f}s pelo limite de taxa de {self.dominio(url)}")
+        while espera > 0:
+            time.sleep(espera)
+            espera = self.tentar_reservar(url, time.monotonic() - inicio)
+    
+    async def aguardar_async(self, url):
+        inicio = time.monotonic()
+        espera = self.tentar_reservar(url)
+        while espera > 0:
+            await asyncio.sleep(espera)
+            espera = self.tentar_reservar(url, time.monotonic() - inicio)
+    
+    def registrar(self, url, bloqueado):
+        """Ajusta a taxa do domínio conforme a resposta (429/login reduzem, sucesso aumenta)"""
+        dominio = self.dominio(url)
+        with self._lock:
+            balde = self._balde(dominio)
+            if bloqueado:
+                balde['taxa'] = max(balde['taxa'] / 2, self.taxa_minima)
+                balde['tokens'] = min(balde['tokens'], 0.0) - self.penalidade
+                balde['bloqueios'] += 1
+                logging.info(f"⚠️ Bloqueio em {dominio}: taxa reduzida para {balde['taxa'] * 60:.1f} req/min")
+            else:
+                balde['taxa'] = min(balde['taxa'] + self.incremento, self.taxa_maxima)
+    
+    def registrar_estatisticas(self):
+        """Registra no log a taxa final, requisições, bloqueios e espera por domínio"""
+        with self._lock:
+            for dominio, balde in sorted(self._baldes.items()):
+                logging.info(f"Limite de taxa {dominio}: {balde['requisicoes']} requisições, "
+                             f"{balde['bloqueios']} bloqueios, {balde['espera_total']:.0f}s de espera, "
+                             f"taxa final {balde['taxa'] * 60:.1f} req/min")
+
+# Limitador usado por todas as requisições (HTTP e navegador) da execução
+LIMITADOR = LimitadorTaxa()
+
+def configurar_limitador(fator=1.0):
+    """Substitui o limitador global; fator < 1 reparte a taxa entre processos paralelos"""
+    global LIMITADOR
+    LIMITADOR = LimitadorTaxa(fator=fator)
+    return LIMITADOR
+
+class DisjuntorRede:
+    """
+    Circuit breaker por domínio e canal ('http' ou 'navegador'), alimentado pelos
+    mesmos sinais do limitador (429, redirecionamento para login/challenge/authwall,
+    aviso de "tente mais tarde"). Os canais têm circuitos separados: requisições HTTP
+    anônimas caem na authwall do LinkedIn com frequência (é para isso que existe a
+    fase do navegador) e isso não deve suspender os perfis no navegador.
+    - fechado: requisições normais; `limite` bloqueios seguidos abrem o circuito.
+    - aberto: os perfis da rede são adiados na hora, sem requisição, por `espera` segundos.
+    - meio-aberto: passada a espera, uma única requisição de sonda é liberada; sucesso
+      fecha o circuito e novo bloqueio o reabre com a espera dobrada (até espera_maxima).
+    Com limite 0 o disjuntor fica desativado.
+    """
+    
+    def __init__(self, limite=3, espera=300, espera_maxima=1800, validade_sonda=120):
+        self.limite = limite
+        self.espera = espera
+        self.espera_maxima = espera_maxima
+        self.validade_sonda = validade_sonda  # Uma sonda sem resposta (erro de rede) libera outra depois disso
+        self._circuitos = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _chave(url, canal):
+        return f"{LimitadorTaxa.dominio(url)}/{canal}"
+    
+    def _circuito(self, chave):
+        if chave not in self._circuitos:
+            self._circuitos[chave] = {
+                'estado': 'fechado', 'falhas': 0, 'aberto_ate': 0.0, 'sonda_ate': 0.0,
+                'espera': self.espera, 'aberturas': 0, 'evitadas': 0,
+            }
+        return self._circuitos[chave]
+    
+    def aberto(self, url, canal='navegador'):
+        """Indica, sem liberar sonda, se as requisições ao domínio pelo canal estão suspensas agora"""
+        if not self.limite:
+            return False
+        with self._lock:
+            circuito = self._circuito(self._chave(url, canal))
+            agora = time.monotonic()
+            if circuito['estado'] == 'aberto':
+                return agora < circuito['aberto_ate']
+            if circuito['estado'] == 'meio-aberto':
+                return agora < circuito['sonda_ate']
+            return False
+    
+    def evitar(self, url, canal='navegador'):
+        """Conta uma requisição que desistiu por causa do circuito aberto"""
+        with self._lock:
+            self._circuito(self._chave(url, canal))['evitadas'] += 1
+    
+    def permitir(self, url, canal='navegador'):
+        """Decide se a requisição pode ser feita; no meio-aberto, a primeira chamada vira a sonda"""
+        if not self.limite:
+            return True
+        chave = self._chave(url, canal)
+        with self._lock:
+            circuito = self._circuito(chave)
+            agora = time.monotonic()
+            if circuito['estado'] == 'fechado':
+                return True
+            if circuito['estado'] == 'aberto' and agora < circuito['aberto_ate']:
+                circuito['evitadas'] += 1
+                return False
+            if circuito['estado'] == 'meio-aberto' and agora < circuito['sonda_ate']:
+                circuito['evitadas'] += 1
+                return False
+            circuito['estado'] = 'meio-aberto'
+            circuito['sonda_ate'] = agora + self.validade_sonda
+            logging.info(f"🔌 Circuito de {chave} meio-aberto: liberando uma requisição de sonda")
+            return True
+    
+    def registrar(self, url, bloqueado, canal='navegador'):
+        """Atualiza o circuito do domínio e canal com o desfecho de uma requisição"""
+        if not self.limite:
+            return
+        chave = self._chave(url, canal)
+        with self._lock:
+            circuito = self._circuito(chave)
+            agora = time.monotonic()
+            if circuito['estado'] == 'aberto':
+                return  # Respostas atrasadas de requisições feitas antes da abertura
+            if not bloqueado:
+                if circuito['estado'] == 'meio-aberto':
+                    logging.info(f"🔌 Circuito de {chave} fechado: a sonda teve sucesso")
+                circuito.update(estado='fechado', falhas=0, espera=self.espera)
+                return
+            circuito['falhas'] += 1
+            if circuito['estado'] == 'meio-aberto':
+                circuito['espera'] = min(circuito['espera'] * 2, self.espera_maxima)
+            elif circuito['falhas'] < self.limite:
+                return
+            circuito.update(estado='aberto', aberto_ate=agora + circuito['espera'])
+            circuito['aberturas'] += 1
+            logging.warning(f"🔌 Circuito de {chave} aberto após {circuito['falhas']} bloqueios seguidos: "
+                            f"perfis da rede adiados por {circuito['espera']:.0f}s")
+    
+    def registrar_estatisticas(self):
+        with self._lock:
+            for chave, circuito in sorted(self._circuitos.items()):
+                if circuito['aberturas']:
+                    logging.info(f"Circuito {chave}: {circuito['estado']}, {circuito['aberturas']} aberturas, "
+                                 f"{circuito['evitadas']} requisições evitadas")
+
+# Disjuntor usado por todas as requisições da execução, com circuitos separados para HTTP e navegador
+DISJUNTOR = DisjuntorRede()
+
+def configurar_disjuntor(limite=3, espera=300):
+    """Substitui o disjuntor global; limite 0 desativa"""
+    global DISJUNTOR
+    DISJUNTOR = DisjuntorRede(limite=limite, espera=espera)
+    return DISJUNTOR
+
+def registrar_resposta(url, bloqueado, canal='navegador'):
+    """Informa o desfecho de uma requisição ao limitador de taxa e ao disjuntor da rede (no canal dela)"""
+    LIMITADOR.registrar(url, bloqueado)
+    DISJUNTOR.registrar(url, bloqueado, canal)
+
+# Cache em disco das respostas do Instagram (ver cache_http.CacheHTTP)
+CACHE_HTTP = CacheHTTP()
+
+def configurar_cache_http(pasta='cache_http', ttl_horas=12, tamanho_maximo_mb=200, somente_cache=False, ativo=True):
+    """Substitui o cache HTTP global; somente_cache liga o modo de reprodução offline"""
+    global CACHE_HTTP
+    CACHE_HTTP = CacheHTTP(pasta=pasta, ttl=ttl_horas * 3600, tamanho_maximo=tamanho_maximo_mb * 1024 * 1024,
+                           somente_cache=somente_cache, ativo=ativo)
+    return CACHE_HTTP
+
+async def _liberar_async(url, canal='http'):
+    """
+    Espera a vez no limitador e confirma no disjuntor que a requisição pode ser feita.
+    Com o circuito aberto retorna False sem esperar. A espera é feita em partes de
+    até 0,5s, consultando de novo o balde e o circuito a cada parte: um bloqueio
+    no meio da fila adia a vaga e um circuito aberto encerra a espera na hora.
+    """
+    inicio = time.monotonic()
+    while True:
+        if DISJUNTOR.aberto(url, canal):
+            DISJUNTOR.evitar(url, canal)
+            return False
+        espera = LIMITADOR.tentar_reservar(url, time.monotonic() - inicio)
+        if espera <= 0:
+            return DISJUNTOR.permitir(url, canal)
+        await asyncio.sleep(min(espera, 0.5))
+
+def pagina_bloqueada(driver):
+    """Indica se o navegador foi redirecionado para login, challenge ou authwall"""
+    try:
+        url_atual = driver.current_url
+    except Exception:
+        return False
+    return any(marcador in url_atual for marcador in ("login", "challenge", "authwall", "checkpoint"))
+
+# Avisos de limite de taxa do Instagram (os mesmos procurados por diagnosticar_pagina_instagram)
+TEXTOS_LIMITE_INSTAGRAM = ["try again later", "tente novamente mais tarde",
+                           "please wait a few minutes", "aguarde alguns minutos"]
+
+def sinal_bloqueio(driver, rede=None):
+    """
+    Indica se a página carregada é um bloqueio: redirecionamento (pagina_bloqueada)
+    ou, no Instagram, o aviso de "tente novamente mais tarde". O texto é lido do
+    innerText por JavaScript, sem serializar o HTML inteiro com page_source.
+    """
+    if pagina_bloqueada(driver):
+        return True
+    if str(rede).lower() != 'instagram':
+        return False
+    try:
+        aviso = driver.execute_script(
+            "const texto = ((document.body && document.body.innerText) || '').slice(0, 20000).toLowerCase();"
+            "return arguments[0].find(t => texto.includes(t)) || null;", TEXTOS_LIMITE_INSTAGRAM)
+    except Exception:
+        return False
+    if aviso:
+        logging.info(f"⚠️ Detectado aviso de limite do Instagram: '{aviso}'")
+    return bool(aviso)
+
+def perfil_adiado(linha):
+    """
+    Consulta o disjuntor antes de abrir o perfil no navegador. Com o circuito da
+    rede no navegador aberto o perfil fica sem registro no dia, como os adiados
+    pela agenda, e volta na próxima coleta ou em uma nova execução com --resume.
+    Bloqueios na fase HTTP não contam aqui (ver DisjuntorRede).
+    """
+    url = linha.get('url', '')
+    if DISJUNTOR.permitir(url, 'navegador'):
+        return False
+    logging.info(f"⏸️ Adiando {linha.get('nome_pagina')}: circuito de {LimitadorTaxa.dominio(url)} no navegador aberto")
+    return True
+
+def _proximo_perfil(pendentes):
+    """Escolhe entre os pares (índice, linha) pendentes o que tem o domínio liberado mais cedo"""
+    return min(range(len(pendentes)), key=lambda k: LIMITADOR.espera_estimada(pendentes[k][1].get('url', '')))
+
+# ----- CACHE DE ESTRATÉGIAS DE EXTRAÇÃO -----
+
+class CacheEstrategias:
+    """
+    Guarda, por (nome_pagina, rede), quais métodos de extração funcionaram,
+    com taxa de sucesso e latência média. Na execução seguinte o método que
+    funcionou por último é tentado primeiro, e métodos que falham seguidamente
+    vão para o fim da fila ou deixam de ser tentados (com uma nova sondagem semanal).
+    """
+    
+    def __init__(self, caminho='estrategias.json', limite_fim_fila=3, limite_pular=8, dias_sondagem=7):
+        self.caminho = caminho
+        self.limite_fim_fila = limite_fim_fila
+        self.limite_pular = limite_pular
+        self.dias_sondagem = dias_sondagem
+        self.eventos = []  # Eventos desta execução, devolvidos ao processo principal no modo --workers
+        self.dados = {}
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    self.dados = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logging.warning(f"Não foi possível ler {caminho}, começando um cache novo: {str(e)}")
+    
+    @staticmethod
+    def _chave(nome_pagina, rede):
+        return f"{nome_pagina}|{rede}"
+    
+    def _estatisticas(self, nome_pagina, rede, metodo):
+        perfil = self.dados.get(self._chave(nome_pagina, rede), {})
+        return perfil.get('metodos', {}).get(metodo)
+    
+    def deve_pular(self, nome_pagina, rede, metodo):
+        """Indica se o método falha cronicamente para o perfil e ainda não é hora de sondá-lo de novo"""
+        est = self._estatisticas(nome_pagina, rede, metodo)
+        if not est or est['falhas_consecutivas'] < self.limite_pular:
+            return False
+        ultima = datetime.strptime(est['ultima_tentativa'], "%Y-%m-%d")
+        return (datetime.now() - ultima).days < self.dias_sondagem
+    
+    def ordenar(self, nome_pagina, rede, metodos):
+        """
+        Reordena a lista de métodos (nomes) para o perfil, removendo os que devem
+        ser pulados. Métodos sem histórico mantêm a ordem padrão recebida.
+        """
+        perfil = self.dados.get(self._chave(nome_pagina, rede), {})
+        ultimo_sucesso = perfil.get('ultimo_sucesso')
+        
+        def prioridade(item):
+            posicao, metodo = item
+            est = perfil.get('metodos', {}).get(metodo)
+            if not est:
+                return (1, 0, 0.5, 0, posicao)
+            taxa = est['sucessos'] / est['tentativas'] if est['tentativas'] else 0.5
+            return (
+                0 if metodo == ultimo_sucesso else 1,
+                1 if est['falhas_consecutivas'] >= self.limite_fim_fila else 0,
+                -taxa,
+                est['latencia_media'],
+                posicao,
+            )
+        
+        ordenados = [metodo for _, metodo in sorted(enumerate(metodos), key=prioridade)]
+        ativos = [metodo for metodo in ordenados if not self.deve_pular(nome_pagina, rede, metodo)]
+        if not ativos and ordenados:
+            # Todos falham cronicamente: o mais bem colocado segue como sonda, para o perfil
+            # não ficar sem nenhuma tentativa (e com 0) até a próxima sondagem semanal
+            ativos = ordenados[:1]
+            logging.info(f"Todos os métodos com falhas crônicas para {nome_pagina}; sondando '{ativos[0]}'")
+        pulados = len(ordenados) - len(ativos)
+        if pulados:
+            logging.info(f"Pulando {pulados} métodos com falhas crônicas para {nome_pagina}")
+        return ativos
+    
+    def _aplicar(self, nome_pagina, rede, metodo, sucesso, duracao, data):
+        perfil = self.dados.setdefault(self._chave(nome_pagina, rede), {'metodos': {}, 'ultimo_sucesso': None})
+        est = perfil['metodos'].setdefault(metodo, {
+            'tentativas': 0, 'sucessos': 0, 'falhas_consecutivas': 0,
+            'latencia_media': duracao, 'ultima_tentativa': data,
+        })
+        est['tentativas'] += 1
+        est['ultima_tentativa'] = data
+        # Média móvel exponencial para acompanhar mudanças recentes de latência
+        est['latencia_media'] = round(0.7 * est['latencia_media'] + 0.3 * duracao, 3)
+        if sucesso:
+            est['sucessos'] += 1
+            est['falhas_consecutivas'] = 0
+            perfil['ultimo_sucesso'] = metodo
+        else:
+            est['falhas_consecutivas'] += 1
+    
+    def registrar(self, nome_pagina, rede, metodo, sucesso, duracao):
+        """Registra o resultado de uma tentativa de extração"""
+        evento = (nome_pagina, rede, metodo, bool(sucesso), round(duracao, 3), datetime.now().strftime("%Y-%m-%d"))
+        self.eventos.append(evento)
+        self._aplicar(*evento)
+    
+    def aplicar_eventos(self, eventos):
+        """Incorpora eventos registrados em outro processo"""
+        for evento in eventos:
+            self._aplicar(*evento)
+    
+    def salvar(self):
+        """Grava o cache de forma atômica (arquivo temporário + rename)"""
+        try:
+            temporario = f"{self.caminho}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(self.dados, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(temporario, self.caminho)
+            logging.info(f"Cache de estratégias salvo em {self.caminho} ({len(self.dados)} perfis)")
+        except OSError as e:
+            logging.error(f"Erro ao salvar cache de estratégias: {str(e)}")
+
+# Cache compartilhado pelos métodos de extração da execução
+CACHE_ESTRATEGIAS = CacheEstrategias()
+
+def executar_estrategias(nome_pagina, rede, metodos):
+    """
+    Executa os métodos de extração [(nome, função sem argumentos)] na ordem
+    aprendida pelo cache, registrando sucesso e latência de cada tentativa.
+    Retorna o primeiro número de seguidores encontrado.
+    """
+    funcoes = dict(metodos)
+    for nome in CACHE_ESTRATEGIAS.ordenar(nome_pagina, rede, [nome for nome, _ in metodos]):
+        inicio = time.time()
+        seguidores = None
+        try:
+            logging.info(f"Método '{nome}' para {nome_pagina}")
+            seguidores = funcoes[nome]()
+            if seguidores:
+                logging.info(f"✅ Método '{nome}': {seguidores} seguidores")
+            else:
+                logging.info(f"❌ Método '{nome}': Sem resultado")
+        except Exception as e:
+            logging.info(f"❌ Método '{nome}': Erro - {str(e)[:50] if str(e) else 'Erro desconhecido'}")
+        duracao = time.time() - inicio
+        CACHE_ESTRATEGIAS.registrar(nome_pagina, rede, nome, seguidores, duracao)
+        METRICAS.registrar('metodo', duracao, perfil=nome_pagina, rede=rede, metodo=nome, sucesso=bool(seguidores))
+        if seguidores:
+            return seguidores
+    
+    logging.info(f"⚠️ Todos os métodos falharam para {nome_pagina}")
+    return None
+
+# ----- EXTRAÇÃO EM UMA ÚNICA IDA AO NAVEGADOR -----
+
+# Coleta no navegador, em uma só chamada, todos os textos candidatos a conter o
+# número de seguidores. arguments[0] é o XPath do config.json.
+SCRIPT_CANDIDATOS = """
+const candidatos = [];
+const adicionar = (origem, texto) => {
+    if (texto && texto.trim() && texto.length < 200) {
+        candidatos.push({origem: origem, texto: texto.trim()});
+    }
+};
+
+// 1. XPath do config.json
+try {
+    const no = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (no) adicionar('xpath', no.textContent);
+} catch (e) {}
+
+// 2. Atributo title (o Instagram guarda ali o número exato, sem abreviação)
+document.querySelectorAll('section main header section ul li span[title], a[href*="followers"] span[title]')
+    .forEach(el => adicionar('titulo', el.getAttribute('title')));
+
+// 3. Seletores CSS conhecidos: os spans de contagem do Instagram guardam só o número;
+// os do LinkedIn misturam seguidores, funcionários e localização
+['section main header section ul li:nth-child(2) span', 'span._ac2a']
+    .forEach(sel => document.querySelectorAll(sel).forEach(el => adicionar('contagem', el.textContent)));
+['a[href*="followers"]', 'h3.top-card-layout__first-subline', '.org-top-card-summary__info-item']
+    .forEach(sel => document.querySelectorAll(sel).forEach(el => adicionar('css', el.textContent)));
+
+// 4. aria-label com "followers"/"seguidores"
+document.querySelectorAll('[aria-label*="follower" i], [aria-label*="seguidor" i]')
+    .forEach(el => adicionar('aria', el.getAttribute('aria-label')));
+
+// 5. Meta tags de descrição ("1,234 Followers, 56 Following...")
+document.querySelectorAll('meta[name="description"], meta[property="og:description"]')
+    .forEach(el => adicionar('meta', el.getAttribute('content')));
+
+// 6. Nós de texto próximos de "followers"/"seguidores" (com o texto do pai quando isolados)
+const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_TEXT);
+let no, encontrados = 0;
+while ((no = walker.nextNode()) && encontrados < 50) {
+    const texto = no.textContent.toLowerCase();
+    if (texto.includes('seguidor') || texto.includes('follower')) {
+        const pai = no.parentElement;
+        if (pai && ['SCRIPT', 'STYLE'].includes(pai.tagName)) continue;
+        adicionar('texto', texto.trim().length < 20 && pai && pai.parentElement ? pai.parentElement.textContent : no.textContent);
+        encontrados++;
+    }
+}
+return candidatos;
+"""
+
+# Ordem de confiança das origens: o XPath configurado e o título exato vêm antes
+# dos textos genéricos encontrados pela página
+PRIORIDADE_CANDIDATOS = ['xpath', 'titulo', 'contagem', 'css', 'aria', 'meta', 'texto']
+
+# Origens cujo texto é só a contagem; nas demais um número sem 'seguidores'/'followers'
+# ao lado pode ser de funcionários, publicações ou outro dado do perfil
+ORIGENS_SO_CONTAGEM = ('xpath', 'titulo', 'contagem')
+
+_MULTIPLICADORES = {
+    'mil': 1_000, 'k': 1_000, 'thousand': 1_000,
+    'mi': 1_000_000, 'milhão': 1_000_000, 'milhões': 1_000_000, 'm': 1_000_000, 'million': 1_000_000,
+    'bi': 1_000_000_000, 'b': 1_000_000_000, 'billion': 1_000_000_000,
+}
+_NUMERO = r'(\d[\d.,]*)\s*(milhões|milhão|million|thousand|billion|mil|mi|bi|k|m|b)?\b'
+
+def interpretar_contagem(texto, exigir_rotulo=False):
+    """
+    Converte textos como '298,809 followers', '1,2 mil seguidores' ou '12.3K'
+    em inteiro. Prefere o número imediatamente antes (ou depois) de
+    'seguidores'/'followers'; sem essas palavras, usa o primeiro número,
+    a menos que exigir_rotulo seja verdadeiro (textos que podem trazer outros números).
+    """
+    if not texto:
+        return None
+    texto = texto.replace('\xa0', ' ')
+    
+    match = (re.search(_NUMERO + r'\s*(?:seguidores|seguidor|followers|follower)', texto, re.I)
+             or re.search(r'(?:seguidores|followers)\s*:?\s*' + _NUMERO, texto, re.I)
+             or (None if exigir_rotulo else re.search(_NUMERO, texto, re.I)))
+    if not match:
+        return None
+    
+    numero, sufixo = match.group(1).rstrip('.,'), (match.group(2) or '').lower()
+    try:
+        if sufixo:
+            # Com abreviação, vírgula ou ponto final são separador decimal ('1,2 mil', '12.3K')
+            return int(round(float(numero.replace(',', '.')) * _MULTIPLICADORES[sufixo]))
+        return int(numero.replace('.', '').replace(',', ''))
+    except (ValueError, KeyError):
+        return None
+
+def coletar_candidatos(driver, xpath):
+    """Executa SCRIPT_CANDIDATOS e retorna a lista de {origem, texto}"""
+    return driver.execute_script(SCRIPT_CANDIDATOS, xpath or '') or []
+
+def escolher_seguidores(candidatos):
+    """Percorre os candidatos por ordem de confiança da origem e retorna o primeiro número válido"""
+    ordenados = sorted(candidatos, key=lambda c: PRIORIDADE_CANDIDATOS.index(c['origem'])
+                       if c.get('origem') in PRIORIDADE_CANDIDATOS else len(PRIORIDADE_CANDIDATOS))
+    for candidato in ordenados:
+        seguidores = interpretar_contagem(candidato.get('texto'),
+                                          exigir_rotulo=candidato.get('origem') not in ORIGENS_SO_CONTAGEM)
+        if seguidores and 1 <= seguidores <= 1_000_000_000:  # Limite razoável
+            logging.info(f"Candidato escolhido ({candidato['origem']}): '{candidato['texto'][:80]}' -> {seguidores}")
+            return seguidores
+    return None
+
+def extrair_seguidores_candidatos(driver, xpath):
+    """Extrai seguidores com uma única chamada ao navegador e análise dos candidatos em Python"""
+    candidatos = coletar_candidatos(driver, xpath)
+    logging.info(f"{len(candidatos)} candidatos coletados em uma chamada ao navegador")
+    return escolher_seguidores(candidatos)
+
 # ----- NOVOS MÉTODOS PARA INSTAGRAM -----
 
-def extrair_seguidores_instagram_api(username):
+# Endereço base das requisições HTTP ao Instagram (o simulador de carga aponta para um servidor local)
+INSTAGRAM_BASE_URL = os.environ.get('INSTAGRAM_BASE_URL', 'https://www.instagram.com').rstrip('/')
+
+def _headers_instagram():
+    """Monta os headers de navegador usados nas requisições HTTP ao Instagram"""
+    # Configurar headers para parecer um navegador real
+    user_agents = [
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_6) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.0 Safari/605.1.15",
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36 Edg/125.0.0.0"
+    ]
+    chosen_user_agent = random.choice(user_agents)
+    
+    return {
+        'User-Agent': chosen_user_agent,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Cache-Control': 'max-age=0',
+        # Adiciona Referer para parecer navegação normal
+        'Referer': 'https://www.instagram.com/',
+        # Headers adicionais para evitar detecção
+        'sec-ch-ua': '"Chromium";v="125", "Google Chrome";v="125"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"Windows"',
+        'Upgrade-Insecure-Requests': '1'
+    }
+
+def _seguidores_da_api(api_data):
+    """Lê o número de seguidores da resposta JSON de web_profile_info"""
+    user_info = api_data.get('data', {}).get('user', {})
+    
+    if user_info:
+        # Busca em múltiplos caminhos possíveis
+        if 'edge_followed_by' in user_info:
+            return user_info['edge_followed_by'].get('count')
+        elif 'followed_by_count' in user_info:
+            return user_info['followed_by_count']
+    return None
+
+def _seguidores_do_html(html):
+    """Extrai o número de seguidores do HTML da página de perfil do Instagram"""
+    # Procurar pelo ID do usuário e outros dados no HTML
+    shared_data_match = re.search(r'window\._sharedData\s*=\s*({.*?});</script>', html)
+    additional_data_match = re.search(r'window\.__additionalDataLoaded\s*\(\s*[\'"].*?[\'"]\s*,\s*({.*?})\);</script>', html)
+    
+    # Tentar extrair dados da resposta
+    user_data = None
+    
+    # Método 1: Verificar os dados compartilhados (mais comum)
+    if shared_data_match:
+        try:
+            shared_data = json.loads(shared_data_match.group(1))
+            entry_data = shared_data.get('entry_data', {})
+            profile_page = entry_data.get('ProfilePage', [{}])[0]
+            user_data = profile_page.get('graphql', {}).get('user', {})
+            
+            if user_data:
+                logging.info("Dados extraídos via window._sharedData")
+        except json.JSONDecodeError:
+            logging.info("Erro ao decodificar JSON de window._sharedData")
+    
+    # Método 2: Verificar dados adicionais
+    if not user_data and additional_data_match:
+        try:
+            additional_data = json.loads(additional_data_match.group(1))
+            user_data = additional_data.get('user', {})
+            
+            if user_data:
+                logging.info("Dados extraídos via window.__additionalDataLoaded")
+        except json.JSONDecodeError:
+            logging.info("Erro ao decodificar JSON de window.__additionalDataLoaded")
+    
+    # Extrair o número de seguidores se encontramos os dados do usuário
+    if user_data:
+        followers_count = None
+        
+        if 'edge_followed_by' in user_data:
+            followers_count = user_data['edge_followed_by'].get('count')
+        elif 'followed_by' in user_data:
+            followers_count = user_data['followed_by'].get('count')
+        elif 'follower_count' in user_data:
+            followers_count = user_data['follower_count']
+        
+        if followers_count is not None:
+            logging.info(f"✅ Seguidores encontrados via HTML: {followers_count}")
+            return followers_count
+    
+    # Método de fallback: procura diretamente por números próximos a 'seguidores'/'followers' no HTML
+    try:
+        # Busca padrões como "5,418 seguidores" ou "5.418 followers"
+        follower_patterns = [
+            r'([\d,.]+)\s*(?:seguidores|followers)',
+            r'(?:seguidores|followers)\s*(?:\(\s*)?([\d,.]+)(?:\s*\))?',
+            r'(?:"followerCount":|"edge_followed_by":.*?"count":)\s*(\d+)'
+        ]
+        
+        for pattern in follower_patterns:
+            matches = re.findall(pattern, html)
+            for match in matches:
+                try:
+                    # Remove caracteres não numéricos exceto para separadores
+                    follower_text = match.strip()
+                    # Substitui separadores por vazio
+                    follower_num = follower_text.replace(',', '').replace('.', '')
+                    followers_count = int(follower_num)
+                    
+                    if 1 <= followers_count <= 1000000000:  # Limite razoável
+                        logging.info(f"✅ Seguidores extraídos por regex: {followers_count}")
+                        return followers_count
+                except (ValueError, TypeError):
+                    continue
+    except Exception as e:
+        logging.info(f"Erro na extração por regex: {str(e)[:50]}")
+    
+    return None
+
+async def _get_instagram_async(url, headers, semaforo, timeout, usar_cache=True):
     """
-    Extrai o número de seguidores do Instagram usando a API não documentada.
-    Implementa retry para lidar com limitação de taxa (429).
+    GET no Instagram passando pelo cache HTTP em disco. Uma resposta fresca do
+    cache não ocupa o limitador nem o disjuntor e não vai à rede; no modo somente
+    cache a ausência vira um 504, como o only-if-cached do HTTP. Com usar_cache
+    falso (novas tentativas do mesmo perfil) o cache não é consultado.
+    A resposta da rede não é gravada aqui: quem a interpreta chama _guardar_no_cache
+    depois de extrair a contagem, para que uma página sem o número (login, layout
+    novo) não deixe o perfil falhando até o TTL vencer.
+    Retorna None se o circuito do Instagram estiver aberto.
+    """
+    if usar_cache:
+        resposta = await asyncio.to_thread(CACHE_HTTP.ler, url, headers)
+        if resposta is not None:
+            logging.info(f"💾 Resposta do cache HTTP: {url}")
+            return resposta
+    if CACHE_HTTP.somente_cache:
+        logging.info(f"💾 Fora do cache HTTP (modo somente cache): {url}")
+        return RespostaCache(504, url, {}, b'')
+    
+    # A vaga do limitador é pedida já dentro do semáforo, para ser usada na hora
+    async with semaforo:
+        if not await _liberar_async(url):
+            return None
+        resposta = await asyncio.to_thread(POOL_SESSOES.get, url, headers=headers, timeout=timeout)
+    bloqueada = resposta.status_code == 429 or "login" in str(resposta.url)
+    registrar_resposta(url, bloqueada, canal='http')
+    return resposta
+
+async def _guardar_no_cache(url, headers, resposta):
+    """Grava no cache HTTP uma resposta vinda da rede da qual já se extraiu a contagem"""
+    if not getattr(resposta, 'do_cache', False):
+        await asyncio.to_thread(CACHE_HTTP.gravar, url, headers, resposta)
+
+async def extrair_seguidores_instagram_api_async(username, semaforo=None):
+    """
+    Versão assíncrona de extrair_seguidores_instagram_api().
+    As requisições rodam em threads (requests é síncrono) limitadas pelo semáforo;
+    a vaga do limitador é esperada com asyncio.sleep já dentro dele, sem travar o loop.
     """
     logging.info(f"Tentando extrair seguidores via API JSON para: {username}")
     
-    # Número máximo de tentativas para contornar limite de taxa
-    max_retries = 3
+    if semaforo is None:
+        semaforo = asyncio.Semaphore(1)
+    
+    # Número máximo de tentativas para contornar limite de taxa; sem rede, repetir leria o mesmo cache
+    max_retries = 1 if CACHE_HTTP.somente_cache else 3
     
+    # Após um 429 o limitador reduz a taxa do domínio, espaçando as novas tentativas
     for tentativa in range(max_retries):
         try:
             if tentativa > 0:
-                # Aguarda tempo progressivo entre tentativas (1s, 3s, 7s)
-                wait_time = (2 ** tentativa) - 1
-                logging.info(f"Aguardando {wait_time}s antes da tentativa {tentativa+1}")
-                time.sleep(wait_time)
+                # Espera progressiva entre tentativas (1s, 3s), além da vaga no limitador
+                espera = (2 ** tentativa) - 1
+                logging.info(f"[{username}] Aguardando {espera}s antes da tentativa {tentativa+1}")
+                await asyncio.sleep(espera)
             
-            # Criar uma sessão para manter cookies e headers consistentes
-            session = requests.Session()
-            
-            # Configurar headers para parecer um navegador real
-            user_agents = [
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_6) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.0 Safari/605.1.15",
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36 Edg/125.0.0.0"
-            ]
-            chosen_user_agent = random.choice(user_agents)
-            
-            headers = {
-                'User-Agent': chosen_user_agent,
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Cache-Control': 'max-age=0',
-                # Adiciona Referer para parecer navegação normal
-                'Referer': 'https://www.instagram.com/',
-                # Headers adicionais para evitar detecção
-                'sec-ch-ua': '"Chromium";v="125", "Google Chrome";v="125"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'Upgrade-Insecure-Requests': '1'
-            }
-            
-            # Configurar a sessão com os headers
-            session.headers.update(headers)
+            # Sessão compartilhada do host: reaproveita conexões e cookies entre tentativas e perfis
+            headers = _headers_instagram()
             
             # 1. Tenta primeiro API GraphQL (mais direto e menos propenso a bloqueios)
             try:
-                profile_api_url = f"https://www.instagram.com/api/v1/users/web_profile_info/?username={username}"
+                profile_api_url = f"{INSTAGRAM_BASE_URL}/api/v1/users/web_profile_info/?username={username}"
                 
                 # Headers específicos para API
                 api_headers = headers.copy()
@@ -251,159 +1114,158 @@ def extrair_seguidores_instagram_api(username):
                 api_headers['origin'] = 'https://www.instagram.com'
                 api_headers['accept'] = '*/*'
                 
-                response_api = session.get(profile_api_url, headers=api_headers, timeout=12)
+                response_api = await _get_instagram_async(profile_api_url, api_headers, semaforo, timeout=12,
+                                                          usar_cache=tentativa == 0)
+                if response_api is None:
+                    logging.info(f"⏸️ [{username}] Circuito do Instagram aberto, consulta adiada")
+                    return None
                 
                 if response_api.status_code == 200:
-                    api_data = response_api.json()
-                    user_info = api_data.get('data', {}).get('user', {})
-                    
-                    if user_info:
-                        # Busca em múltiplos caminhos possíveis
-                        followers_count = None
-                        
-                        if 'edge_followed_by' in user_info:
-                            followers_count = user_info['edge_followed_by'].get('count')
-                        elif 'followed_by_count' in user_info:
-                            followers_count = user_info['followed_by_count']
-                        
-                        if followers_count is not None:
-                            logging.info(f"✅ Seguidores encontrados via API GraphQL: {followers_count}")
-                            return followers_count
+                    followers_count = _seguidores_da_api(response_api.json())
+                    if followers_count is not None:
+                        logging.info(f"✅ [{username}] Seguidores encontrados via API GraphQL: {followers_count}")
+                        await _guardar_no_cache(profile_api_url, api_headers, response_api)
+                        return followers_count
                 
                 if response_api.status_code == 429:
-                    logging.info(f"API GraphQL retornou 429 (Rate Limit). Tentativa {tentativa+1}/{max_retries}")
+                    logging.info(f"[{username}] API GraphQL retornou 429 (Rate Limit). Tentativa {tentativa+1}/{max_retries}")
                     continue  # Tenta novamente após espera
                     
             except Exception as e:
-                logging.info(f"Erro ao acessar API GraphQL: {str(e)[:50]}")
+                logging.info(f"[{username}] Erro ao acessar API GraphQL: {str(e)[:50]}")
             
             # 2. Se API GraphQL falhar, tenta método alternativo com página HTML
-            url_inicial = f"https://www.instagram.com/{username}/"
+            url_inicial = f"{INSTAGRAM_BASE_URL}/{username}/"
             logging.info(f"Fazendo requisição para página HTML: {url_inicial}")
             
-            # Adiciona delay para simular comportamento humano
-            time.sleep(random.uniform(1, 2))
-            
-            response_inicial = session.get(url_inicial, timeout=15)
+            response_inicial = await _get_instagram_async(url_inicial, headers, semaforo, timeout=15,
+                                                          usar_cache=tentativa == 0)
+            if response_inicial is None:
+                logging.info(f"⏸️ [{username}] Circuito do Instagram aberto, consulta adiada")
+                return None
             
             if response_inicial.status_code == 429:
-                logging.info(f"Requisição HTML retornou 429 (Rate Limit). Tentativa {tentativa+1}/{max_retries}")
+                logging.info(f"[{username}] Requisição HTML retornou 429 (Rate Limit). Tentativa {tentativa+1}/{max_retries}")
                 continue  # Tenta novamente após espera
             
             if response_inicial.status_code != 200:
-                logging.info(f"Falha na requisição HTML. Status code: {response_inicial.status_code}")
+                logging.info(f"[{username}] Falha na requisição HTML. Status code: {response_inicial.status_code}")
                 continue
             
             # 3. Extrair dados do HTML
-            html = response_inicial.text
-            
-            # Procurar pelo ID do usuário e outros dados no HTML
-            shared_data_match = re.search(r'window\._sharedData\s*=\s*({.*?});</script>', html)
-            additional_data_match = re.search(r'window\.__additionalDataLoaded\s*\(\s*[\'"].*?[\'"]\s*,\s*({.*?})\);</script>', html)
-            
-            # Tentar extrair dados da resposta
-            user_data = None
-            
-            # Método 1: Verificar os dados compartilhados (mais comum)
-            if shared_data_match:
-                try:
-                    shared_data = json.loads(shared_data_match.group(1))
-                    entry_data = shared_data.get('entry_data', {})
-                    profile_page = entry_data.get('ProfilePage', [{}])[0]
-                    user_data = profile_page.get('graphql', {}).get('user', {})
-                    
-                    if user_data:
-                        logging.info("Dados extraídos via window._sharedData")
-                except json.JSONDecodeError:
-                    logging.info("Erro ao decodificar JSON de window._sharedData")
-            
-            # Método 2: Verificar dados adicionais
-            if not user_data and additional_data_match:
-                try:
-                    additional_data = json.loads(additional_data_match.group(1))
-                    user_data = additional_data.get('user', {})
-                    
-                    if user_data:
-                        logging.info("Dados extraídos via window.__additionalDataLoaded")
-                except json.JSONDecodeError:
-                    logging.info("Erro ao decodificar JSON de window.__additionalDataLoaded")
-            
-            # 4. Extrair o número de seguidores se encontramos os dados do usuário
-            if user_data:
-                followers_count = None
-                
-                if 'edge_followed_by' in user_data:
-                    followers_count = user_data['edge_followed_by'].get('count')
-                elif 'followed_by' in user_data:
-                    followers_count = user_data['followed_by'].get('count')
-                elif 'follower_count' in user_data:
-                    followers_count = user_data['follower_count']
-                
-                if followers_count is not None:
-                    logging.info(f"✅ Seguidores encontrados via HTML: {followers_count}")
-                    return followers_count
-            
-            # 5. Método de fallback: procura diretamente por números próximos a 'seguidores'/'followers' no HTML
-            try:
-                # Busca padrões como "5,418 seguidores" ou "5.418 followers"
-                follower_patterns = [
-                    r'([\d,.]+)\s*(?:seguidores|followers)',
-                    r'(?:seguidores|followers)\s*(?:\(\s*)?([\d,.]+)(?:\s*\))?',
-                    r'(?:"followerCount":|"edge_followed_by":.*?"count":)\s*(\d+)'
-                ]
-                
-                for pattern in follower_patterns:
-                    matches = re.findall(pattern, html)
-                    for match in matches:
-                        try:
-                            # Remove caracteres não numéricos exceto para separadores
-                            follower_text = match.strip()
-                            # Substitui separadores por vazio
-                            follower_num = follower_text.replace(',', '').replace('.', '')
-                            followers_count = int(follower_num)
-                            
-                            if 1 <= followers_count <= 1000000000:  # Limite razoável
-                                logging.info(f"✅ Seguidores extraídos por regex: {followers_count}")
-                                return followers_count
-                        except (ValueError, TypeError):
-                            continue
-            except Exception as e:
-                logging.info(f"Erro na extração por regex: {str(e)[:50]}")
+            followers_count = _seguidores_do_html(response_inicial.text)
+            if followers_count is not None:
+                await _guardar_no_cache(url_inicial, headers, response_inicial)
+                return followers_count
             
             # Se chegou aqui, falhou em todas as tentativas nesta rodada
-            logging.info(f"Tentativa {tentativa+1}/{max_retries} falhou")
+            logging.info(f"[{username}] Tentativa {tentativa+1}/{max_retries} falhou")
             
         except Exception as e:
-            logging.info(f"❌ Erro na tentativa {tentativa+1}: {str(e)[:100]}")
+            logging.info(f"❌ [{username}] Erro na tentativa {tentativa+1}: {str(e)[:100]}")
     
-    logging.info("❌ Todas as tentativas de API JSON falharam")
+    logging.info(f"❌ [{username}] Todas as tentativas de API JSON falharam")
     return None
 
+def extrair_seguidores_instagram_api(username):
+    """
+    Extrai o número de seguidores do Instagram usando a API não documentada.
+    Implementa retry para lidar com limitação de taxa (429).
+    """
+    return asyncio.run(extrair_seguidores_instagram_api_async(username))
+
+
+def extrair_username_instagram(url):
+    """Extrai o nome de usuário do Instagram a partir da URL do perfil"""
+    caminho = re.sub(r'^[a-z]+://[^/]+', '', url.strip()).split('?')[0].split('#')[0]
+    partes = [parte for parte in caminho.split('/') if parte]
+    return partes[-1] if partes else url
 
-def extrair_seguidores_instagram_alternativo(driver, xpath, nome_pagina):
+# ----- MÉTODOS HTTP PARA LINKEDIN -----
+
+def _seguidores_do_html_linkedin(html):
     """
-    Função adaptadora que tenta usar a API JSON e, se falhar, recorre aos métodos anteriores.
+    Lê o número de seguidores da página pública da empresa no LinkedIn. Usa apenas
+    o cabeçalho do perfil e a meta description, que trazem o total da própria
+    empresa (e não de posts ou páginas semelhantes).
     """
-    # Extrai o nome de usuário correto da URL ou do nome da página
-    match = re.search(r'instagram\.com/([^/?#]+)', nome_pagina)
-    if match:
-        username = match.group(1)
+    trechos = []
+    
+    # Cabeçalho do perfil público: "Cidade, Estado 298,809 followers"
+    trechos.extend(re.findall(r'<h3[^>]*top-card-layout__first-subline[^>]*>(.*?)</h3>', html, re.S))
+    # Meta description: "Tereos | 298,809 followers on LinkedIn. ..."
+    trechos.extend(re.findall(r'<meta[^>]+name="description"[^>]+content="([^"]*)"', html))
+    
+    for trecho in trechos:
+        texto = re.sub(r'<[^>]+>', ' ', trecho)
+        match = re.search(r'([\d.,]+)\s+(?:followers|seguidores)', texto)
+        if match:
+            return int(match.group(1).replace('.', '').replace(',', ''))
+    return None
+
+class LimiteTaxaExcedido(Exception):
+    """A rede respondeu 429 em todas as tentativas: o perfil deve ser adiado, não registrado com 0"""
+
+async def extrair_seguidores_linkedin_http_async(url, semaforo=None):
+    """
+    Tenta ler o número de seguidores da página pública da empresa no LinkedIn sem abrir o navegador.
+    Um 429 é repetido com espera progressiva (1s, 3s); se todas as tentativas
+    receberem 429, lança LimiteTaxaExcedido.
+    """
+    logging.info(f"Tentando extrair seguidores via HTTP para: {url}")
+    
+    if semaforo is None:
+        semaforo = asyncio.Semaphore(1)
+    
+    headers = {
+        'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+    }
+    
+    # O cache HTTP só guarda o Instagram; no modo somente cache o LinkedIn não é consultado
+    if CACHE_HTTP.somente_cache:
+        return None
+    
+    max_tentativas = 3
+    for tentativa in range(max_tentativas):
+        if tentativa > 0:
+            espera = (2 ** tentativa) - 1
+            logging.info(f"Aguardando {espera}s antes da tentativa {tentativa+1} no LinkedIn: {url}")
+            await asyncio.sleep(espera)
+        try:
+            async with semaforo:
+                if not await _liberar_async(url):
+                    logging.info(f"⏸️ Circuito do LinkedIn aberto, consulta adiada: {url}")
+                    return None
+                response = await asyncio.to_thread(POOL_SESSOES.get, url, headers=headers, timeout=15)
+            registrar_resposta(url, response.status_code == 429 or "authwall" in str(response.url), canal='http')
+        except Exception as e:
+            logging.info(f"Erro na requisição HTTP do LinkedIn: {str(e)[:100]}")
+            return None
+        if response.status_code != 429:
+            break
+        logging.info(f"LinkedIn retornou 429 (Rate Limit). Tentativa {tentativa+1}/{max_tentativas}")
     else:
-        # Se não for uma URL, usa o nome_pagina diretamente
-        username = nome_pagina
+        raise LimiteTaxaExcedido(url)
     
-    logging.info(f"Nome de usuário extraído: {username}")
+    if response.status_code != 200:
+        logging.info(f"Requisição HTTP do LinkedIn retornou status {response.status_code}")
+        return None
     
-    # Primeiro, tenta o método da API JSON (não usa o driver)
-    seguidores = extrair_seguidores_instagram_api(username)
+    # Redirecionamento para a parede de login: só o navegador pode tentar
+    if "authwall" in str(response.url) or "login" in str(response.url):
+        logging.info("⚠️ LinkedIn redirecionou para login (authwall)")
+        return None
     
+    seguidores = _seguidores_do_html_linkedin(response.text)
     if seguidores:
-        logging.info(f"✅ API JSON: {seguidores} seguidores para {nome_pagina}")
+        logging.info(f"✅ Seguidores encontrados via HTTP no LinkedIn: {seguidores}")
         return seguidores
-        
-    # Se falhar, recorre aos métodos originais baseados em Selenium
-    logging.info(f"API JSON falhou, tentando métodos baseados em Selenium para {nome_pagina}")
-    return extrair_seguidores_instagram(driver, xpath, nome_pagina)
+    
+    logging.info("❌ Seguidores não encontrados no HTML do LinkedIn")
+    return None
+
 def extrair_seguidores_instagram_method1(driver, xpath):
     """Método 1: Usando o XPath fornecido."""
     try:
@@ -589,50 +1451,400 @@ def extrair_seguidores_instagram_method5(driver):
         logging.info(f"Método 5 - Erro: {str(e)}")
         return None
 
-def extrair_seguidores_instagram(driver, xpath, nome_pagina):
+def extrair_seguidores_instagram(driver, xpath, nome_pagina, eventos=None, url=None):
     """
     Tenta extrair seguidores do Instagram usando múltiplos métodos.
     Retorna ao primeiro sinal de sucesso para otimizar o tempo de execução.
+    Com os eventos de rede da página, tenta antes o JSON capturado via CDP.
     """
     logging.info(f"Extraindo seguidores para {nome_pagina} (Instagram)")
 
-    # Lista de métodos a serem tentados em ordem (do mais eficaz ao menos eficaz)
+    # Ordem padrão (do mais eficaz ao menos eficaz); o cache de estratégias reordena por perfil
     metodos = [
-        (extrair_seguidores_instagram_method2, [driver]),         # CSS Selector específico
-        (extrair_seguidores_instagram_method1, [driver, xpath]),  # XPath fornecido
-        (extrair_seguidores_instagram_method5, [driver]),         # JavaScript otimizado
-        (extrair_seguidores_instagram_method4, [driver]),         # Busca por texto
-        (extrair_seguidores_instagram_method3, [driver]),         # Aria-label (mais lento)
+        ('candidatos', lambda: extrair_seguidores_candidatos(driver, xpath)),   # Todos os candidatos em uma chamada
+        ('css', lambda: extrair_seguidores_instagram_method2(driver)),           # CSS Selector específico
+        ('xpath', lambda: extrair_seguidores_instagram_method1(driver, xpath)),  # XPath fornecido
+        ('js', lambda: extrair_seguidores_instagram_method5(driver)),            # JavaScript otimizado
+        ('texto', lambda: extrair_seguidores_instagram_method4(driver)),         # Busca por texto
+        ('aria', lambda: extrair_seguidores_instagram_method3(driver)),          # Aria-label (mais lento)
     ]
+    if eventos is not None:
+        # JSON web_profile_info que a própria página baixou
+        metodos.insert(0, ('rede_cdp', lambda: extrair_seguidores_respostas_capturadas(driver, eventos, "Instagram", url)))
     
-    # Tenta cada método até encontrar um que funcione
-    for i, (metodo, args) in enumerate(metodos):
-        try:
-            logging.info(f"Método {i+1} para {nome_pagina}")
-            seguidores = metodo(*args)
-            if seguidores:
-                logging.info(f"✅ Método {i+1}: {seguidores} seguidores")
-                return seguidores
-            logging.info(f"❌ Método {i+1}: Sem resultado")
-        except Exception as e:
-            logging.info(f"❌ Método {i+1}: Erro - {str(e)[:50] if str(e) else 'Erro desconhecido'}")
-    
-    logging.info(f"⚠️ Todos os métodos falharam para {nome_pagina}")
-    return None
+    return executar_estrategias(nome_pagina, "Instagram", metodos)
 
-def lidar_com_cookies_instagram(driver):
-    """Tenta lidar com diálogos de cookies e popups do Instagram"""
-    logging.info("Tentando lidar com cookies e popups do Instagram")
+def extrair_seguidores_xpath(driver, xpath, nome_pagina):
+    """Extrai seguidores do elemento indicado pelo XPath do config.json"""
+    logging.info(f"Buscando elemento com XPath: {xpath}")
+    elemento = WebDriverWait(driver, 15).until(
+        EC.presence_of_element_located((By.XPATH, xpath))
+    )
     
-    try:
-        # Tenta fechar modal de cookies
-        try:
-            cookie_buttons = driver.find_elements(By.XPATH, 
-                "//button[contains(text(), 'Accept') or contains(text(), 'Allow') or contains(text(), 'Aceitar')]")
+    # Extrair o texto e buscar o número de seguidores
+    texto_elemento = elemento.text
+    logging.info(f"Texto encontrado: '{texto_elemento}'")
+    seguidores = extrair_seguidores(texto_elemento)
+    
+    if seguidores:
+        logging.info(f"Seguidores extraídos com XPath original para {nome_pagina}: {seguidores}")
+    else:
+        logging.warning(f"Não foi possível extrair seguidores do texto com XPath original")
+    return seguidores
+
+def extrair_seguidores_linkedin(driver, xpath, nome_pagina, rede="Linkedin", eventos=None, url=None):
+    """
+    Tenta a coleta de candidatos em uma chamada, o XPath do config.json e,
+    se falharem, os métodos alternativos.
+    A ordem é ajustada pelo cache de estratégias, evitando esperar os 15s do
+    XPath quando ele já falhou nas últimas execuções.
+    """
+    metodos = [
+        ('candidatos', lambda: extrair_seguidores_candidatos(driver, xpath)),
+        ('xpath', lambda: extrair_seguidores_xpath(driver, xpath, nome_pagina)),
+        ('alternativo', lambda: encontrar_elemento_alternativo(driver, nome_pagina, rede)),
+    ]
+    if eventos is not None:
+        # Respostas da API da organização, quando a página as carrega
+        metodos.insert(0, ('rede_cdp', lambda: extrair_seguidores_respostas_capturadas(driver, eventos, rede, url)))
+    return executar_estrategias(nome_pagina, rede, metodos)
+
+# ----- BLOQUEIO DE RECURSOS VIA CDP -----
+
+# Padrões (com curinga *) de URLs bloqueadas via Network.setBlockedURLs.
+# 'comum' vale para todas as redes; as demais chaves somam-se a ela.
+# Pode ser sobrescrito por chave no arquivo bloqueios.json.
+BLOQUEIOS_PADRAO = {
+    'comum': [
+        # Fontes, mídia e folhas de estilo (a extração lê apenas o DOM)
+        '*.woff', '*.woff2', '*.ttf', '*.otf',
+        '*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.gif',
+        '*.css', '*.css?*',
+        # Analytics e anúncios de terceiros
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*connect.facebook.net*',
+    ],
+    'linkedin': [
+        '*px.ads.linkedin.com*', '*snap.licdn.com/li.lms-analytics*', '*linkedin.com/li/track*',
+        '*platform.linkedin.com/litms*',
+    ],
+    'instagram': [
+        '*instagram.com/logging*', '*graph.instagram.com/logging_client_events*',
+        '*instagram.com/ajax/bz*', '*instagram.com/api/v1/web/fxcal*',
+    ],
+}
+
+# Medições por página da execução atual (bytes, requisições bloqueadas, tempo de carga)
+CARGAS = []
+
+def carregar_bloqueios(caminho='bloqueios.json'):
+    """Retorna os padrões de bloqueio, aplicando as substituições de bloqueios.json se existir"""
+    bloqueios = {rede: list(padroes) for rede, padroes in BLOQUEIOS_PADRAO.items()}
+    if os.path.exists(caminho):
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                for rede, padroes in json.load(f).items():
+                    bloqueios[rede.lower()] = list(padroes)
+            logging.info(f"Padrões de bloqueio carregados de {caminho}")
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            logging.warning(f"Erro ao ler {caminho}, usando bloqueios padrão: {str(e)}")
+    return bloqueios
+
+def aplicar_bloqueios(driver, rede, ativo=True):
+    """Configura na aba atual os padrões de URL bloqueados para a rede"""
+    padroes = []
+    if ativo:
+        bloqueios = getattr(driver, 'bloqueios', None) or carregar_bloqueios()
+        padroes = bloqueios.get('comum', []) + bloqueios.get(str(rede).lower(), [])
+    try:
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': padroes})
+    except Exception as e:
+        logging.info(f"Não foi possível aplicar bloqueios via CDP: {str(e)[:100]}")
+
+def ler_eventos_rede(driver):
+    """
+    Drena o log de performance do Chrome e retorna os eventos de rede (CDP) da
+    aba atual. Eventos de outras abas ficam guardados para quando forem lidas.
+    """
+    pendentes = getattr(driver, '_eventos_por_aba', None)
+    if pendentes is None:
+        pendentes = {}
+        driver._eventos_por_aba = pendentes
+    try:
+        for entrada in driver.get_log('performance'):
+            mensagem = json.loads(entrada['message'])
+            pendentes.setdefault(mensagem.get('webview'), []).append(mensagem['message'])
+    except Exception:
+        pass
+    
+    try:
+        aba = driver.execute_cdp_cmd('Target.getTargetInfo', {})['targetInfo']['targetId']
+        return pendentes.pop(aba, [])
+    except Exception:
+        # Sem como identificar a aba: devolve tudo o que foi lido
+        eventos = [evento for lista in pendentes.values() for evento in lista]
+        pendentes.clear()
+        return eventos
+
+def resumir_eventos_rede(eventos):
+    """Soma bytes transferidos e conta requisições concluídas e bloqueadas"""
+    resumo = {'bytes': 0, 'requisicoes': 0, 'bloqueadas': 0}
+    for evento in eventos:
+        metodo = evento.get('method')
+        if metodo == 'Network.loadingFinished':
+            resumo['bytes'] += int(evento.get('params', {}).get('encodedDataLength', 0))
+            resumo['requisicoes'] += 1
+        elif metodo == 'Network.loadingFailed' and evento.get('params', {}).get('blockedReason'):
+            resumo['bloqueadas'] += 1
+    return resumo
+
+def tempo_carga_ms(driver):
+    """Tempo de carregamento do documento (Navigation Timing) em milissegundos"""
+    try:
+        return driver.execute_script("""
+            const nav = performance.getEntriesByType('navigation')[0];
+            if (!nav) return null;
+            return Math.round((nav.loadEventEnd || nav.domContentLoadedEventEnd || nav.responseEnd) - nav.startTime);
+        """)
+    except Exception:
+        return None
+
+def registrar_carga(driver, linha, referencia=None):
+    """
+    Mede a página recém-carregada (bytes, bloqueios, tempo) e guarda em CARGAS.
+    Com uma medição de referência sem bloqueio, registra também a economia.
+    Retorna os eventos de rede lidos, para quem precisar das respostas capturadas.
+    """
+    eventos = ler_eventos_rede(driver)
+    medicao = resumir_eventos_rede(eventos)
+    medicao.update({'rede': linha.get('rede'), 'nome': linha.get('nome_pagina'), 'tempo_ms': tempo_carga_ms(driver)})
+    
+    mensagem = (f"Carga de {linha.get('nome_pagina')}: {medicao['bytes'] / 1024:.0f} KB em "
+                f"{medicao['requisicoes']} requisições, {medicao['bloqueadas']} bloqueadas, {medicao['tempo_ms']} ms")
+    if referencia:
+        medicao['bytes_economizados'] = referencia['bytes'] - medicao['bytes']
+        if referencia.get('tempo_ms') is not None and medicao['tempo_ms'] is not None:
+            medicao['ms_economizados'] = referencia['tempo_ms'] - medicao['tempo_ms']
+        mensagem += (f" (sem bloqueio: {referencia['bytes'] / 1024:.0f} KB, {referencia.get('tempo_ms')} ms; "
+                     f"economia de {medicao['bytes_economizados'] / 1024:.0f} KB)")
+    logging.info(mensagem)
+    CARGAS.append(medicao)
+    return eventos
+
+def medir_sem_bloqueio(driver, linha):
+    """
+    Carrega a página uma vez sem bloqueios e sem cache para servir de referência
+    na comparação de bytes e tempo (modo --medir-bloqueio, dobra os acessos).
+    """
+    try:
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+        aplicar_bloqueios(driver, linha.get('rede'), ativo=False)
+        ler_eventos_rede(driver)  # Descarta eventos anteriores
+        carregar_pagina(driver, linha['url'])
+        aguardar_pagina_pronta(driver, linha.get('rede'), linha.get('xpath'))
+        referencia = resumir_eventos_rede(ler_eventos_rede(driver))
+        referencia['tempo_ms'] = tempo_carga_ms(driver)
+        return referencia
+    except Exception as e:
+        logging.info(f"Falha na medição sem bloqueio de {linha.get('nome_pagina')}: {str(e)[:100]}")
+        return None
+    finally:
+        # A carga medida logo em seguida volta a usar o cache, como numa coleta normal
+        try:
+            driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': False})
+        except Exception:
+            pass
+
+def registrar_resumo_cargas():
+    """Registra no log as médias de bytes e tempo de carga por rede"""
+    redes = sorted({str(c['rede']) for c in CARGAS})
+    for rede in redes:
+        cargas = [c for c in CARGAS if str(c['rede']) == rede]
+        tempos = [c['tempo_ms'] for c in cargas if c.get('tempo_ms') is not None]
+        mensagem = (f"Cargas {rede}: {len(cargas)} páginas, média de {sum(c['bytes'] for c in cargas) / len(cargas) / 1024:.0f} KB, "
+                    f"{sum(c['bloqueadas'] for c in cargas)} requisições bloqueadas")
+        if tempos:
+            mensagem += f", tempo médio {sum(tempos) / len(tempos):.0f} ms"
+        economias = [c['bytes_economizados'] for c in cargas if 'bytes_economizados' in c]
+        if economias:
+            mensagem += f", economia média de {sum(economias) / len(economias) / 1024:.0f} KB por página"
+        economias_ms = [c['ms_economizados'] for c in cargas if 'ms_economizados' in c]
+        if economias_ms:
+            mensagem += f" e {sum(economias_ms) / len(economias_ms):.0f} ms"
+        logging.info(mensagem)
+
+# ----- RESPOSTAS CAPTURADAS VIA CDP -----
+
+# Trechos de URL das respostas JSON que a própria página pede e que trazem o perfil
+RESPOSTAS_PERFIL = {
+    'instagram': ['web_profile_info', '/graphql/query', '/api/graphql'],
+    'linkedin': ['/voyager/api/organization', 'voyagerOrganizationDashCompanies', '/voyager/api/graphql'],
+}
+
+# Chaves com o número de seguidores nos JSONs do Instagram e do LinkedIn
+_CHAVES_SEGUIDORES = ('follower_count', 'followerCount', 'followersCount', 'followed_by_count')
+
+def _buscar_contagem_json(dados, identificador=None, profundidade=0):
+    """
+    Procura recursivamente o número de seguidores em um JSON. Com um identificador
+    (username/slug), só aceita objetos cujo username/universalName confere, para não
+    pegar contas sugeridas ou páginas semelhantes que vêm na mesma resposta.
+    """
+    if profundidade > 12:
+        return None
+    if isinstance(dados, dict):
+        nome = dados.get('username') or dados.get('universalName')
+        confere = identificador is None or (nome is not None and str(nome).lower() == identificador.lower())
+        if confere:
+            if isinstance(dados.get('edge_followed_by'), dict) and dados['edge_followed_by'].get('count') is not None:
+                return int(dados['edge_followed_by']['count'])
+            for chave in _CHAVES_SEGUIDORES:
+                if isinstance(dados.get(chave), int):
+                    return dados[chave]
+            # No LinkedIn o total fica em followingInfo, ao lado do universalName
+            if isinstance(dados.get('followingInfo'), dict):
+                encontrado = _buscar_contagem_json(dados['followingInfo'], None, profundidade + 1)
+                if encontrado:
+                    return encontrado
+        for valor in dados.values():
+            encontrado = _buscar_contagem_json(valor, identificador, profundidade + 1)
+            if encontrado:
+                return encontrado
+    elif isinstance(dados, list):
+        for item in dados:
+            encontrado = _buscar_contagem_json(item, identificador, profundidade + 1)
+            if encontrado:
+                return encontrado
+    return None
+
+def respostas_capturadas(eventos, rede):
+    """Retorna [(requestId, url)] das respostas JSON de perfil encontradas nos eventos, mais recentes primeiro"""
+    trechos = RESPOSTAS_PERFIL.get(str(rede).lower(), [])
+    respostas = []
+    for evento in eventos:
+        if evento.get('method') != 'Network.responseReceived':
+            continue
+        resposta = evento.get('params', {}).get('response', {})
+        if any(trecho in resposta.get('url', '') for trecho in trechos):
+            respostas.append((evento['params'].get('requestId'), resposta['url']))
+    return list(reversed(respostas))
+
+def extrair_seguidores_respostas_capturadas(driver, eventos, rede, url):
+    """
+    Lê o número de seguidores das respostas JSON que a página baixou (capturadas
+    pelo log de performance) usando Network.getResponseBody, sem depender do DOM.
+    """
+    identificador = extrair_username_instagram(url) if url else None
+    respostas = respostas_capturadas(eventos or [], rede)
+    logging.info(f"{len(respostas)} respostas de perfil capturadas via CDP")
+    
+    for request_id, url_resposta in respostas:
+        try:
+            corpo = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            texto = corpo.get('body', '')
+            if corpo.get('base64Encoded'):
+                texto = base64.b64decode(texto).decode('utf-8', errors='replace')
+            dados = json.loads(texto)
+        except Exception as e:
+            logging.info(f"Resposta {url_resposta[:80]} indisponível: {str(e)[:80]}")
+            continue
+        
+        # web_profile_info do próprio perfil tem o formato conhecido da API
+        seguidores = None
+        if 'web_profile_info' in url_resposta and identificador and f"username={identificador}" in url_resposta:
+            seguidores = _seguidores_da_api(dados)
+        if seguidores is None:
+            seguidores = _buscar_contagem_json(dados, identificador)
+        if seguidores:
+            logging.info(f"✅ Seguidores encontrados na resposta capturada {url_resposta[:80]}: {seguidores}")
+            return seguidores
+    return None
+
+# ----- PRONTIDÃO DA PÁGINA -----
+
+# Seletores que indicam, por rede, que o número de seguidores já está no DOM
+ALVOS_PRONTIDAO = {
+    'instagram': 'section main header ul li, a[href*="followers"], span[title]',
+    'linkedin': 'h3.top-card-layout__first-subline, .org-top-card-summary__info-item',
+}
+
+# Elementos de formulários de login/cadastro que bloqueiam o conteúdo
+PAREDES_LOGIN = 'form#loginForm, input[name="username"][type="text"], .authwall-join-form, form.join-form'
+
+# Uma única chamada por verificação: estado do documento, alvo encontrado e parede de login
+SCRIPT_PRONTIDAO = """
+let alvo = false;
+try {
+    if (arguments[0]) {
+        alvo = !!document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+} catch (e) {}
+if (!alvo && arguments[1]) alvo = !!document.querySelector(arguments[1]);
+return {estado: document.readyState, alvo: alvo, parede: !!document.querySelector(arguments[2])};
+"""
+
+def aguardar_pagina_pronta(driver, rede, xpath=None, timeout=10, intervalo=0.2):
+    """
+    Espera até a página estar pronta para extração, em vez de uma pausa fixa.
+    Retorna 'pronta' quando o XPath do config.json ou o seletor da rede aparece,
+    'bloqueio' ao detectar login/challenge/authwall e 'timeout' se nada disso
+    ocorrer no prazo (a extração é tentada mesmo assim).
+    """
+    inicio = time.time()
+    seletor = ALVOS_PRONTIDAO.get(str(rede).lower())
+    situacao = 'timeout'
+    
+    while time.time() - inicio < timeout:
+        if pagina_bloqueada(driver):
+            situacao = 'bloqueio'
+            break
+        try:
+            estado = driver.execute_script(SCRIPT_PRONTIDAO, xpath or '', seletor or '', PAREDES_LOGIN)
+        except Exception:
+            estado = None
+        if estado:
+            if estado.get('alvo'):
+                situacao = 'pronta'
+                break
+            if estado.get('parede') and estado.get('estado') == 'complete':
+                situacao = 'bloqueio'
+                break
+            if not seletor and not xpath and estado.get('estado') == 'complete':
+                situacao = 'pronta'
+                break
+        time.sleep(intervalo)
+    
+    logging.info(f"Prontidão da página: {situacao} em {time.time() - inicio:.1f}s")
+    return situacao
+
+def _aguardar_sumir(driver, elemento, limite=2):
+    """Depois de um clique, espera o elemento sumir (ou o limite) em vez de uma pausa fixa"""
+    try:
+        WebDriverWait(driver, limite, poll_frequency=0.1).until(EC.invisibility_of_element(elemento))
+    except Exception:
+        pass
+
+def _fechar_dialogos_com_esc(driver):
+    """Pressiona ESC apenas se houver um diálogo aberto na página"""
+    dialogos = driver.find_elements(By.CSS_SELECTOR, "[role='dialog']")
+    if dialogos:
+        webdriver.ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+        logging.info("Diálogo fechado com ESC")
+        _aguardar_sumir(driver, dialogos[0], limite=1)
+
+def lidar_com_cookies_instagram(driver):
+    """Tenta lidar com diálogos de cookies e popups do Instagram"""
+    logging.info("Tentando lidar com cookies e popups do Instagram")
+    
+    try:
+        # Tenta fechar modal de cookies
+        try:
+            cookie_buttons = driver.find_elements(By.XPATH, 
+                "//button[contains(text(), 'Accept') or contains(text(), 'Allow') or contains(text(), 'Aceitar')]")
             for button in cookie_buttons:
                 button.click()
                 logging.info("Clicou em botão de cookies")
-                time.sleep(2)
+                _aguardar_sumir(driver, button)
                 break
         except:
             logging.info("Não encontrou ou não conseguiu clicar no botão de cookies")
@@ -644,15 +1856,11 @@ def lidar_com_cookies_instagram(driver):
             for button in close_buttons:
                 button.click()
                 logging.info("Fechou modal de login")
-                time.sleep(2)
+                _aguardar_sumir(driver, button)
                 break
         except:
             logging.info("Não encontrou ou não conseguiu fechar modal de login")
         
-        # Pressiona ESC como backup
-        webdriver.ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-        time.sleep(1)
-        
     except Exception as e:
         logging.error(f"Erro ao lidar com cookies e popups do Instagram: {str(e)}")
 
@@ -715,7 +1923,7 @@ def lidar_com_cookies_e_popups(driver, rede):
                     if "aceit" in botao.text.lower() or "concord" in botao.text.lower() or "accept" in botao.text.lower():
                         botao.click()
                         logging.info("Botão de cookies do LinkedIn clicado")
-                        time.sleep(1)
+                        _aguardar_sumir(driver, botao, limite=1)
                         break
             except:
                 logging.info("Não encontrou ou não conseguiu clicar no botão de cookies do LinkedIn")
@@ -726,20 +1934,852 @@ def lidar_com_cookies_e_popups(driver, rede):
                 for botao in login_botoes:
                     botao.click()
                     logging.info("Modal de login do LinkedIn fechado")
-                    time.sleep(1)
+                    _aguardar_sumir(driver, botao, limite=1)
                     break
             except:
                 logging.info("Não encontrou ou não conseguiu fechar modal de login do LinkedIn")
         
-        # Pressionar ESC como backup para fechar popups
-        webdriver.ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-        time.sleep(1)
+        # Pressionar ESC como backup para fechar popups que ainda estejam abertos
+        _fechar_dialogos_com_esc(driver)
         
     except Exception as e:
         logging.error(f"Erro ao lidar com cookies e popups: {str(e)}")
 
-def coletar_dados():
-    """Função principal para coleta de dados"""
+# ----- DIÁRIO DE CHECKPOINT -----
+
+class DiarioCheckpoint:
+    """
+    Diário do dia (checkpoints/checkpoint_<data>.jsonl) em que cada resultado é
+    gravado assim que conhecido, uma linha JSON por perfil. Se o processo for
+    interrompido, o diário preserva o que já foi coletado e o modo --resume
+    reaproveita os perfis que já tiveram sucesso.
+    """
+    
+    def __init__(self, data_hoje, pasta='checkpoints'):
+        self.caminho = os.path.join(pasta, f"checkpoint_{data_hoje}.jsonl")
+        os.makedirs(pasta, exist_ok=True)
+    
+    def reiniciar(self):
+        """Começa um diário vazio (execução sem --resume)"""
+        open(self.caminho, 'w', encoding='utf-8').close()
+    
+    def registrar(self, resultado):
+        """Acrescenta o resultado ao diário; uma única escrita por linha, segura entre processos"""
+        linha = json.dumps({**resultado, 'hora': datetime.now().strftime("%H:%M:%S"), 'pid': os.getpid()},
+                           ensure_ascii=False) + "\n"
+        try:
+            with open(self.caminho, 'a', encoding='utf-8') as f:
+                f.write(linha)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logging.error(f"Erro ao gravar checkpoint de {resultado.get('nome')}: {str(e)}")
+    
+    def ler(self):
+        """Retorna {(nome, rede): resultado} com o último registro de cada perfil"""
+        registros = {}
+        if not os.path.exists(self.caminho):
+            return registros
+        with open(self.caminho, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue  # Última linha truncada por uma interrupção
+                registros[(registro['nome'], registro['rede'])] = {
+                    chave: registro[chave] for chave in ('data', 'nome', 'rede', 'seguidores')
+                }
+        return registros
+
+# Diário da execução atual (None desativa o checkpoint)
+DIARIO = None
+
+def configurar_diario(data_hoje, pasta='checkpoints'):
+    global DIARIO
+    DIARIO = DiarioCheckpoint(data_hoje, pasta) if data_hoje else None
+    return DIARIO
+
+def sucessos_do_dia(diario, armazenamento, data_hoje):
+    """
+    Perfis que já têm contagem válida hoje, no diário ou no armazenamento
+    (que sobrevive ao runner do workflow). Retorna {(nome, rede): resultado}.
+    """
+    sucessos = {}
+    try:
+        hoje = armazenamento.ler(desde=data_hoje, ate=data_hoje)
+        for registro in hoje.to_dict('records'):
+            if registro['seguidores']:
+                sucessos[(registro['nome'], registro['rede'])] = montar_resultado(
+                    data_hoje, registro['nome'], registro['rede'], int(registro['seguidores']))
+    except Exception as e:
+        logging.warning(f"Não foi possível ler os resultados de hoje do armazenamento: {str(e)[:100]}")
+    for chave, registro in diario.ler().items():
+        if registro['seguidores']:
+            sucessos[chave] = registro
+    return sucessos
+
+def montar_resultado(data_hoje, nome_pagina, rede, seguidores):
+    """Monta o registro de resultado no formato usado em resultados.csv"""
+    return {
+        'data': data_hoje,
+        'nome': nome_pagina,
+        'rede': rede,
+        'seguidores': seguidores if seguidores else 0  # Valor padrão quando não consegue extrair
+    }
+
+def carregar_pagina(driver, url, rede=None):
+    """
+    Acessa a URL com retry, re-lançando a exceção se todas as tentativas falharem.
+    Com a rede informada, aplica antes os bloqueios de recursos dela.
+    """
+    if rede is not None:
+        aplicar_bloqueios(driver, rede, getattr(driver, 'bloquear_recursos', True))
+        ler_eventos_rede(driver)  # Descarta eventos da página anterior
+    
+    max_tentativas = 3
+    for tentativa in range(max_tentativas):
+        try:
+            LIMITADOR.aguardar(url)
+            with METRICAS.span('driver_get', tentativa=tentativa+1):
+                driver.get(url)
+            registrar_resposta(url, sinal_bloqueio(driver, rede))
+            logging.info(f"Página carregada: {url} (tentativa {tentativa+1})")
+            break
+        except Exception as e:
+            logging.error(f"Erro ao carregar página (tentativa {tentativa+1}): {str(e)}")
+            if tentativa < max_tentativas - 1:
+                time.sleep(5)  # Espera antes de tentar novamente
+            else:
+                raise  # Re-lança a exceção se todas as tentativas falharem
+
+def extrair_da_pagina(driver, linha, eventos=None):
+    """
+    Extrai o número de seguidores da página do perfil já carregada no driver.
+    eventos são os eventos de rede CDP da página, usados para ler as respostas JSON capturadas.
+    """
+    nome_pagina = linha['nome_pagina']
+    rede = linha['rede']
+    xpath = linha['xpath']
+    
+    # Lidar com cookies e popups
+    with METRICAS.span('popups'):
+        lidar_com_cookies_e_popups(driver, rede)
+    
+    # Tirar screenshot para debug
+    with METRICAS.span('screenshot'):
+        tirar_screenshot(driver, nome_pagina)
+    
+    seguidores = None
+    
+    # Lógica específica para o Instagram
+    # (a API JSON já foi tentada na fase HTTP, aqui só restam os métodos com Selenium)
+    if rede.lower() == "instagram":
+        logging.info(f"Usando métodos especializados para Instagram: {nome_pagina}")
+        seguidores = extrair_seguidores_instagram(driver, xpath, nome_pagina, eventos, linha.get('url'))
+    else:
+        # Para outras redes, usa o XPath original e os métodos alternativos
+        seguidores = extrair_seguidores_linkedin(driver, xpath, nome_pagina, rede, eventos, linha.get('url'))
+    
+    # Não salva mais o HTML para debug
+    logging.info(f"Processamento de {nome_pagina} concluído")
+    return seguidores
+
+def registrar_resultado(linha, data_hoje, seguidores):
+    """Registra em log e no diário de checkpoint o desfecho da extração e monta o registro de resultado"""
+    nome_pagina = linha.get('nome_pagina')
+    if seguidores:
+        logging.info(f"Seguidores extraídos para {nome_pagina}: {seguidores}")
+    else:
+        logging.warning(f"Não foi possível extrair número de seguidores para {nome_pagina}")
+    resultado = montar_resultado(data_hoje, nome_pagina, linha.get('rede'), seguidores)
+    if DIARIO is not None:
+        DIARIO.registrar(resultado)
+    return resultado
+
+def processar_perfil(driver, linha, data_hoje, posicao=None, total=None):
+    """Acessa um perfil do config.json e retorna o registro de resultado correspondente"""
+    nome_pagina = linha.get('nome_pagina')
+    rede = linha.get('rede')
+    
+    # Os spans registrados durante o perfil (inclusive nas funções internas) levam nome e rede
+    with METRICAS.contexto(perfil=nome_pagina, rede=rede), METRICAS.span('perfil'):
+        try:
+            url = linha['url']
+            logging.info(f"Processando [{posicao}/{total}]: {nome_pagina}, Rede: {rede}, URL: {url}")
+            
+            referencia = medir_sem_bloqueio(driver, linha) if getattr(driver, 'medir_bloqueio', False) else None
+            with METRICAS.span('carregar_pagina'):
+                carregar_pagina(driver, url, rede)
+            
+            # Espera o número de seguidores aparecer (ou um bloqueio) em vez de uma pausa fixa
+            with METRICAS.span('aguardar_pagina'):
+                aguardar_pagina_pronta(driver, rede, linha.get('xpath'))
+            with METRICAS.span('eventos_rede'):
+                eventos = registrar_carga(driver, linha, referencia)
+            
+            with METRICAS.span('extracao'):
+                seguidores = extrair_da_pagina(driver, linha, eventos)
+            return registrar_resultado(linha, data_hoje, seguidores)
+        
+        except Exception as e:
+            logging.error(f"Erro ao processar {nome_pagina}: {str(e)}")
+            logging.error(traceback.format_exc())
+            # Adiciona entrada com erro para manter registro
+            return registrar_resultado(linha, data_hoje, 0)
+
+def medir_memoria_detalhada(driver):
+    """
+    Retorna a memória residente do chromedriver e de todos os processos do
+    Chrome que ele iniciou como {'total_mb', 'renderizador_mb'}, em que
+    renderizador_mb é o maior processo renderizador (--type=renderer), o que
+    costuma crescer sem parar em execuções longas. Usa /proc, então só
+    funciona no Linux; em outros sistemas retorna None.
+    """
+    try:
+        pid_raiz = driver.service.process.pid
+    except Exception:
+        return None
+    if not os.path.isdir('/proc'):
+        return None
+    
+    # Mapeia pid -> pid do pai para encontrar toda a árvore de processos
+    filhos = {}
+    for entrada in os.listdir('/proc'):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entrada}/stat', 'r') as f:
+                # O nome do processo fica entre parênteses e pode conter espaços
+                campos = f.read().rsplit(')', 1)[1].split()
+            filhos.setdefault(int(campos[1]), []).append(int(entrada))
+        except (OSError, IndexError, ValueError):
+            continue
+    
+    tamanho_pagina = os.sysconf('SC_PAGE_SIZE')
+    total_bytes = 0
+    maior_renderizador = 0
+    pendentes = [pid_raiz]
+    while pendentes:
+        pid = pendentes.pop()
+        pendentes.extend(filhos.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/statm', 'r') as f:
+                residente = int(f.read().split()[1]) * tamanho_pagina
+            total_bytes += residente
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                if b'--type=renderer' in f.read():
+                    maior_renderizador = max(maior_renderizador, residente)
+        except (OSError, IndexError, ValueError):
+            continue
+    return {'total_mb': total_bytes / (1024 * 1024), 'renderizador_mb': maior_renderizador / (1024 * 1024)}
+
+def driver_ativo(driver):
+    """Verifica se o navegador ainda responde (a aba ou o Chrome podem ter travado)"""
+    try:
+        driver.execute_script("return 1;")
+        return True
+    except Exception:
+        return False
+
+class VigiaNavegador:
+    """
+    Mantém o ChromeDriver de um lote e o recria quando a memória do navegador, a
+    do maior renderizador ou o número de páginas atendidas passa do limite, ou
+    quando o navegador para de responder. Um limite 0 fica desativado.
+    Guarda a curva de memória (por página) e os eventos de reciclagem.
+    """
+    
+    def __init__(self, opcoes_driver=None, limite_mb=2000, limite_renderizador_mb=1000, limite_paginas=250):
+        self.opcoes_driver = opcoes_driver or {}
+        self.limite_mb = limite_mb
+        self.limite_renderizador_mb = limite_renderizador_mb
+        self.limite_paginas = limite_paginas
+        self.driver = None
+        self.paginas = 0  # Desde o último início do driver
+        self.paginas_total = 0
+        self.curva = []  # (página, MB do navegador, MB do maior renderizador)
+        self.reciclagens = []
+    
+    def iniciar(self):
+        with METRICAS.span('configurar_driver'):
+            self.driver = configurar_driver(**self.opcoes_driver)
+        self.paginas = 0
+        return self.driver
+    
+    def encerrar(self):
+        if self.driver is None:
+            return
+        with METRICAS.span('encerrar_driver'):
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logging.warning(f"Erro ao encerrar o WebDriver: {str(e)[:100]}")
+        self.driver = None
+    
+    def avaliar(self, falhou=False):
+        """Conta a página atendida e mede a memória; retorna o motivo para reciclar o driver, ou None"""
+        self.paginas += 1
+        self.paginas_total += 1
+        medicao = medir_memoria_detalhada(self.driver)
+        if medicao:
+            self.curva.append((self.paginas_total, medicao['total_mb'], medicao['renderizador_mb']))
+            METRICAS.amostra('memoria_navegador_mb', medicao['total_mb'], pagina=self.paginas_total,
+                             renderizador_mb=round(medicao['renderizador_mb'], 1))
+        
+        # Uma falha pode ser o renderizador que caiu; só então vale checar se o driver responde
+        if falhou and not driver_ativo(self.driver):
+            return "navegador sem resposta"
+        if medicao and self.limite_mb and medicao['total_mb'] > self.limite_mb:
+            return f"memória do navegador {medicao['total_mb']:.0f} MB > {self.limite_mb} MB"
+        if medicao and self.limite_renderizador_mb and medicao['renderizador_mb'] > self.limite_renderizador_mb:
+            return f"renderizador com {medicao['renderizador_mb']:.0f} MB > {self.limite_renderizador_mb} MB"
+        if self.limite_paginas and self.paginas >= self.limite_paginas:
+            return f"{self.paginas} páginas no mesmo driver"
+        return None
+    
+    def reciclar(self, motivo):
+        """Encerra o driver atual e inicia outro com as mesmas opções"""
+        memoria = self.curva[-1][1] if self.curva else None
+        logging.warning(f"♻️ Reciclando o WebDriver após {self.paginas} páginas: {motivo}")
+        with METRICAS.span('reciclar_driver', motivo=motivo):
+            self.encerrar()
+            self.iniciar()
+        self.reciclagens.append({'pagina': self.paginas_total, 'motivo': motivo, 'memoria_mb': memoria,
+                                 'hora': datetime.now().strftime("%H:%M:%S")})
+        return self.driver
+    
+    def registrar_resumo(self, pontos=12):
+        """Escreve no log a curva de memória (amostrada) e as reciclagens"""
+        if self.curva:
+            passo = max(len(self.curva) // pontos, 1)
+            paginas_recicladas = {evento['pagina'] for evento in self.reciclagens}
+            pontos_curva = [ponto for i, ponto in enumerate(self.curva)
+                            if i % passo == 0 or ponto[0] in paginas_recicladas or i == len(self.curva) - 1]
+            curva = ", ".join(f"{pagina}: {total:.0f}{' ♻️' if pagina in paginas_recicladas else ''}"
+                              for pagina, total, _ in pontos_curva)
+            logging.info(f"Curva de memória do navegador (página: MB): {curva}")
+        for evento in self.reciclagens:
+            memoria = f", {evento['memoria_mb']:.0f} MB" if evento['memoria_mb'] is not None else ""
+            logging.info(f"♻️ Reciclagem às {evento['hora']} na página {evento['pagina']}{memoria}: {evento['motivo']}")
+
+def _processar_lote_serial(vigia, lote, data_hoje, total):
+    """
+    Processa o lote um perfil por vez na aba atual do driver do vigia. Se o
+    driver precisar ser reciclado logo após uma falha, o perfil é repetido uma vez.
+    """
+    resultados_lote = []
+    pendentes = list(lote)
+    repetidos = set()
+    while pendentes:
+        # O intervalo entre acessos fica a cargo do limitador de cada domínio;
+        # o próximo perfil é o da rede que está liberada há mais tempo
+        indice, linha = pendentes.pop(_proximo_perfil(pendentes))
+        if perfil_adiado(linha):
+            continue
+        resultado = processar_perfil(vigia.driver, linha, data_hoje, indice+1, total)
+        motivo = vigia.avaliar(falhou=not resultado['seguidores'])
+        repetir = not resultado['seguidores'] and indice not in repetidos
+        if motivo and (pendentes or repetir):
+            vigia.reciclar(motivo)
+            if repetir:
+                logging.info(f"Repetindo {linha.get('nome_pagina')} com o novo WebDriver")
+                repetidos.add(indice)
+                pendentes.append((indice, linha))
+                continue
+        resultados_lote.append((indice, resultado))
+    return resultados_lote
+
+def _estado_aba(driver):
+    """Retorna (readyState, timeOrigin) do documento da aba atual"""
+    return driver.execute_script("return [document.readyState, performance.timeOrigin];")
+
+def _abrir_abas(driver, quantidade):
+    handles = [driver.current_window_handle]
+    for _ in range(quantidade - 1):
+        driver.switch_to.new_window('tab')
+        handles.append(driver.current_window_handle)
+    return handles
+
+def _processar_lote_abas(vigia, lote, data_hoje, total, abas, timeout_carga=30):
+    """
+    Processa o lote abrindo várias abas no mesmo Chrome. A navegação é disparada
+    por JavaScript (não bloqueia) e a extração roda na primeira aba que terminar
+    de carregar, sobrepondo as esperas de rede sem iniciar outros navegadores.
+    Quando o vigia recicla o driver, os perfis em carga nas outras abas voltam
+    para a fila e o perfil que acabou de falhar é repetido uma vez.
+    """
+    driver = vigia.driver
+    handles = _abrir_abas(driver, min(abas, len(lote)))
+    logging.info(f"Modo abas: {len(handles)} abas para {len(lote)} perfis")
+    
+    pendentes = list(lote)
+    livres = list(handles)
+    em_carga = {}  # handle -> (indice, linha, documento anterior, início)
+    resultados_lote = []
+    repetidos = set()
+    
+    while pendentes or em_carga:
+        # Dispara a navegação nas abas livres, priorizando redes já liberadas pelo limitador
+        while livres and pendentes:
+            proximo = _proximo_perfil(pendentes)
+            if em_carga and LIMITADOR.espera_estimada(pendentes[proximo][1].get('url', '')) > 0:
+                break  # Nenhuma rede liberada agora; volta a verificar as abas em carga
+            indice, linha = pendentes.pop(proximo)
+            if perfil_adiado(linha):
+                continue
+            handle = livres.pop(0)
+            LIMITADOR.aguardar(linha.get('url', ''))
+            logging.info(f"Processando [{indice+1}/{total}]: {linha.get('nome_pagina')}, Rede: {linha.get('rede')}, URL: {linha.get('url')} (aba {handles.index(handle)+1})")
+            try:
+                driver.switch_to.window(handle)
+                aplicar_bloqueios(driver, linha.get('rede'), getattr(driver, 'bloquear_recursos', True))
+                ler_eventos_rede(driver)  # Descarta eventos da página anterior desta aba
+                _, origem_anterior = _estado_aba(driver)
+                driver.execute_script("window.location.href = arguments[0];", linha['url'])
+                em_carga[handle] = (indice, linha, origem_anterior, time.time())
+            except Exception as e:
+                logging.error(f"Erro ao iniciar carregamento de {linha.get('nome_pagina')}: {str(e)}")
+                resultados_lote.append((indice, registrar_resultado(linha, data_hoje, 0)))
+                livres.append(handle)
+                continue
+        
+        # Procura a primeira aba cujo documento novo terminou de carregar
+        pronta = None
+        for handle, (indice, linha, origem_anterior, inicio) in em_carga.items():
+            try:
+                driver.switch_to.window(handle)
+                estado, origem = _estado_aba(driver)
+                if origem != origem_anterior and estado == 'complete':
+                    pronta = handle
+                    break
+            except Exception:
+                pass
+            if time.time() - inicio > timeout_carga:
+                logging.warning(f"Tempo de carregamento excedido para {linha.get('nome_pagina')}, extraindo mesmo assim")
+                try:
+                    driver.execute_script("window.stop();")
+                except Exception:
+                    pass
+                pronta = handle
+                break
+        
+        if pronta is None:
+            time.sleep(0.25)
+            continue
+        
+        indice, linha, _, inicio = em_carga.pop(pronta)
+        logging.info(f"Página carregada: {linha.get('url')} em {time.time() - inicio:.1f}s")
+        # Nas abas as cargas se sobrepõem: o span cobre do disparo da navegação até a aba ficar pronta
+        with METRICAS.contexto(perfil=linha.get('nome_pagina'), rede=linha.get('rede')):
+            METRICAS.registrar('carregar_pagina', time.time() - inicio, abas=len(handles))
+            try:
+                driver.switch_to.window(pronta)
+                registrar_resposta(linha.get('url', ''), sinal_bloqueio(driver, linha.get('rede')))
+                with METRICAS.span('aguardar_pagina'):
+                    aguardar_pagina_pronta(driver, linha.get('rede'), linha.get('xpath'), timeout=5)
+                with METRICAS.span('eventos_rede'):
+                    eventos = registrar_carga(driver, linha)
+                with METRICAS.span('extracao'):
+                    seguidores = extrair_da_pagina(driver, linha, eventos)
+                resultado = registrar_resultado(linha, data_hoje, seguidores)
+            except Exception as e:
+                logging.error(f"Erro ao processar {linha.get('nome_pagina')}: {str(e)}")
+                logging.error(traceback.format_exc())
+                resultado = registrar_resultado(linha, data_hoje, 0)
+            METRICAS.registrar('perfil', time.time() - inicio)
+        livres.append(pronta)
+        
+        motivo = vigia.avaliar(falhou=not resultado['seguidores'])
+        repetir = not resultado['seguidores'] and indice not in repetidos
+        if motivo and (pendentes or em_carga or repetir):
+            # As cargas em andamento se perdem com o driver antigo
+            for indice_carga, linha_carga, _, _ in em_carga.values():
+                pendentes.append((indice_carga, linha_carga))
+            em_carga.clear()
+            driver = vigia.reciclar(motivo)
+            handles = _abrir_abas(driver, min(abas, len(pendentes) + 1))
+            livres = list(handles)
+            if repetir:
+                logging.info(f"Repetindo {linha.get('nome_pagina')} com o novo WebDriver")
+                repetidos.add(indice)
+                pendentes.append((indice, linha))
+                continue
+        resultados_lote.append((indice, resultado))
+    
+    return resultados_lote
+
+def _coletar_lote(lote, data_hoje, total, abas=1, fator_taxa=None, opcoes_driver=None, limites_navegador=None):
+    """
+    Cria um ChromeDriver (com as opções de configurar_driver em opcoes_driver) e
+    processa o lote de perfis recebido, em série ou em várias abas. Também é
+    executado nos processos filhos do modo --workers.
+    limites_navegador são os limites do VigiaNavegador (limite_mb,
+    limite_renderizador_mb, limite_paginas) para reciclar o driver.
+    Retorna pares (índice original, resultado).
+    """
+    resultados_lote = []
+    vigia = VigiaNavegador(opcoes_driver, **(limites_navegador or {}))
+    inicio = time.time()
+    
+    # Em processos paralelos, cada um fica com uma fração da taxa por domínio
+    if fator_taxa is not None:
+        configurar_limitador(fator_taxa)
+    
+    try:
+        logging.info(f"Processo {os.getpid()}: inicializando o WebDriver para {len(lote)} perfis")
+        vigia.iniciar()
+        
+        try:
+            if abas > 1 and len(lote) > 1:
+                resultados_lote = _processar_lote_abas(vigia, lote, data_hoje, total, abas)
+            else:
+                resultados_lote = _processar_lote_serial(vigia, lote, data_hoje, total)
+        
+        finally:
+            logging.info(f"Processo {os.getpid()}: finalizando o WebDriver")
+            vigia.encerrar()
+    
+    except Exception as e:
+        logging.error(f"Processo {os.getpid()}: erro geral: {str(e)}")
+        logging.error(traceback.format_exc())
+    
+    # Resumo para comparar memória x vazão entre os modos de coleta
+    duracao = time.time() - inicio
+    pico = f"{max(total for _, total, _ in vigia.curva):.0f} MB" if vigia.curva else "n/d"
+    modo = f"{abas} abas" if abas > 1 else "serial"
+    logging.info(f"Resumo ({modo}, processo {os.getpid()}): {len(resultados_lote)} perfis em {duracao:.1f}s, "
+                 f"{duracao / max(len(resultados_lote), 1):.1f}s por perfil, pico de memória do navegador: {pico}, "
+                 f"reciclagens do driver: {len(vigia.reciclagens)}")
+    vigia.registrar_resumo()
+    LIMITADOR.registrar_estatisticas()
+    DISJUNTOR.registrar_estatisticas()
+    registrar_resumo_cargas()
+    
+    return resultados_lote
+
+def _coletar_lote_worker(lote, data_hoje, total, abas, fator_taxa, opcoes_driver, pasta_diario=None, limites_navegador=None):
+    """Executado nos processos filhos: devolve também os eventos do cache de estratégias e as métricas"""
+    CACHE_ESTRATEGIAS.eventos = []  # Descarta eventos herdados do processo principal
+    METRICAS.reiniciar()
+    configurar_diario(data_hoje if pasta_diario else None, pasta_diario)
+    resultados_lote = _coletar_lote(lote, data_hoje, total, abas, fator_taxa, opcoes_driver, limites_navegador)
+    return resultados_lote, CACHE_ESTRATEGIAS.eventos, METRICAS.estado()
+
+def coletar_serial(indexados, data_hoje, total, abas=1, opcoes_driver=None, limites_navegador=None):
+    """Processa os perfis (pares índice, linha) em uma única instância do ChromeDriver (reciclada se preciso)"""
+    return _coletar_lote(indexados, data_hoje, total, abas, opcoes_driver=opcoes_driver, limites_navegador=limites_navegador)
+
+def coletar_paralelo(indexados, data_hoje, total, workers, abas=1, opcoes_driver=None, limites_navegador=None):
+    """
+    Distribui os perfis (pares índice, linha) entre N processos, cada um com seu
+    próprio ChromeDriver. Os resultados voltam ao processo principal na ordem
+    original do config.json.
+    """
+    # Distribuição intercalada (0, N, 2N...) para equilibrar redes e tamanhos de lote
+    lotes = [indexados[w::workers] for w in range(workers)]
+    lotes = [lote for lote in lotes if lote]
+    logging.info(f"Coleta paralela: {len(indexados)} perfis em {len(lotes)} workers")
+    
+    resultados_indexados = []
+    with ProcessPoolExecutor(max_workers=len(lotes)) as executor:
+        pasta_diario = os.path.dirname(DIARIO.caminho) if DIARIO is not None else None
+        futuros = [executor.submit(_coletar_lote_worker, lote, data_hoje, total, abas, 1 / len(lotes), opcoes_driver,
+                                   pasta_diario, limites_navegador)
+                   for lote in lotes]
+        for futuro in futuros:
+            try:
+                resultados_lote, eventos, metricas = futuro.result()
+                resultados_indexados.extend(resultados_lote)
+                CACHE_ESTRATEGIAS.aplicar_eventos(eventos)
+                METRICAS.incorporar(metricas)
+            except Exception as e:
+                logging.error(f"Worker encerrado com erro: {str(e)}")
+    
+    # Ordem determinística, independente de qual worker terminou primeiro
+    resultados_indexados.sort(key=lambda par: par[0])
+    return resultados_indexados
+
+async def _coletar_via_http_async(indexados, concorrencia, adiados=None):
+    """
+    Dispara as consultas HTTP de todos os perfis ao mesmo tempo, limitadas pelo semáforo e pelo limitador.
+    Os índices dos perfis limitados (429) em todas as tentativas vão para o conjunto adiados.
+    """
+    concorrencia = max(1, concorrencia)  # Semaphore(0) travaria a fase para sempre
+    semaforo = asyncio.Semaphore(concorrencia)
+    # asyncio.to_thread usa o executor padrão do loop, limitado a min(32, CPUs + 4) threads
+    # qualquer que seja a concorrência pedida; a fase tem um executor do tamanho do semáforo
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=concorrencia, thread_name_prefix='fase-http'))
+    tarefas = {}
+    adiados = set() if adiados is None else adiados
+    
+    async def cronometrar(i, consulta):
+        inicio = time.time()
+        try:
+            return await consulta, time.time() - inicio
+        except LimiteTaxaExcedido:
+            logging.info(f"Fase HTTP: {linhas[i].get('nome_pagina')} adiado (limite de taxa em todas as tentativas)")
+            adiados.add(i)
+            return None, time.time() - inicio
+        except Exception as e:
+            logging.info(f"Erro na consulta HTTP: {str(e)[:100]}")
+            return None, time.time() - inicio
+    
+    for i, linha in indexados:
+        rede = str(linha.get('rede', '')).lower()
+        url = linha.get('url', '')
+        
+        # Perfis em que a via HTTP falha sempre vão direto para o navegador
+        if CACHE_ESTRATEGIAS.deve_pular(linha.get('nome_pagina'), linha.get('rede'), 'http'):
+            logging.info(f"Fase HTTP: pulando {linha.get('nome_pagina')} (falhas crônicas via HTTP)")
+            continue
+        
+        if rede == "instagram":
+            tarefas[i] = cronometrar(i, extrair_seguidores_instagram_api_async(extrair_username_instagram(url), semaforo))
+        elif rede == "linkedin":
+            tarefas[i] = cronometrar(i, extrair_seguidores_linkedin_http_async(url, semaforo))
+    
+    linhas = dict(indexados)
+    resultados = await asyncio.gather(*tarefas.values())
+    contagens = {}
+    for i, (seguidores, duracao) in zip(tarefas, resultados):
+        # Limite de taxa não é falha do método: não conta para o cache de estratégias
+        if i not in adiados:
+            CACHE_ESTRATEGIAS.registrar(linhas[i].get('nome_pagina'), linhas[i].get('rede'), 'http', seguidores, duracao)
+        # Inclui a espera no semáforo e no limitador, que é o que a consulta custa na fase
+        METRICAS.registrar('metodo', duracao, perfil=linhas[i].get('nome_pagina'), rede=linhas[i].get('rede'),
+                           metodo='http', sucesso=bool(seguidores))
+        contagens[i] = seguidores
+    return contagens
+
+def coletar_via_http(indexados, data_hoje, concorrencia=4, adiados=None):
+    """
+    Fase 1 da coleta: tenta os perfis (pares índice, linha) com requisições HTTP
+    simples, sem navegador. Instagram e LinkedIn avançam juntos, cada um no ritmo do seu domínio.
+    Retorna pares (índice original, resultado) apenas dos perfis resolvidos; se
+    informado, o conjunto adiados recebe os índices dos perfis limitados (429) até o fim.
+    """
+    logging.info(f"Fase HTTP: consultando {len(indexados)} perfis (concorrência {concorrencia})")
+    linhas = dict(indexados)
+    try:
+        contagens = asyncio.run(_coletar_via_http_async(indexados, concorrencia, adiados))
+    except Exception as e:
+        logging.info(f"Erro na fase HTTP: {str(e)[:100]}")
+        contagens = {}
+    
+    resolvidos = [
+        (i, registrar_resultado(linhas[i], data_hoje, seguidores))
+        for i, seguidores in sorted(contagens.items()) if seguidores
+    ]
+    
+    logging.info(f"Fase HTTP concluída: {len(resolvidos)}/{len(indexados)} perfis resolvidos sem navegador")
+    LIMITADOR.registrar_estatisticas()
+    DISJUNTOR.registrar_estatisticas()
+    CACHE_HTTP.registrar_estatisticas()
+    return resolvidos
+
+def agendar_perfis(indexados, armazenamento, data_hoje, agenda):
+    """
+    Filtra os perfis (pares índice, linha) pelo planejamento de analise.planejar_coleta.
+    Os perfis adiados não ganham linha no dia; relatórios e análises usam a
+    última contagem válida (ou analise.completar_serie) para esses dias.
+    """
+    try:
+        desde = (pd.Timestamp(data_hoje) - pd.Timedelta(days=90)).strftime("%Y-%m-%d")
+        historico = armazenamento.ler(desde=desde)
+        plano = planejar_coleta(historico, [linha for _, linha in indexados], data_hoje, **agenda)
+    except Exception as e:
+        logging.warning(f"Falha no agendamento, coletando todos os perfis: {str(e)[:100]}")
+        return indexados
+    
+    for (_, linha), (_, registro) in zip(indexados, plano.iterrows()):
+        if not registro['coletar']:
+            logging.info(f"Agenda: adiando {linha.get('nome_pagina')} ({registro['motivo']}, "
+                         f"{registro['dias_sem_coleta']:.0f}/{registro['intervalo']:.1f} dias)")
+    selecionados = [par for par, coletar in zip(indexados, plano['coletar']) if coletar]
+    logging.info(f"Agenda: {len(selecionados)}/{len(indexados)} perfis programados para hoje")
+    return selecionados
+
+def consolidar_resultados(dados_json, resultados_indexados, diario):
+    """
+    Resultados na ordem do config.json. Perfis que não voltaram da coleta
+    (por exemplo, um worker que caiu) são completados com o diário de checkpoint.
+    """
+    por_perfil = diario.ler()
+    por_perfil.update({(resultado['nome'], resultado['rede']): resultado for _, resultado in resultados_indexados})
+    chaves = [(linha.get('nome_pagina'), linha.get('rede')) for linha in dados_json]
+    return [por_perfil[chave] for chave in chaves if chave in por_perfil]
+
+def salvar_resultados(novos_resultados, armazenamento, data_hoje, exportar_csv=False):
+    """
+    Grava os resultados do dia no backend de armazenamento.
+    Em todos os backends cada perfil é gravado pela chave (data, nome, rede): perfis
+    não coletados nesta execução mantêm o registro que já tinham no dia.
+    Com exportar_csv, o backend também é exportado para resultados.csv.
+    """
+    if not novos_resultados:
+        logging.warning("Nenhum novo resultado coletado")
+    
+    with METRICAS.span('salvar_resultados', registros=len(novos_resultados)):
+        armazenamento.gravar_dia(data_hoje, novos_resultados)
+    
+    if exportar_csv:
+        with METRICAS.span('exportar_csv'):
+            armazenamento.exportar_csv('resultados.csv')
+
+# ----- SHARDS -----
+# Com --shard i/N cada execução coleta um subconjunto estável dos perfis e grava
+# um arquivo parcial; --mesclar-shards junta os parciais no armazenamento
+
+PASTA_PARCIAIS = 'parciais'
+
+def interpretar_shard(texto):
+    """Converte 'i/N' (i de 1 a N) em (i, N); usado como type do argparse"""
+    try:
+        indice, total = (int(parte) for parte in str(texto).split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard inválido: '{texto}' (use i/N, por exemplo 1/4)")
+    if total < 1 or not 1 <= indice <= total:
+        raise argparse.ArgumentTypeError(f"shard inválido: '{texto}' (i deve estar entre 1 e N)")
+    return indice, total
+
+def shard_do_perfil(nome, rede, total_shards):
+    """Shard (1 a N) de um perfil pelo CRC32 de rede|nome: o mesmo em qualquer execução ou runner"""
+    chave = f"{str(rede).lower()}|{nome}"
+    return zlib.crc32(chave.encode('utf-8')) % total_shards + 1
+
+def filtrar_shard(indexados, shard):
+    """Mantém os perfis (pares índice, linha) que pertencem ao shard (i, N)"""
+    indice, total = shard
+    selecionados = [(i, linha) for i, linha in indexados
+                    if shard_do_perfil(linha.get('nome_pagina'), linha.get('rede'), total) == indice]
+    logging.info(f"Shard {indice}/{total}: {len(selecionados)} de {len(indexados)} perfis")
+    return selecionados
+
+def sufixo_shard(shard):
+    return f"_shard_{shard[0]}_de_{shard[1]}"
+
+def caminho_com_shard(caminho, shard):
+    """metricas.json -> metricas_shard_1_de_4.json, para shards locais não sobrescreverem os arquivos uns dos outros"""
+    if not caminho or shard is None:
+        return caminho
+    raiz, extensao = os.path.splitext(caminho)
+    return f"{raiz}{sufixo_shard(shard)}{extensao}"
+
+def salvar_parcial(novos_resultados, shard, pasta=PASTA_PARCIAIS):
+    """Grava os resultados do shard em parciais/resultados_shard_<i>_de_<N>.csv, sem tocar no armazenamento"""
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"resultados{sufixo_shard(shard)}.csv")
+    with METRICAS.span('salvar_resultados', registros=len(novos_resultados)):
+        pd.DataFrame(novos_resultados, columns=COLUNAS).to_csv(caminho, index=False)
+    logging.info(f"Resultados parciais salvos em {caminho} ({len(novos_resultados)} registros)")
+    return caminho
+
+def ler_parciais(pasta=PASTA_PARCIAIS):
+    """Retorna ({shard: caminho}, N) dos arquivos parciais da pasta"""
+    parciais = {}
+    totais = set()
+    if os.path.isdir(pasta):
+        for arquivo in sorted(os.listdir(pasta)):
+            encontrado = re.fullmatch(r'resultados_shard_(\d+)_de_(\d+)\.csv', arquivo)
+            if encontrado:
+                indice, total = int(encontrado.group(1)), int(encontrado.group(2))
+                parciais[indice] = os.path.join(pasta, arquivo)
+                totais.add(total)
+    if len(totais) > 1:
+        raise ValueError(f"parciais com números de shards diferentes em {pasta}: {sorted(totais)}")
+    return parciais, (totais.pop() if totais else 0)
+
+def mesclar_shards(armazenamento='csv', pasta=PASTA_PARCIAIS, exportar_csv=False, config='config.json'):
+    """
+    Junta os arquivos parciais dos shards e grava cada data no armazenamento com
+    salvar_resultados(), a mesma regra do fim de coletar_dados(): os registros do
+    dia substituem os que já existiam. Os perfis seguem a ordem do config.json.
+    Se faltar o parcial de algum shard, os registros do dia já gravados para os
+    perfis desse shard são mantidos. Retorna o número de registros mesclados.
+    """
+    try:
+        parciais, total = ler_parciais(pasta)
+    except ValueError as e:
+        logging.error(f"Não foi possível mesclar os shards: {str(e)}")
+        return 0
+    if not parciais:
+        logging.error(f"Nenhum arquivo parcial encontrado em {pasta}")
+        return 0
+    faltando = sorted(set(range(1, total + 1)) - set(parciais))
+    if faltando:
+        logging.warning(f"Shards sem arquivo parcial: {faltando} de {total}")
+    
+    tabelas = [pd.read_csv(caminho, dtype={'seguidores': 'Int64'}) for _, caminho in sorted(parciais.items())]
+    mesclados = pd.concat(tabelas, ignore_index=True)
+    logging.info(f"Mesclando {len(parciais)}/{total} shards: {len(mesclados)} registros")
+    
+    ordem = {}
+    if os.path.exists(config):
+        with open(config, 'r', encoding='utf-8') as f:
+            ordem = {(linha.get('nome_pagina'), linha.get('rede')): i for i, linha in enumerate(json.load(f))}
+    
+    backend = abrir_armazenamento(armazenamento)
+    try:
+        for data, do_dia in mesclados.groupby('data', sort=True):
+            # Um perfil repetido em dois parciais fica com a contagem válida (ou a última)
+            do_dia = do_dia.assign(_valido=do_dia['seguidores'].fillna(0) > 0)
+            do_dia = do_dia.sort_values('_valido', kind='stable').drop_duplicates(['nome', 'rede'], keep='last')
+            registros = [montar_resultado(data, r['nome'], r['rede'], None if pd.isna(r['seguidores']) else int(r['seguidores']))
+                         for r in do_dia.to_dict('records')]
+            
+            if faltando:
+                cobertos = {(r['nome'], r['rede']) for r in registros}
+                existentes = backend.ler(desde=data, ate=data).to_dict('records')
+                mantidos = [montar_resultado(data, r['nome'], r['rede'], None if pd.isna(r['seguidores']) else int(r['seguidores']))
+                            for r in existentes if (r['nome'], r['rede']) not in cobertos
+                            and shard_do_perfil(r['nome'], r['rede'], total) in faltando]
+                if mantidos:
+                    logging.info(f"{data}: mantidos {len(mantidos)} registros já gravados dos shards sem parcial")
+                registros += mantidos
+            
+            registros.sort(key=lambda r: ordem.get((r['nome'], r['rede']), len(ordem)))
+            salvar_resultados(registros, backend, data, exportar_csv)
+    finally:
+        backend.fechar()
+    return len(mesclados)
+
+def exportar_metricas(metricas, prometheus, data_hoje, workers, abas, armazenamento):
+    """Resumo de tempos no log e exportação dos spans da execução; falhas aqui não afetam a coleta"""
+    try:
+        METRICAS.registrar_resumo()
+        if metricas:
+            METRICAS.exportar_json(metricas, {'data': data_hoje, 'workers': workers, 'abas': abas,
+                                              'armazenamento': armazenamento})
+        if prometheus:
+            METRICAS.exportar_prometheus(prometheus)
+    except Exception as e:
+        logging.warning(f"Falha ao exportar métricas: {str(e)[:100]}")
+
+def coletar_dados(workers=1, abas=1, concorrencia_http=4, bloquear_recursos=True, medir_bloqueio=False,
+                  armazenamento='csv', exportar_csv=False, retomar=False, agenda=None, usar_navegador=True,
+                  metricas='metricas.json', prometheus=None, shard=None, limites_navegador=None):
+    """
+    Função principal para coleta de dados.
+    Com workers > 1, os perfis são divididos entre processos com ChromeDrivers independentes.
+    Com abas > 1, cada ChromeDriver carrega várias páginas ao mesmo tempo em abas.
+    concorrencia_http limita as consultas simultâneas ao Instagram na fase HTTP.
+    bloquear_recursos e medir_bloqueio são repassados a configurar_driver().
+    armazenamento escolhe o backend dos resultados ('csv', 'sqlite' ou 'parquet').
+    Com retomar, perfis que já tiveram sucesso hoje (no diário de checkpoint ou
+    no armazenamento) não são coletados de novo.
+    agenda (dicionário com os parâmetros de planejar_coleta) ativa o agendamento:
+    perfis estáveis são coletados com menos frequência.
+    Sem usar_navegador, só a fase HTTP é executada e os perfis restantes ficam com 0.
+    Os tempos de cada etapa vão para o arquivo JSON metricas (e, se informado,
+    para prometheus no formato texto do Prometheus), com um resumo no log.
+    Com shard=(i, N) só os perfis do shard são coletados e o resultado vai para
+    um arquivo parcial em parciais/ (juntado depois por mesclar_shards).
+    limites_navegador (limite_mb, limite_renderizador_mb, limite_paginas)
+    define quando o ChromeDriver é reciclado (ver VigiaNavegador).
+    No modo somente cache (configurar_cache_http) a execução é só para depurar
+    a extração: usa um diário próprio e não grava resultados nem o cache de estratégias.
+    """
     logging.info("Iniciando coleta de dados")
     logging.info(f"Diretório atual: {os.getcwd()}")
     
@@ -768,182 +2808,210 @@ def coletar_dados():
         logging.info("Criado resultados.csv vazio")
         return
     
-    # Verificar se o arquivo de resultados existe, senão criar
-    if os.path.exists('resultados.csv'):
-        logging.info("Carregando arquivo de resultados existente")
-        resultados_df = pd.read_csv('resultados.csv')
-        logging.info(f"Resultados carregados: {len(resultados_df)} registros")
-    else:
-        logging.info("Criando novo DataFrame de resultados")
-        resultados_df = pd.DataFrame(columns=['data', 'nome', 'rede', 'seguidores'])
+    # Abrir o backend de resultados; a gravação acontece no final da coleta
+    logging.info(f"Armazenamento de resultados: {armazenamento}")
+    backend = abrir_armazenamento(armazenamento)
     
     # Data atual
     data_hoje = datetime.now().strftime("%Y-%m-%d")
     logging.info(f"Data de coleta: {data_hoje}")
     
-    # Lista para armazenar novos resultados
-    novos_resultados = []
+    # Cada resultado vai para o diário assim que é conhecido
+    pasta_diario = os.path.join('checkpoints', sufixo_shard(shard).strip('_')) if shard else 'checkpoints'
+    if CACHE_HTTP.somente_cache:
+        pasta_diario = os.path.join(pasta_diario, 'somente_cache')
+    diario = configurar_diario(data_hoje, pasta_diario)
+    pendentes = list(enumerate(dados_json))
+    if shard is not None:
+        pendentes = filtrar_shard(pendentes, shard)
+    resultados_indexados = []
+    if agenda is not None:
+        pendentes = agendar_perfis(pendentes, backend, data_hoje, agenda)
+    if retomar:
+        sucessos = sucessos_do_dia(diario, backend, data_hoje)
+        resultados_indexados = [(i, sucessos[(linha.get('nome_pagina'), linha.get('rede'))]) for i, linha in pendentes
+                                if (linha.get('nome_pagina'), linha.get('rede')) in sucessos]
+        retomados = {indice for indice, _ in resultados_indexados}
+        pendentes = [(i, linha) for i, linha in pendentes if i not in retomados]
+        logging.info(f"Retomando coleta: {len(retomados)} perfis já coletados hoje, {len(pendentes)} pendentes")
+    else:
+        diario.reiniciar()
     
     try:
-        # Inicializar o driver
-        logging.info("Inicializando o WebDriver")
-        driver = configurar_driver()
+        # Fase 1: requisições HTTP simples, sem custo de iniciar o Chrome
+        limitados_http = set()
+        if pendentes:
+            with METRICAS.span('fase_http', perfis=len(pendentes)):
+                resultados_indexados += coletar_via_http(pendentes, data_hoje, concorrencia_http, limitados_http)
         
-        try:
-            for i, linha in enumerate(dados_json):
-                try:
-                    nome_pagina = linha['nome_pagina']
-                    rede = linha['rede']
-                    url = linha['url']
-                    xpath = linha['xpath']
-                    
-                    logging.info(f"Processando [{i+1}/{len(dados_json)}]: {nome_pagina}, Rede: {rede}, URL: {url}")
-                    
-                    # Acessar a URL com retry
-                    max_tentativas = 3
-                    for tentativa in range(max_tentativas):
-                        try:
-                            driver.get(url)
-                            logging.info(f"Página carregada: {url} (tentativa {tentativa+1})")
-                            break
-                        except Exception as e:
-                            logging.error(f"Erro ao carregar página (tentativa {tentativa+1}): {str(e)}")
-                            if tentativa < max_tentativas - 1:
-                                time.sleep(5)  # Espera antes de tentar novamente
-                            else:
-                                raise  # Re-lança a exceção se todas as tentativas falharem
-                    
-                    # Espera aleatória para simular comportamento humano
-                    time.sleep(random.uniform(5, 10))
-                    
-                    # Lidar com cookies e popups
-                    lidar_com_cookies_e_popups(driver, rede)
-                    
-                    # Tirar screenshot para debug
-                    tirar_screenshot(driver, nome_pagina)
-                    
-                    seguidores = None
-                    
-                    # Lógica específica para o Instagram
-                    if rede.lower() == "instagram":
-                        logging.info(f"Usando métodos especializados para Instagram: {nome_pagina}")
-                        seguidores = extrair_seguidores_instagram_alternativo(driver, xpath, nome_pagina)
-                    else:
-                        # Para outras redes, usa o método original
-                        try:
-                            logging.info(f"Buscando elemento com XPath: {xpath}")
-                            elemento = WebDriverWait(driver, 15).until(
-                                EC.presence_of_element_located((By.XPATH, xpath))
-                            )
-                            
-                            # Extrair o texto e buscar o número de seguidores
-                            texto_elemento = elemento.text
-                            logging.info(f"Texto encontrado: '{texto_elemento}'")
-                            seguidores = extrair_seguidores(texto_elemento)
-                            
-                            if seguidores:
-                                logging.info(f"Seguidores extraídos com XPath original para {nome_pagina}: {seguidores}")
-                            else:
-                                logging.warning(f"Não foi possível extrair seguidores do texto com XPath original")
-                        except Exception as e:
-                            logging.warning(f"XPath original falhou: {str(e)}")
-                            
-                        # Se o XPath original falhou, tentar métodos alternativos
-                        if not seguidores:
-                            logging.info("Tentando métodos alternativos para encontrar o número de seguidores")
-                            seguidores = encontrar_elemento_alternativo(driver, nome_pagina, rede)
-                    
-                    # Não salva mais o HTML para debug
-                    logging.info(f"Processamento de {nome_pagina} concluído")
-                    
-                    # Registrar o resultado
-                    if seguidores:
-                        logging.info(f"Seguidores extraídos para {nome_pagina}: {seguidores}")
-                        novos_resultados.append({
-                            'data': data_hoje,
-                            'nome': nome_pagina,
-                            'rede': rede,
-                            'seguidores': seguidores
-                        })
-                    else:
-                        logging.warning(f"Não foi possível extrair número de seguidores para {nome_pagina}")
-                        # Adiciona entrada com valor nulo para manter registro
-                        novos_resultados.append({
-                            'data': data_hoje,
-                            'nome': nome_pagina,
-                            'rede': rede,
-                            'seguidores': 0  # Valor padrão quando não consegue extrair
-                        })
-                
-                except Exception as e:
-                    logging.error(f"Erro ao processar {nome_pagina}: {str(e)}")
-                    logging.error(traceback.format_exc())
-                    # Adiciona entrada com erro para manter registro
-                    novos_resultados.append({
-                        'data': data_hoje,
-                        'nome': nome_pagina,
-                        'rede': rede,
-                        'seguidores': 0  # Valor padrão quando há erro
-                    })
-                
-                # Esperar entre requisições para evitar sobrecarga
-                # Tempo maior para evitar detecção de automação
-                time.sleep(random.uniform(5, 10))
+        # Fase 2: o navegador só é iniciado se sobraram perfis sem resultado
+        opcoes_driver = {'bloquear_recursos': bloquear_recursos, 'medir_bloqueio': medir_bloqueio}
+        resolvidos = {indice for indice, _ in resultados_indexados}
+        restantes = [(i, linha) for i, linha in pendentes if i not in resolvidos]
         
-        finally:
-            logging.info("Finalizando o WebDriver")
-            driver.quit()
+        if restantes and not usar_navegador:
+            # Perfis de redes com o circuito aberto ou limitados (429) até a última
+            # tentativa ficam adiados, sem registro de falha
+            sem_resultado = [(i, linha) for i, linha in restantes
+                             if not DISJUNTOR.aberto(linha.get('url', ''), 'http') and i not in limitados_http]
+            logging.info(f"Fase navegador desativada: {len(sem_resultado)} perfis sem resultado, "
+                         f"{len(restantes) - len(sem_resultado)} adiados pelo disjuntor ou pelo limite de taxa")
+            resultados_indexados += [(i, registrar_resultado(linha, data_hoje, 0)) for i, linha in sem_resultado]
+        elif restantes:
+            logging.info(f"Fase navegador: {len(restantes)} perfis restantes")
+            with METRICAS.span('fase_navegador', perfis=len(restantes)):
+                if workers > 1 and len(restantes) > 1:
+                    resultados_indexados += coletar_paralelo(restantes, data_hoje, len(dados_json), workers, abas,
+                                                             opcoes_driver, limites_navegador)
+                else:
+                    resultados_indexados += coletar_serial(restantes, data_hoje, len(dados_json), abas,
+                                                           opcoes_driver, limites_navegador)
+        else:
+            logging.info("Todos os perfis resolvidos via HTTP, navegador não será iniciado")
+        
+        POOL_SESSOES.registrar_estatisticas()
     
     except Exception as e:
         logging.error(f"Erro geral: {str(e)}")
         logging.error(traceback.format_exc())
     
     finally:
-        # Garantir que o arquivo de resultados seja criado mesmo se não houver dados novos
-        if not novos_resultados:
-            logging.warning("Nenhum novo resultado coletado")
-            # Adicionar um registro vazio para garantir que o arquivo seja criado
-            novos_resultados.append({
-                'data': data_hoje,
-                'nome': 'sem_dados',
-                'rede': 'sem_rede',
-                'seguidores': 0
-            })
-        
-        # Converter para DataFrame
-        novos_df = pd.DataFrame(novos_resultados)
-        
-        # Atualizar registros existentes do mesmo dia ou adicionar novos
-        # Esta é a parte chave para evitar duplicatas no mesmo dia
-        if not resultados_df.empty:
-            # Manter apenas as entradas que não são da data atual
-            resultados_atuais = resultados_df[resultados_df['data'] != data_hoje]
-            
-            # Verificar o que aconteceu com os dados antigos dessa data
-            dados_mesma_data = resultados_df[resultados_df['data'] == data_hoje]
-            if not dados_mesma_data.empty:
-                logging.info(f"Removendo {len(dados_mesma_data)} registros antigos da data {data_hoje}")
-            
-            # Concatenar os resultados atuais (sem a data de hoje) com os novos resultados
-            resultados_df = pd.concat([resultados_atuais, novos_df], ignore_index=True)
-            logging.info(f"Atualizados registros para a data {data_hoje}: foram removidos registros antigos e adicionados {len(novos_df)} novos")
+        novos_resultados = consolidar_resultados(dados_json, resultados_indexados, diario)
+        if CACHE_HTTP.somente_cache:
+            validos = sum(1 for resultado in novos_resultados if resultado['seguidores'])
+            logging.info(f"💾 Modo somente cache: {validos}/{len(novos_resultados)} perfis com contagem; "
+                         f"resultados não gravados")
+        elif shard is not None:
+            salvar_parcial(novos_resultados, shard)
         else:
-            # Se o DataFrame de resultados estiver vazio, use os novos resultados diretamente
-            resultados_df = novos_df
-            logging.info(f"Adicionados {len(novos_df)} registros para a data {data_hoje}")
-        
-        # Ordenar por data (mais recente primeiro) e nome
-        resultados_df = resultados_df.sort_values(['data', 'nome'], ascending=[False, True])
-        
-        # Salvar resultados atualizados
-        logging.info("Salvando resultados em resultados.csv")
-        resultados_df.to_csv('resultados.csv', index=False)
-        logging.info(f"Dados salvos em resultados.csv - {len(resultados_df)} registros totais")
+            salvar_resultados(novos_resultados, backend, data_hoje, exportar_csv)
+        backend.fechar()
+        if not CACHE_HTTP.somente_cache:
+            CACHE_ESTRATEGIAS.salvar()
+        exportar_metricas(caminho_com_shard(metricas, shard), caminho_com_shard(prometheus, shard),
+                          data_hoje, workers, abas, armazenamento)
+
+def inteiro_positivo(texto):
+    """Inteiro >= 1; usado como type do argparse"""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"valor inválido: '{texto}' (use um inteiro)")
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"valor inválido: '{texto}' (mínimo 1)")
+    return valor
+
+def criar_parser_argumentos():
+    """Define as opções de linha de comando do coletor"""
+    parser = argparse.ArgumentParser(description="Coletor diário de seguidores")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Número de processos com ChromeDrivers independentes (padrão: 1, coleta serial)")
+    parser.add_argument("--abas", type=int, default=1,
+                        help="Número de abas carregando páginas em paralelo em cada ChromeDriver (padrão: 1)")
+    parser.add_argument("--concorrencia-http", type=inteiro_positivo, default=4,
+                        help="Máximo de consultas HTTP simultâneas ao Instagram na fase HTTP (padrão: 4)")
+    parser.add_argument("--max-conexoes", type=int, default=10,
+                        help="Máximo de conexões keep-alive por host no pool HTTP (padrão: 10)")
+    parser.add_argument("--http2", action="store_true",
+                        help="Usa HTTP/2 nas requisições HTTP (requer httpx[http2])")
+    parser.add_argument("--sem-bloqueio", action="store_true",
+                        help="Não bloqueia fontes, mídia, estilos e rastreadores no navegador")
+    parser.add_argument("--medir-bloqueio", action="store_true",
+                        help="Carrega cada página também sem bloqueio para medir bytes e tempo economizados")
+    parser.add_argument("--armazenamento", choices=["csv", "sqlite", "parquet"], default="csv",
+                        help="Backend dos resultados: csv (resultados.csv), sqlite (resultados.db) ou parquet (historico/) (padrão: csv)")
+    parser.add_argument("--exportar-csv", action="store_true",
+                        help="Com --armazenamento sqlite ou parquet, exporta também o histórico para resultados.csv")
+    parser.add_argument("--agendar", action="store_true",
+                        help="Coleta só os perfis que precisam de atualização, conforme volatilidade, atraso e prioridade")
+    parser.add_argument("--intervalo-minimo", type=float, default=1,
+                        help="Com --agendar, menor intervalo entre coletas de um perfil, em dias (padrão: 1)")
+    parser.add_argument("--intervalo-maximo", type=float, default=7,
+                        help="Com --agendar, maior intervalo entre coletas de um perfil, em dias (padrão: 7)")
+    parser.add_argument("--variacao-alvo", type=float, default=0.005,
+                        help="Com --agendar, variação relativa esperada que justifica uma nova coleta (padrão: 0.005)")
+    parser.add_argument("--orcamento", type=int,
+                        help="Com --agendar, máximo de perfis por execução (os vencidos há intervalo máximo sempre entram)")
+    parser.add_argument("--sem-navegador", action="store_true",
+                        help="Executa só a fase HTTP, sem iniciar o Chrome para os perfis restantes")
+    parser.add_argument("--resume", action="store_true",
+                        help="Retoma a coleta do dia: coleta apenas perfis que falharam ou ainda não foram coletados")
+    parser.add_argument("--metricas", default="metricas.json",
+                        help="Arquivo JSON com o tempo de cada etapa da execução (padrão: metricas.json)")
+    parser.add_argument("--prometheus",
+                        help="Também grava as métricas no formato texto do Prometheus neste arquivo")
+    parser.add_argument("--limite-memoria-mb", type=int, default=2000,
+                        help="Recicla o ChromeDriver quando o navegador passa desta memória residente (0 desativa; padrão: 2000)")
+    parser.add_argument("--limite-renderizador-mb", type=int, default=1000,
+                        help="Recicla o ChromeDriver quando um processo renderizador passa desta memória (0 desativa; padrão: 1000)")
+    parser.add_argument("--paginas-por-driver", type=int, default=250,
+                        help="Recicla o ChromeDriver após este número de páginas (0 desativa; padrão: 250)")
+    parser.add_argument("--disjuntor-limite", type=int, default=3,
+                        help="Bloqueios ou 429 seguidos que abrem o circuito de uma rede e adiam os perfis restantes "
+                             "(0 desativa; padrão: 3)")
+    parser.add_argument("--disjuntor-espera", type=float, default=300,
+                        help="Segundos com o circuito aberto antes da requisição de sonda (padrão: 300)")
+    parser.add_argument("--sem-cache-http", action="store_true",
+                        help="Não usa o cache em disco das respostas do Instagram")
+    parser.add_argument("--cache-http-pasta", default="cache_http",
+                        help="Pasta do cache HTTP (padrão: cache_http)")
+    parser.add_argument("--cache-http-ttl", type=float, default=12,
+                        help="Horas em que uma resposta do cache é reaproveitada sem ir à rede (padrão: 12)")
+    parser.add_argument("--cache-http-max-mb", type=float, default=200,
+                        help="Tamanho máximo do cache; acima dele saem as entradas usadas há mais tempo (padrão: 200)")
+    parser.add_argument("--somente-cache", action="store_true",
+                        help="Reproduz as respostas do cache, mesmo vencidas, sem acessar a rede nem abrir o "
+                             "navegador; para depurar a extração offline (não grava resultados)")
+    parser.add_argument("--shard", type=interpretar_shard,
+                        help="Coleta só o shard i de N (ex.: 2/4), escolhido por hash do perfil, "
+                             "e grava o resultado em parciais/ em vez do armazenamento")
+    parser.add_argument("--mesclar-shards", action="store_true",
+                        help="Não coleta: junta os arquivos de parciais/ no armazenamento escolhido e termina")
+    parser.add_argument("--profile", action="store_true",
+                        help="Perfila a execução (amostragem de CPU e tracemalloc); use com --workers 1")
+    parser.add_argument("--profile-pasta", default="perfilamento",
+                        help="Pasta das pilhas colapsadas e dos relatórios de CPU e memória (padrão: perfilamento)")
+    parser.add_argument("--profile-intervalo", type=float, default=5,
+                        help="Intervalo de amostragem da CPU em milissegundos (padrão: 5)")
+    parser.add_argument("--profile-memoria", type=int, default=10,
+                        help="Frames guardados por alocação no tracemalloc; 0 desliga o perfil de memória, "
+                             "que deixa lento o código com muitas alocações e distorce o perfil de CPU (padrão: 10)")
+    return parser
 
 if __name__ == "__main__":
+    parser = criar_parser_argumentos()
+    args = parser.parse_args()
+    if args.medir_bloqueio and args.abas > 1:
+        # As abas carregam as páginas juntas e a carga sem bloqueio não tem como ser medida à parte
+        parser.error("--medir-bloqueio não funciona com --abas maior que 1")
+    agenda = None
+    if args.agendar:
+        agenda = {'intervalo_minimo': args.intervalo_minimo, 'intervalo_maximo': args.intervalo_maximo,
+                  'variacao_alvo': args.variacao_alvo, 'orcamento': args.orcamento}
+    if args.mesclar_shards:
+        mesclados = mesclar_shards(args.armazenamento, exportar_csv=args.exportar_csv)
+        raise SystemExit(0 if mesclados else 1)
+    limites_navegador = {'limite_mb': args.limite_memoria_mb, 'limite_renderizador_mb': args.limite_renderizador_mb,
+                         'limite_paginas': args.paginas_por_driver}
+    configurar_pool_sessoes(max_conexoes=args.max_conexoes, http2=args.http2)
+    configurar_disjuntor(args.disjuntor_limite, args.disjuntor_espera)
+    configurar_cache_http(args.cache_http_pasta, args.cache_http_ttl, args.cache_http_max_mb,
+                          somente_cache=args.somente_cache, ativo=not args.sem_cache_http)
+    if args.somente_cache and not args.sem_navegador:
+        logging.info("💾 Modo somente cache: a fase do navegador fica desativada")
+        args.sem_navegador = True
+    if args.profile and args.workers > 1:
+        logging.warning("--profile só amostra o processo principal; os perfis dos workers não entram no perfilamento")
+    perfilamento = perfilar(args.profile_pasta, args.profile_intervalo, args.profile_memoria) if args.profile else nullcontext()
     try:
         logging.info("Iniciando script de coleta")
-        coletar_dados()
+        with perfilamento:
+            coletar_dados(workers=args.workers, abas=args.abas, concorrencia_http=args.concorrencia_http,
+                          bloquear_recursos=not args.sem_bloqueio, medir_bloqueio=args.medir_bloqueio,
+                          armazenamento=args.armazenamento, exportar_csv=args.exportar_csv, retomar=args.resume,
+                          agenda=agenda, usar_navegador=not args.sem_navegador,
+                          metricas=args.metricas, prometheus=args.prometheus, shard=args.shard,
+                          limites_navegador=limites_navegador)
         logging.info("Script de coleta concluído com sucesso")
     except Exception as e:
         logging.error(f"Erro geral no script: {str(e)}")
@@ -0,0 +1,312 @@
+import json
+import os
+import re
+import time
+import zlib
+import random
+import logging
+import argparse
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Endereços de loopback distintos para que o limitador de taxa veja dois domínios
+HOST_LINKEDIN = '127.0.0.1'
+HOST_INSTAGRAM = '127.0.0.2'
+
+def seguidores_esperados(identificador):
+    """Contagem determinística de cada perfil simulado, para conferir a acurácia da coleta"""
+    return zlib.crc32(identificador.encode('utf-8')) % 5_000_000 + 1_000
+
+def _enchimento(tamanho_kb):
+    """Blocos de script e DOM para a página chegar a tamanho_kb"""
+    if not tamanho_kb:
+        return ''
+    bloco = '<div class="feed-item"><p>' + 'lorem ipsum ' * 40 + '</p></div>\n'
+    return bloco * max(int(tamanho_kb * 1024 / len(bloco)), 1)
+
+class Simulador:
+    """
+    Servidor HTTP local que imita a página pública de empresas do LinkedIn
+    (/company/<slug>/) e o perfil (/<username>/) e o endpoint web_profile_info
+    do Instagram. Latência (lognormal), taxa de 429, taxa de redirecionamento
+    para login e tamanho das páginas são configuráveis. Cada requisição servida
+    é registrada para as estatísticas do teste de carga.
+    """
+
+    def __init__(self, latencia_ms=150, dispersao=0.5, taxa_429=0.02, taxa_login=0.01,
+                 tamanho_pagina_kb=300, semente=None):
+        self.latencia_ms = latencia_ms
+        self.dispersao = dispersao
+        self.taxa_429 = taxa_429
+        self.taxa_login = taxa_login
+        self.tamanho_pagina_kb = tamanho_pagina_kb
+        self.aleatorio = random.Random(semente)
+        self.enchimento = _enchimento(tamanho_pagina_kb)
+        self.requisicoes = []  # (rede, endpoint, perfil, status, início, duração)
+        self._lock = threading.Lock()
+        self.servidores = []
+
+    def _sortear(self, taxa):
+        with self._lock:
+            return self.aleatorio.random() < taxa
+
+    def _latencia(self):
+        with self._lock:
+            # Lognormal com mediana latencia_ms: cauda longa como nas redes reais
+            return self.aleatorio.lognormvariate(0, self.dispersao) * self.latencia_ms / 1000
+
+    def registrar(self, rede, endpoint, perfil, status, inicio):
+        with self._lock:
+            self.requisicoes.append((rede, endpoint, perfil, status, inicio, time.time() - inicio))
+
+    def pagina_linkedin(self, slug):
+        seguidores = seguidores_esperados(slug)
+        return f"""<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">
+<title>{slug} | LinkedIn</title>
+<meta name="description" content="{slug} | {seguidores:,} followers on LinkedIn.">
+</head><body><main><section class="top-card-layout">
+<h1 class="top-card-layout__title">{slug}</h1>
+<h3 class="top-card-layout__first-subline">São Paulo, SP <span>{seguidores:,} followers</span></h3>
+</section>{self.enchimento}</main></body></html>"""
+
+    def pagina_instagram(self, username):
+        seguidores = seguidores_esperados(username)
+        dados = {'entry_data': {'ProfilePage': [{'graphql': {'user': {
+            'username': username, 'edge_followed_by': {'count': seguidores}}}}]}}
+        return f"""<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">
+<title>{username} • Instagram photos and videos</title>
+<meta property="og:description" content="{seguidores:,} Followers, 100 Following, 50 Posts">
+</head><body><div id="react-root"></div>{self.enchimento}
+<script type="text/javascript">window._sharedData = {json.dumps(dados)};</script></body></html>"""
+
+    def _criar_handler(self, rede):
+        simulador = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, como os sites reais
+
+            def log_message(self, formato, *args):
+                pass
+
+            def _responder(self, status, corpo='', tipo='text/html; charset=utf-8', cabecalhos=None):
+                dados = corpo.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', tipo)
+                self.send_header('Content-Length', str(len(dados)))
+                for chave, valor in (cabecalhos or {}).items():
+                    self.send_header(chave, valor)
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def do_GET(self):
+                inicio = time.time()
+                url = urlparse(self.path)
+                endpoint, perfil, status = 'outro', None, 404
+
+                if url.path.startswith(('/authwall', '/accounts/login')):
+                    endpoint, status = 'login', 200
+                    self._responder(200, '<html><body><form id="loginForm">Sign in</form></body></html>')
+                    simulador.registrar(rede, endpoint, perfil, status, inicio)
+                    return
+
+                if rede == 'linkedin':
+                    match = re.match(r'^/company/([^/]+)/?$', url.path)
+                    if match:
+                        endpoint, perfil = 'empresa', match.group(1)
+                elif url.path.startswith('/api/v1/users/web_profile_info'):
+                    endpoint, perfil = 'web_profile_info', parse_qs(url.query).get('username', [None])[0]
+                else:
+                    match = re.match(r'^/([\w.]+)/?$', url.path)
+                    if match:
+                        endpoint, perfil = 'perfil', match.group(1)
+
+                time.sleep(simulador._latencia())
+
+                if perfil is None:
+                    self._responder(404, 'not found')
+                elif simulador._sortear(simulador.taxa_429):
+                    status = 429
+                    self._responder(429, 'Too Many Requests', cabecalhos={'Retry-After': '5'})
+                elif simulador._sortear(simulador.taxa_login):
+                    status = 302
+                    destino = '/authwall?trk=simulador' if rede == 'linkedin' else '/accounts/login/?next=' + url.path
+                    self._responder(302, '', cabecalhos={'Location': destino})
+                else:
+                    status = 200
+                    if endpoint == 'empresa':
+                        self._responder(200, simulador.pagina_linkedin(perfil))
+                    elif endpoint == 'perfil':
+                        self._responder(200, simulador.pagina_instagram(perfil))
+                    else:
+                        corpo = json.dumps({'data': {'user': {
+                            'username': perfil, 'edge_followed_by': {'count': seguidores_esperados(perfil)}}}, 'status': 'ok'})
+                        self._responder(200, corpo, 'application/json')
+                simulador.registrar(rede, endpoint, perfil, status, inicio)
+
+        return Handler
+
+    def iniciar(self, porta_linkedin=0, porta_instagram=0):
+        """Sobe os dois servidores em threads e retorna (url base do LinkedIn, url base do Instagram)"""
+        bases = []
+        for rede, host, porta in (('linkedin', HOST_LINKEDIN, porta_linkedin), ('instagram', HOST_INSTAGRAM, porta_instagram)):
+            servidor = ThreadingHTTPServer((host, porta), self._criar_handler(rede))
+            servidor.daemon_threads = True
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+            self.servidores.append(servidor)
+            bases.append(f"http://{host}:{servidor.server_address[1]}")
+        logging.info(f"Simulador no ar: LinkedIn {bases[0]}, Instagram {bases[1]}")
+        return tuple(bases)
+
+    def parar(self):
+        for servidor in self.servidores:
+            servidor.shutdown()
+            servidor.server_close()
+        self.servidores = []
+
+def gerar_config(quantidade, base_linkedin, base_instagram, proporcao_instagram=0.5, semente=0):
+    """Gera uma lista no formato do config.json com `quantidade` perfis sintéticos"""
+    aleatorio = random.Random(semente)
+    perfis = []
+    for i in range(quantidade):
+        if aleatorio.random() < proporcao_instagram:
+            username = f"perfil_ig_{i}"
+            perfis.append({'nome_pagina': username, 'rede': 'Instagram', 'url': f"{base_instagram}/{username}/",
+                           'xpath': "//a[contains(@href, '/followers/')]/span"})
+        else:
+            slug = f"empresa-{i}"
+            perfis.append({'nome_pagina': slug, 'rede': 'Linkedin', 'url': f"{base_linkedin}/company/{slug}/",
+                           'xpath': "//h3[contains(@class, 'top-card-layout__first-subline')]"})
+    return perfis
+
+def _percentis(valores):
+    if len(valores) == 0:
+        return {'p50': None, 'p95': None, 'p99': None}
+    return {f'p{p}': round(float(np.percentile(valores, p)) * 1000, 1) for p in (50, 95, 99)}
+
+def executar_carga(quantidade=1000, proporcao_instagram=0.5, fator_taxa=200, concorrencia_http=16,
+                   max_conexoes=32, usar_navegador=False, opcoes_simulador=None):
+    """
+    Sobe o simulador, gera um config.json sintético em uma pasta temporária e
+    roda coletar_dados() contra ele. Retorna vazão, latências (por requisição e
+    por perfil), respostas servidas por tipo e acurácia dos resultados gravados.
+    fator_taxa multiplica as taxas do limitador, que no uso real são de poucas requisições por minuto.
+    """
+    import scraper
+
+    simulador = Simulador(**(opcoes_simulador or {}))
+    base_linkedin, base_instagram = simulador.iniciar()
+    perfis = gerar_config(quantidade, base_linkedin, base_instagram, proporcao_instagram)
+    diretorio_original = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        with open(os.path.join(pasta, 'config.json'), 'w', encoding='utf-8') as f:
+            json.dump(perfis, f)
+
+        # Estado global do coletor apontado para o simulador e para a pasta temporária
+        scraper.INSTAGRAM_BASE_URL = base_instagram
+        scraper.configurar_limitador(fator_taxa)
+        scraper.configurar_pool_sessoes(max_conexoes=max_conexoes)
+        scraper.CACHE_ESTRATEGIAS = scraper.CacheEstrategias(os.path.join(pasta, 'estrategias.json'))
+        scraper.configurar_cache_http(os.path.join(pasta, 'cache_http'))
+
+        os.chdir(pasta)
+        inicio = time.time()
+        try:
+            scraper.coletar_dados(concorrencia_http=concorrencia_http, usar_navegador=usar_navegador)
+        finally:
+            duracao = time.time() - inicio
+            os.chdir(diretorio_original)
+            simulador.parar()
+        resultados = pd.read_csv(os.path.join(pasta, 'resultados.csv'))
+
+    requisicoes = pd.DataFrame(simulador.requisicoes, columns=['rede', 'endpoint', 'perfil', 'status', 'inicio', 'duracao'])
+    por_perfil = requisicoes.dropna(subset=['perfil']).groupby('perfil').agg(
+        primeiro=('inicio', 'min'), ultimo=('inicio', 'max'),
+        ultima_duracao=('duracao', 'last'), tentativas=('inicio', 'size'))
+    ponta_a_ponta = (por_perfil['ultimo'] + por_perfil['ultima_duracao'] - por_perfil['primeiro']).to_numpy()
+
+    resultados = resultados[resultados['nome'] != 'sem_dados']
+    esperados = resultados['nome'].map(seguidores_esperados)
+    corretos = int((resultados['seguidores'] == esperados).sum())
+    falhas = int((resultados['seguidores'] == 0).sum())
+
+    return {
+        'perfis': quantidade,
+        'duracao_s': round(duracao, 2),
+        'vazao_perfis_s': round(quantidade / duracao, 2),
+        'requisicoes': len(requisicoes),
+        'requisicoes_por_perfil': round(len(requisicoes) / max(quantidade, 1), 2),
+        'respostas': {f"{rede}/{endpoint}/{status}": int(total) for (rede, endpoint, status), total
+                      in requisicoes.groupby(['rede', 'endpoint', 'status']).size().items()},
+        'latencia_requisicao_ms': _percentis(requisicoes['duracao'].to_numpy()),
+        'latencia_perfil_ms': _percentis(ponta_a_ponta),
+        'corretos': corretos,
+        'falhas_zero': falhas,
+        'incorretos': len(resultados) - corretos - falhas,
+    }
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Simulador local de LinkedIn/Instagram para testes de carga")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    def opcoes_servidor(p):
+        p.add_argument("--latencia-ms", type=float, default=150, help="Latência mediana das respostas (padrão: 150)")
+        p.add_argument("--dispersao", type=float, default=0.5, help="Desvio do log da latência; maior = cauda mais longa")
+        p.add_argument("--taxa-429", type=float, default=0.02)
+        p.add_argument("--taxa-login", type=float, default=0.01)
+        p.add_argument("--tamanho-pagina-kb", type=float, default=300)
+        p.add_argument("--semente", type=int)
+
+    servidor = sub.add_parser("servidor", help="Apenas sobe o simulador")
+    opcoes_servidor(servidor)
+    servidor.add_argument("--porta-linkedin", type=int, default=8081)
+    servidor.add_argument("--porta-instagram", type=int, default=8082)
+
+    gerar = sub.add_parser("gerar-config", help="Gera um config.json sintético apontando para o simulador")
+    gerar.add_argument("--perfis", type=int, default=1000)
+    gerar.add_argument("--proporcao-instagram", type=float, default=0.5)
+    gerar.add_argument("--base-linkedin", default=f"http://{HOST_LINKEDIN}:8081")
+    gerar.add_argument("--base-instagram", default=f"http://{HOST_INSTAGRAM}:8082")
+    gerar.add_argument("--saida", default="config_simulado.json")
+
+    carga = sub.add_parser("carga", help="Sobe o simulador e roda coletar_dados() contra ele")
+    opcoes_servidor(carga)
+    carga.add_argument("--perfis", type=int, default=1000)
+    carga.add_argument("--proporcao-instagram", type=float, default=0.5)
+    carga.add_argument("--fator-taxa", type=float, default=200,
+                       help="Multiplica as taxas do limitador por domínio (padrão: 200)")
+    carga.add_argument("--concorrencia-http", type=int, default=16)
+    carga.add_argument("--max-conexoes", type=int, default=32)
+    carga.add_argument("--navegador", action="store_true", help="Usa o Chrome para os perfis que falharem via HTTP")
+    carga.add_argument("--saida", help="Salva as métricas em JSON")
+
+    args = parser.parse_args()
+    if args.comando == "gerar-config":
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(gerar_config(args.perfis, args.base_linkedin, args.base_instagram, args.proporcao_instagram),
+                      f, ensure_ascii=False, indent=1)
+        logging.info(f"{args.perfis} perfis gravados em {args.saida}")
+    else:
+        opcoes = {'latencia_ms': args.latencia_ms, 'dispersao': args.dispersao, 'taxa_429': args.taxa_429,
+                  'taxa_login': args.taxa_login, 'tamanho_pagina_kb': args.tamanho_pagina_kb, 'semente': args.semente}
+        if args.comando == "servidor":
+            simulador = Simulador(**opcoes)
+            simulador.iniciar(args.porta_linkedin, args.porta_instagram)
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                simulador.parar()
+        else:
+            metricas = executar_carga(args.perfis, args.proporcao_instagram, args.fator_taxa, args.concorrencia_http,
+                                      args.max_conexoes, args.navegador, opcoes)
+            print(json.dumps(metricas, ensure_ascii=False, indent=2))
+            if args.saida:
+                with open(args.saida, 'w', encoding='utf-8') as f:
+                    json.dump(metricas, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from analise import planejar_coleta
+
+def test_orcamento_preenchido_com_obrigatorios_e_vencidos():
+    """3 perfis sem histórico e 10 vencidos (abaixo do intervalo máximo) com orçamento 10"""
+    novos = [{'nome_pagina': f'novo_{i}', 'rede': 'Instagram'} for i in range(3)]
+    vencidos = [{'nome_pagina': f'vencido_{i}', 'rede': 'Instagram'} for i in range(10)]
+    historico = pd.DataFrame([
+        {'data': data, 'nome': linha['nome_pagina'], 'rede': 'Instagram', 'seguidores': seguidores}
+        for linha in vencidos
+        for data, seguidores in (('2026-01-06', 1000), ('2026-01-07', 1010))
+    ])
+
+    plano = planejar_coleta(historico, novos + vencidos, '2026-01-10', orcamento=10)
+
+    assert plano['coletar'].sum() == 10
+    assert plano['coletar'][:3].all()
+    assert (plano['motivo'][3:] != 'estável').all()
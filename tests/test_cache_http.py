@@ -0,0 +1,58 @@
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import scraper
+from simulador import Simulador
+
+def _configurar(monkeypatch, tmp_path, base_instagram):
+    monkeypatch.setattr(scraper, 'INSTAGRAM_BASE_URL', base_instagram)
+    monkeypatch.setattr(scraper, 'LIMITADOR', scraper.LimitadorTaxa(fator=1000))
+    monkeypatch.setattr(scraper, 'DISJUNTOR', scraper.DisjuntorRede())
+    monkeypatch.setattr(scraper, 'CACHE_HTTP', scraper.CacheHTTP(pasta=str(tmp_path / 'cache_http')))
+
+def test_nova_execucao_usa_o_cache_sem_rede(tmp_path, monkeypatch):
+    simulador = Simulador(latencia_ms=1, taxa_429=0, taxa_login=0)
+    _, base_instagram = simulador.iniciar()
+    try:
+        _configurar(monkeypatch, tmp_path, base_instagram)
+        primeira = asyncio.run(scraper.extrair_seguidores_instagram_api_async('perfil_ig_1'))
+        requisicoes = len(simulador.requisicoes)
+        segunda = asyncio.run(scraper.extrair_seguidores_instagram_api_async('perfil_ig_1'))
+    finally:
+        simulador.parar()
+
+    assert primeira and segunda == primeira
+    assert requisicoes > 0 and len(simulador.requisicoes) == requisicoes
+    assert scraper.CACHE_HTTP.estatisticas['acertos'] == 1
+
+def test_resposta_sem_contagem_nao_vai_para_o_cache(tmp_path, monkeypatch):
+    """Uma página 200 sem o número (parede de login sem redirecionamento) não pode ficar presa no cache"""
+    requisicoes = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, formato, *args):
+            pass
+
+        def do_GET(self):
+            requisicoes.append(self.path)
+            corpo = b'<html><body><form id="loginForm">Entrar</form></body></html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+    servidor = ThreadingHTTPServer(('127.0.0.2', 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        _configurar(monkeypatch, tmp_path, f"http://127.0.0.2:{servidor.server_address[1]}")
+        assert asyncio.run(scraper.extrair_seguidores_instagram_api_async('perfil_ig_1')) is None
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    # Todas as tentativas foram à rede e nada foi gravado
+    assert len(requisicoes) == 6
+    assert scraper.CACHE_HTTP.estatisticas['gravadas'] == 0
+    assert scraper.CACHE_HTTP.estatisticas['acertos'] == 0
@@ -0,0 +1,50 @@
+import scraper
+from simulador import Simulador, gerar_config
+
+URL_LINKEDIN = "https://www.linkedin.com/company/exemplo/"
+
+def test_circuitos_separados_por_canal():
+    disjuntor = scraper.DisjuntorRede(limite=3, espera=300)
+    for _ in range(3):
+        disjuntor.registrar(URL_LINKEDIN, True, canal='http')
+    assert disjuntor.aberto(URL_LINKEDIN, 'http')
+    assert not disjuntor.aberto(URL_LINKEDIN, 'navegador')
+    assert disjuntor.permitir(URL_LINKEDIN, 'navegador')
+
+    for _ in range(3):
+        disjuntor.registrar(URL_LINKEDIN, True, canal='navegador')
+    assert disjuntor.aberto(URL_LINKEDIN, 'navegador')
+
+class _Vigia:
+    driver = None
+
+    def avaliar(self, falhou):
+        return None
+
+def test_authwall_no_http_nao_adia_o_navegador(tmp_path, monkeypatch):
+    """A fase HTTP cai na authwall em todos os perfis, mas o navegador ainda coleta todos"""
+    simulador = Simulador(latencia_ms=1, taxa_429=0, taxa_login=1.0)
+    base_linkedin, base_instagram = simulador.iniciar()
+    try:
+        perfis = list(enumerate(gerar_config(5, base_linkedin, base_instagram, proporcao_instagram=0)))
+        monkeypatch.setattr(scraper, 'LIMITADOR', scraper.LimitadorTaxa(fator=1000))
+        monkeypatch.setattr(scraper, 'DISJUNTOR', scraper.DisjuntorRede(limite=3, espera=300))
+        monkeypatch.setattr(scraper, 'CACHE_ESTRATEGIAS', scraper.CacheEstrategias(str(tmp_path / 'estrategias.json')))
+        monkeypatch.setattr(scraper, 'CACHE_HTTP', scraper.CacheHTTP(pasta=str(tmp_path / 'cache_http')))
+        monkeypatch.setattr(scraper, 'DIARIO', None)
+
+        assert scraper.coletar_via_http(perfis, '2026-01-01', concorrencia=1) == []
+        url = perfis[0][1]['url']
+        assert scraper.DISJUNTOR.aberto(url, 'http')
+
+        def processar_perfil(driver, linha, data_hoje, posicao=None, total=None):
+            scraper.registrar_resposta(linha['url'], False)
+            return scraper.montar_resultado(data_hoje, linha['nome_pagina'], linha['rede'], 1234)
+
+        monkeypatch.setattr(scraper, 'processar_perfil', processar_perfil)
+        resultados = scraper._processar_lote_serial(_Vigia(), perfis, '2026-01-01', len(perfis))
+    finally:
+        simulador.parar()
+
+    assert sorted(indice for indice, _ in resultados) == [indice for indice, _ in perfis]
+    assert all(resultado['seguidores'] == 1234 for _, resultado in resultados)